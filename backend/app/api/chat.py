@@ -10,6 +10,7 @@ Endpoints:
 
 import logging
 from fastapi import APIRouter, HTTPException, status, Depends
+from fastapi.concurrency import run_in_threadpool
 
 from app.models import ChatRequest, ChatResponse, ChatMessage, ErrorResponse, MessageRole
 from app.services.dynamo import dynamodb_client
@@ -117,7 +118,9 @@ async def chat(
 
         # Call LLM Lambda
         logger.info("Calling LLM Lambda for chat response")
-        llm_result = lambda_client.invoke_llm_lambda(
+        # Off the event loop: the Lambda call blocks for the whole LLM response
+        llm_result = await run_in_threadpool(
+            lambda_client.invoke_llm_lambda,
             input_text=request.message,
             prompt_template=filled_prompt,
             conversation_history=history_messages,
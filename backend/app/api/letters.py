@@ -20,6 +20,8 @@ import logging
 import json
 from typing import List, Optional
 from fastapi import APIRouter, HTTPException, status, Depends, UploadFile, File, Form
+from fastapi.concurrency import run_in_threadpool
+from botocore.exceptions import ConnectTimeoutError, ReadTimeoutError
 from datetime import datetime
 
 from app.models import (
@@ -45,6 +47,23 @@ logger = logging.getLogger(__name__)
 
 router = APIRouter()
 
+# Attributes returned by letter_to_response (ocr_text is never sent to clients)
+LETTER_RESPONSE_ATTRIBUTES = [
+    "letter_id", "user_id", "subject", "sender", "sender_name", "sender_email",
+    "recipients", "content", "letter_date", "record_created_at", "read", "flagged",
+    "snoozed", "snooze_until", "archived", "deleted", "account", "letter_category",
+    "action_status", "action_due_date", "has_reminder", "ai_suggestion", "user_note",
+    "translated_content", "attachments", "original_images"
+]
+
+# Slim attribute set for list views that render only headers and flags
+LETTER_SUMMARY_ATTRIBUTES = [
+    "letter_id", "user_id", "subject", "sender", "sender_name", "sender_email",
+    "letter_date", "record_created_at", "read", "flagged", "snoozed", "snooze_until",
+    "archived", "deleted", "account", "letter_category", "action_status",
+    "action_due_date", "has_reminder"
+]
+
 
 # Helper function to load prompt templates
 def load_prompt_template(filename: str) -> str:
@@ -148,9 +167,7 @@ async def process_images(
 
     try:
         # Step 1: Upload images to S3
-        s3_keys = []
-        image_urls = []
-
+        uploads = []
 
         for file in files:
             # Validate file size
@@ -167,23 +184,25 @@ async def process_images(
                     status_code=status.HTTP_400_BAD_REQUEST,
                     detail=f"File type {file.content_type} not allowed"
                 )
-    
-            # Upload to S3
-            upload_result = s3_client.upload_letter_image(
-                file_content=content,
-                letter_id=letter_id,
-                filename=file.filename,
-                content_type=file.content_type
-            )
-
-            s3_keys.append(upload_result["s3_key"])
-            image_urls.append(upload_result["url"])
+
+            uploads.append({
+                "content": content,
+                "filename": file.filename,
+                "content_type": file.content_type
+            })
+
+        # Upload all validated images to S3 concurrently
+        upload_results = s3_client.upload_letter_images_bulk(uploads, letter_id)
+        s3_keys = [result["s3_key"] for result in upload_results]
+        image_urls = [result["url"] for result in upload_results]
 
         logger.info(f"Uploaded {len(s3_keys)} images to S3 for letter {letter_id}")
 
         # Step 2: Call OCR Lambda
         logger.info(f"Calling OCR Lambda for letter {letter_id}")
-        response = lambda_client.invoke_ocr_lambda(s3_keys)
+        # Blocking boto3 calls run in the threadpool so concurrent requests overlap
+        # (and identical invocations can share one in-flight call)
+        response = await run_in_threadpool(lambda_client.invoke_ocr_lambda, s3_keys)
         ocr_result = json.loads(   response.get("body"))['ocr_results']
 
         # Extract OCR text from all objects in the array
@@ -214,7 +233,8 @@ async def process_images(
         # Replace placeholders in prompt
         analysis_prompt_filled = analysis_prompt.replace("{{OCR_TEXT}}", ocr_text)
         
-        llm_result = lambda_client.invoke_llm_lambda(
+        llm_result = await run_in_threadpool(
+            lambda_client.invoke_llm_lambda,
             text=ocr_text,
             prompt_template=analysis_prompt_filled,
             temperature=0.5  # Lower temperature for more consistent structured output
@@ -273,7 +293,8 @@ async def process_images(
             originalImages=image_urls
         )
 
-    except HTTPException:
+    except (HTTPException, ConnectTimeoutError, ReadTimeoutError):
+        # AWS timeouts are mapped to 503 by the app-level exception handler
         raise
     except Exception as e:
         logger.error(f"Error processing images: {str(e)}", exc_info=True)
@@ -297,7 +318,8 @@ async def list_letters(
     flagged: Optional[bool] = None,
     snoozed: Optional[bool] = None,
     category: Optional[LetterCategory] = None,
-    limit: int = 50
+    limit: int = 50,
+    summary: bool = False
 ):
     """
     Get all letters for the current user with optional filters.
@@ -310,6 +332,7 @@ async def list_letters(
         snoozed: Filter by snoozed status
         category: Filter by letter category
         limit: Maximum number of results
+        summary: If True, omit body fields (content, AI suggestion, images, ...)
 
     Returns:
         List[LetterResponse]: List of letters
@@ -333,7 +356,8 @@ async def list_letters(
     result = dynamodb_client.get_letters_by_user(
         user_id=user_id,
         limit=limit,
-        filters=filters
+        filters=filters,
+        projection=LETTER_SUMMARY_ATTRIBUTES if summary else LETTER_RESPONSE_ATTRIBUTES
     )
 
     letters = result["items"]
@@ -557,15 +581,17 @@ async def archive_letter(
     user_id: str = Depends(get_current_user_id)
 ):
     """Archive a letter."""
-    letter = dynamodb_client.get_letter(letter_id)
+    # Ownership is enforced by the conditional write, no prior read needed
+    updated_letter = dynamodb_client.set_letter_field(
+        letter_id, "archived", True, user_id=user_id
+    )
 
-    if not letter or letter["user_id"] != user_id:
+    if not updated_letter:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Letter not found"
         )
 
-    updated_letter = dynamodb_client.update_letter(letter_id, {"archived": True})
     return letter_to_response(updated_letter)
 
 
@@ -630,7 +656,8 @@ async def translate_letter(
     # Call LLM for translation
     translation_prompt = f"Translate the following text to {request.target_language}:\n\n{letter['content']}"
 
-    llm_result = lambda_client.invoke_llm_lambda(
+    llm_result = await run_in_threadpool(
+        lambda_client.invoke_llm_lambda,
         input_text=letter["content"],
         prompt_template=translation_prompt,
         temperature=0.3
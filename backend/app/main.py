@@ -16,6 +16,7 @@ from fastapi import FastAPI, Request, status
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.responses import JSONResponse
 from fastapi.exceptions import RequestValidationError
+from botocore.exceptions import ConnectTimeoutError, ReadTimeoutError
 import logging
 import time
 
@@ -42,8 +43,13 @@ async def lifespan(app: FastAPI):
     logger.info(f"Environment: {settings.environment}")
     logger.info(f"Debug mode: {settings.debug}")
 
-    # Start reminder scheduler
-    if settings.environment != "test":
+    # Start reminder scheduler (event-driven deployments schedule reminders in AWS)
+    run_scheduler = (
+        settings.environment != "test"
+        and settings.scheduler_enabled
+        and not settings.reminder_event_driven
+    )
+    if run_scheduler:
         start_reminder_scheduler()
         logger.info("Reminder scheduler started")
 
@@ -51,7 +57,7 @@ async def lifespan(app: FastAPI):
 
     # Shutdown
     logger.info("Shutting down application")
-    if settings.environment != "test":
+    if run_scheduler:
         stop_reminder_scheduler()
         logger.info("Reminder scheduler stopped")
 
@@ -128,6 +134,21 @@ async def validation_exception_handler(request: Request, exc: RequestValidationE
     )
 
 
+@app.exception_handler(ConnectTimeoutError)
+@app.exception_handler(ReadTimeoutError)
+async def aws_timeout_exception_handler(request: Request, exc: Exception):
+    """Handle AWS timeouts (after retries) as a temporary outage."""
+    logger.error(f"AWS request timed out: {str(exc)}")
+    return JSONResponse(
+        status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+        content={
+            "error": "Service Unavailable",
+            "message": "A backing service timed out, please retry",
+            "detail": str(exc) if settings.debug else None
+        }
+    )
+
+
 @app.exception_handler(Exception)
 async def global_exception_handler(request: Request, exc: Exception):
     """Handle all uncaught exceptions."""
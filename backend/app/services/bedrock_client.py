@@ -0,0 +1,110 @@
+"""
+LetterOn Server - AWS Bedrock Client
+Purpose: Direct Bedrock (Claude) invocations from the API service (no Lambda hop)
+Testing: Mock boto3 bedrock-runtime client in tests
+AWS Deployment: Ensure bedrock:InvokeModel permission in IAM role
+
+This module provides:
+- Claude text generation via Bedrock invoke_model
+- Results in the same shape as the LetterOnLLMHandler Lambda wrapper
+
+Used by lambda_client when AI_DIRECT_INVOCATION is enabled.
+"""
+
+import json
+import logging
+from typing import Dict, Any
+import boto3
+from botocore.exceptions import ClientError
+
+from app.settings import settings
+from app.utils.aws import get_boto_config, register_retry_logging
+
+logger = logging.getLogger(__name__)
+
+
+class BedrockClient:
+    """
+    Client for AWS Bedrock runtime operations.
+    """
+
+    def __init__(self):
+        """Initialize boto3 Bedrock runtime client with configured credentials."""
+        aws_config = settings.get_aws_credentials()
+        self.client = boto3.client(
+            'bedrock-runtime',
+            config=get_boto_config(read_timeout=settings.aws_ai_read_timeout),
+            **aws_config
+        )
+        register_retry_logging(self.client)
+        self.model_id = settings.bedrock_model_id
+        logger.info(f"Bedrock client initialized for model: {self.model_id}")
+
+    def invoke_claude(
+        self,
+        prompt: str,
+        temperature: float = 0.7,
+        max_tokens: int = 2000
+    ) -> Dict[str, Any]:
+        """
+        Send a single-turn prompt to Claude.
+
+        Args:
+            prompt: Fully rendered prompt text
+            temperature: LLM temperature (0.0-1.0)
+            max_tokens: Maximum tokens in response
+
+        Returns:
+            Dict with structure:
+            {
+                "response": "LLM generated text",
+                "metadata": {"model": "...", "usage": {...}}
+            }
+
+        Raises:
+            Exception: If Bedrock invocation fails or returns no content
+        """
+        request_body = {
+            "anthropic_version": "bedrock-2023-05-31",
+            "max_tokens": max_tokens,
+            "temperature": temperature,
+            "messages": [
+                {
+                    "role": "user",
+                    "content": prompt
+                }
+            ]
+        }
+
+        try:
+            logger.info(f"Invoking Bedrock model: {self.model_id}")
+
+            response = self.client.invoke_model(
+                modelId=self.model_id,
+                contentType="application/json",
+                accept="application/json",
+                body=json.dumps(request_body)
+            )
+
+            response_body = json.loads(response['body'].read())
+
+        except ClientError as e:
+            error_msg = e.response['Error']['Message']
+            logger.error(f"AWS ClientError invoking Bedrock: {error_msg}")
+            raise Exception(f"Failed to invoke Bedrock model {self.model_id}: {error_msg}")
+
+        content_blocks = response_body.get('content', [])
+        if not content_blocks:
+            raise Exception("No content in Bedrock response")
+
+        return {
+            "response": content_blocks[0].get('text', ''),
+            "metadata": {
+                "model": self.model_id,
+                "usage": response_body.get('usage', {})
+            }
+        }
+
+
+# Global Bedrock client instance
+bedrock_client = BedrockClient()
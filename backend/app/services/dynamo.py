@@ -9,22 +9,91 @@ This module provides CRUD operations for:
 - Letters (LetterOn-Letters)
 - Reminders (LetterOn-Reminders)
 - Conversations (LetterOn-Conversations)
+- Lease locks (LetterOn-Locks)
 
 All functions use boto3 DynamoDB resource for simplified operations.
 """
 
 import logging
-from typing import Dict, Any, List, Optional
+import queue
+import threading
+import zlib
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Any, Iterator, List, Optional, overload
 from decimal import Decimal
 import boto3
 from boto3.dynamodb.conditions import Key, Attr
 from botocore.exceptions import ClientError
 
 from app.settings import settings
+from app.utils.aws import get_boto_config, register_retry_logging
 from app.utils.helpers import get_current_timestamp, generate_uuid
 
 logger = logging.getLogger(__name__)
 
+# Delivered reminders marked sent per mark_reminders_sent call (one
+# conditional UpdateItem each, issued in parallel)
+MARK_SENT_BATCH_SIZE = 25
+
+# Sparse GSI holding only unsent reminders, spread over shards to avoid a hot partition
+PENDING_REMINDERS_INDEX = "pending-index"
+PENDING_REMINDER_SHARDS = 10
+
+# Leaf types both converters return unchanged; checked by exact type so the
+# common case costs one set lookup instead of an isinstance chain
+_PASSTHROUGH_TYPES = frozenset({str, int, bool, type(None), bytes})
+
+
+def _to_dynamodb(obj: Any) -> Any:
+    """Recursively convert floats to Decimal (see DynamoDBClient.python_to_dynamodb)."""
+    cls = type(obj)
+    if cls in _PASSTHROUGH_TYPES:
+        return obj
+    if cls is dict:
+        return {
+            k: v if type(v) in _PASSTHROUGH_TYPES else _to_dynamodb(v)
+            for k, v in obj.items()
+        }
+    if cls is list:
+        return [v if type(v) in _PASSTHROUGH_TYPES else _to_dynamodb(v) for v in obj]
+    if cls is float:
+        return Decimal(repr(obj))
+
+    # Subclasses (e.g. OrderedDict, IntEnum) take the general path
+    if isinstance(obj, dict):
+        return {k: _to_dynamodb(v) for k, v in obj.items()}
+    elif isinstance(obj, list):
+        return [_to_dynamodb(v) for v in obj]
+    elif isinstance(obj, float):
+        return Decimal(str(obj))
+    return obj
+
+
+def _to_python(obj: Any) -> Any:
+    """Recursively convert Decimal to int/float (see DynamoDBClient.dynamodb_to_python)."""
+    cls = type(obj)
+    if cls in _PASSTHROUGH_TYPES:
+        return obj
+    if cls is dict:
+        return {
+            k: v if type(v) in _PASSTHROUGH_TYPES else _to_python(v)
+            for k, v in obj.items()
+        }
+    if cls is list:
+        return [v if type(v) in _PASSTHROUGH_TYPES else _to_python(v) for v in obj]
+    if cls is Decimal:
+        # int() truncation + exact comparison is cheaper than Decimal modulo
+        integral = int(obj)
+        return integral if integral == obj else float(obj)
+
+    if isinstance(obj, dict):
+        return {k: _to_python(v) for k, v in obj.items()}
+    elif isinstance(obj, list):
+        return [_to_python(v) for v in obj]
+    elif isinstance(obj, Decimal):
+        return float(obj) if obj % 1 else int(obj)
+    return obj
+
 
 class DynamoDBClient:
     """
@@ -33,48 +102,68 @@ class DynamoDBClient:
     Uses boto3 DynamoDB resource for high-level operations.
     """
 
-    def __init__(self):
-        """Initialize boto3 DynamoDB resource with configured credentials."""
-        aws_config = settings.get_aws_credentials()
+    def __init__(self, dynamodb: Optional[Any] = None):
+        """
+        Initialize boto3 DynamoDB resource with configured credentials.
 
-        # Add endpoint URL for local development
-        if settings.dynamodb_endpoint:
-            aws_config['endpoint_url'] = settings.dynamodb_endpoint
-            logger.info(f"Using DynamoDB endpoint: {settings.dynamodb_endpoint}")
+        Args:
+            dynamodb: Existing DynamoDB resource to reuse (skips resource and
+                credential setup; the caller owns its configuration)
+        """
+        if dynamodb is None:
+            aws_config = settings.get_aws_credentials()
 
-        self.dynamodb = boto3.resource('dynamodb', **aws_config)
+            # Add endpoint URL for local development
+            if settings.dynamodb_endpoint:
+                aws_config = {**aws_config, 'endpoint_url': settings.dynamodb_endpoint}
+                logger.info(f"Using DynamoDB endpoint: {settings.dynamodb_endpoint}")
+
+            dynamodb = boto3.resource('dynamodb', config=get_boto_config(), **aws_config)
+            register_retry_logging(dynamodb.meta.client)
+
+        self.dynamodb = dynamodb
 
         # Table references
         self.users_table = self.dynamodb.Table(settings.dynamodb_users_table)
         self.letters_table = self.dynamodb.Table(settings.dynamodb_letters_table)
         self.reminders_table = self.dynamodb.Table(settings.dynamodb_reminders_table)
         self.conversations_table = self.dynamodb.Table(settings.dynamodb_conversations_table)
+        self.locks_table = self.dynamodb.Table(settings.dynamodb_locks_table)
 
         logger.info("DynamoDB client initialized")
 
     # ===== HELPER METHODS =====
 
+    @overload
+    @staticmethod
+    def python_to_dynamodb(obj: Dict[str, Any]) -> Dict[str, Any]: ...
+
+    @overload
+    @staticmethod
+    def python_to_dynamodb(obj: List[Dict[str, Any]]) -> List[Dict[str, Any]]: ...
+
     @staticmethod
     def python_to_dynamodb(obj: Any) -> Any:
         """Convert Python objects to DynamoDB compatible format (float -> Decimal)."""
-        if isinstance(obj, dict):
-            return {k: DynamoDBClient.python_to_dynamodb(v) for k, v in obj.items()}
-        elif isinstance(obj, list):
-            return [DynamoDBClient.python_to_dynamodb(v) for v in obj]
-        elif isinstance(obj, float):
-            return Decimal(str(obj))
-        return obj
+        return _to_dynamodb(obj)
+
+    @overload
+    @staticmethod
+    def dynamodb_to_python(obj: Dict[str, Any]) -> Dict[str, Any]: ...
+
+    @overload
+    @staticmethod
+    def dynamodb_to_python(obj: List[Dict[str, Any]]) -> List[Dict[str, Any]]: ...
 
     @staticmethod
     def dynamodb_to_python(obj: Any) -> Any:
         """Convert DynamoDB objects to Python format (Decimal -> float)."""
-        if isinstance(obj, dict):
-            return {k: DynamoDBClient.dynamodb_to_python(v) for k, v in obj.items()}
-        elif isinstance(obj, list):
-            return [DynamoDBClient.dynamodb_to_python(v) for v in obj]
-        elif isinstance(obj, Decimal):
-            return float(obj) if obj % 1 else int(obj)
-        return obj
+        return _to_python(obj)
+
+    @staticmethod
+    def pending_shard(reminder_id: str) -> int:
+        """Get the stable pending-index shard for a reminder."""
+        return zlib.crc32(reminder_id.encode()) % PENDING_REMINDER_SHARDS
 
     # ===== USER OPERATIONS =====
 
@@ -252,7 +341,8 @@ class DynamoDBClient:
         user_id: str,
         limit: int = 50,
         last_evaluated_key: Optional[Dict] = None,
-        filters: Optional[Dict[str, Any]] = None
+        filters: Optional[Dict[str, Any]] = None,
+        projection: Optional[List[str]] = None
     ) -> Dict[str, Any]:
         """
         Get all letters for a user with optional filters.
@@ -262,6 +352,7 @@ class DynamoDBClient:
             limit: Maximum number of results
             last_evaluated_key: For pagination
             filters: Optional filters (e.g., {"archived": False, "deleted": False})
+            projection: Optional attribute names to fetch instead of the full item
 
         Returns:
             Dict with "items" and "last_evaluated_key"
@@ -277,6 +368,15 @@ class DynamoDBClient:
             if last_evaluated_key:
                 query_params["ExclusiveStartKey"] = last_evaluated_key
 
+            # Fetch only the requested attributes (placeholders avoid reserved words)
+            if projection:
+                query_params["ProjectionExpression"] = ", ".join(
+                    f"#p{i}" for i in range(len(projection))
+                )
+                query_params["ExpressionAttributeNames"] = {
+                    f"#p{i}": name for i, name in enumerate(projection)
+                }
+
             # Add filters
             if filters:
                 filter_expressions = []
@@ -340,6 +440,58 @@ class DynamoDBClient:
             logger.error(f"Error updating letter {letter_id}: {str(e)}")
             raise
 
+    def set_letter_field(
+        self,
+        letter_id: str,
+        field: str,
+        value: Any,
+        user_id: Optional[str] = None,
+        if_unchanged_from: Any = None
+    ) -> Optional[Dict[str, Any]]:
+        """
+        Set a single letter field with one conditional update_item call.
+
+        Replaces the get_letter + update_letter round trip for flag toggles.
+        The write only succeeds if the letter exists, belongs to user_id (when
+        given) and the field still equals if_unchanged_from (when given).
+
+        Args:
+            letter_id: Letter ID
+            field: Attribute name to set
+            value: New value
+            user_id: Optional owner ID the letter must belong to
+            if_unchanged_from: Optional expected current value of the field
+
+        Returns:
+            Dict: Updated letter data, or None if the condition check failed
+        """
+        condition = Attr("letter_id").exists()
+        if user_id is not None:
+            condition = condition & Attr("user_id").eq(user_id)
+        if if_unchanged_from is not None:
+            condition = condition & Attr(field).eq(self.python_to_dynamodb(if_unchanged_from))
+
+        try:
+            response = self.letters_table.update_item(
+                Key={"letter_id": letter_id},
+                UpdateExpression="SET #f = :v",
+                ConditionExpression=condition,
+                ExpressionAttributeNames={"#f": field},
+                ExpressionAttributeValues={":v": self.python_to_dynamodb(value)},
+                ReturnValues="ALL_NEW"
+            )
+
+            logger.info(f"Letter {letter_id} field set: {field}")
+            attributes: Dict[str, Any] = response["Attributes"]
+            return self.dynamodb_to_python(attributes)
+
+        except ClientError as e:
+            if e.response["Error"]["Code"] == "ConditionalCheckFailedException":
+                logger.info(f"Conditional update skipped for letter {letter_id}: {field}")
+                return None
+            logger.error(f"Error setting {field} on letter {letter_id}: {str(e)}")
+            raise
+
     def delete_letter(self, letter_id: str, soft_delete: bool = True) -> bool:
         """
         Delete a letter (soft delete by default).
@@ -417,6 +569,11 @@ class DynamoDBClient:
             "created_at": timestamp,
         }
 
+        # Only unsent reminders carry the pending-index keys (sparse index)
+        if not item["sent"]:
+            item["pending_shard"] = self.pending_shard(reminder_id)
+            item["pending_reminder_time"] = item["reminder_time"]
+
         try:
             self.reminders_table.put_item(Item=self.python_to_dynamodb(item))
             logger.info(f"Reminder created: {reminder_id}")
@@ -426,6 +583,17 @@ class DynamoDBClient:
             logger.error(f"Error creating reminder: {str(e)}")
             raise
 
+    def get_reminder(self, reminder_id: str) -> Optional[Dict[str, Any]]:
+        """Get reminder by reminder_id."""
+        try:
+            response = self.reminders_table.get_item(Key={"reminder_id": reminder_id})
+            item = response.get("Item")
+            return self.dynamodb_to_python(item) if item else None
+
+        except ClientError as e:
+            logger.error(f"Error getting reminder {reminder_id}: {str(e)}")
+            return None
+
     def get_reminders_by_user(self, user_id: str) -> List[Dict[str, Any]]:
         """Get all reminders for a user."""
         try:
@@ -440,50 +608,223 @@ class DynamoDBClient:
             logger.error(f"Error getting reminders for user {user_id}: {str(e)}")
             return []
 
-    def get_pending_reminders(self, current_time: int) -> List[Dict[str, Any]]:
+    def iter_pending_reminders(
+        self,
+        current_time: int,
+        page_size: Optional[int] = None,
+        limit: Optional[int] = None
+    ) -> Iterator[Dict[str, Any]]:
         """
-        Get all pending reminders that should be sent.
+        Stream pending reminders that should be sent, page by page.
+
+        Every pending-index shard is paginated on its own thread and items are
+        yielded as soon as any shard returns a page, so callers can start
+        processing after one round trip and never hold the full result.
 
         Args:
             current_time: Current timestamp
+            page_size: Optional Limit for each query page
+            limit: Optional maximum number of reminders to yield in total
+                (whichever shards answer first; the rest stay pending)
 
-        Returns:
-            List of reminders where reminder_time <= current_time and sent=False
+        Yields:
+            Reminders where reminder_time <= current_time and sent=False
+
+        Raises:
+            ClientError: If a shard query fails
         """
-        try:
-            # Note: This requires a scan, which is not ideal for production
-            # Consider using a GSI on sent + reminder_time for better performance
-            response = self.reminders_table.scan(
-                FilterExpression=Attr("sent").eq(False) & Attr("reminder_time").lte(current_time)
-            )
+        pages: queue.Queue = queue.Queue(maxsize=PENDING_REMINDER_SHARDS)
+        stop = threading.Event()
+        done = object()
+
+        def put(item: Any) -> bool:
+            # Give up if the consumer stopped iterating
+            while not stop.is_set():
+                try:
+                    pages.put(item, timeout=0.1)
+                    return True
+                except queue.Full:
+                    continue
+            return False
 
-            return self.dynamodb_to_python(response.get("Items", []))
+        def query_shard(shard: int) -> None:
+            query_params = {
+                "IndexName": PENDING_REMINDERS_INDEX,
+                "KeyConditionExpression": (
+                    Key("pending_shard").eq(shard) &
+                    Key("pending_reminder_time").lte(current_time)
+                ),
+                # Guards against rows re-timed after being sent
+                "FilterExpression": Attr("sent").eq(False)
+            }
+            if page_size or limit:
+                query_params["Limit"] = min(size for size in (page_size, limit) if size)
+
+            try:
+                while not stop.is_set():
+                    response = self.reminders_table.query(**query_params)
+                    if response.get("Items") and not put(response["Items"]):
+                        return
+
+                    if "LastEvaluatedKey" not in response:
+                        break
+                    query_params["ExclusiveStartKey"] = response["LastEvaluatedKey"]
+            except ClientError as e:
+                put(e)
+                return
+            put(done)
+
+        workers = [
+            threading.Thread(target=query_shard, args=(shard,), daemon=True)
+            for shard in range(PENDING_REMINDER_SHARDS)
+        ]
+        for worker in workers:
+            worker.start()
 
-        except ClientError as e:
-            logger.error(f"Error getting pending reminders: {str(e)}")
-            return []
+        try:
+            remaining = len(workers)
+            yielded = 0
+            while remaining:
+                page = pages.get()
+                if page is done:
+                    remaining -= 1
+                elif isinstance(page, ClientError):
+                    logger.error(f"Error streaming pending reminders: {str(page)}")
+                    raise page
+                else:
+                    for item in page:
+                        yield self.dynamodb_to_python(item)
+                        yielded += 1
+                        if limit and yielded >= limit:
+                            return
+        finally:
+            stop.set()
 
     def update_reminder(self, reminder_id: str, updates: Dict[str, Any]) -> Dict[str, Any]:
-        """Update reminder fields."""
+        """
+        Update reminder fields.
+
+        Keeps the sparse pending-index in sync: marking a reminder as sent
+        removes its index keys, re-timing an unsent reminder (re)writes both
+        of them, so reminders created before the index get indexed too.
+        """
+        updates = dict(updates)
+        remove_attrs = []
+
+        if updates.get("sent"):
+            remove_attrs = ["pending_shard", "pending_reminder_time"]
+        elif "reminder_time" in updates:
+            index_keys = {
+                "pending_shard": self.pending_shard(reminder_id),
+                "pending_reminder_time": updates["reminder_time"],
+            }
+            if "sent" not in updates:
+                try:
+                    # Only unsent reminders belong in the index
+                    return self._update_reminder_item(
+                        reminder_id, {**updates, **index_keys}, [], only_unsent=True
+                    )
+                except ClientError as e:
+                    if e.response["Error"]["Code"] != "ConditionalCheckFailedException":
+                        raise
+                    # Already sent: re-time it without indexing it again
+            else:
+                updates.update(index_keys)
+
+        return self._update_reminder_item(reminder_id, updates, remove_attrs)
+
+    def _update_reminder_item(
+        self,
+        reminder_id: str,
+        updates: Dict[str, Any],
+        remove_attrs: List[str],
+        only_unsent: bool = False
+    ) -> Dict[str, Any]:
+        """Apply SET/REMOVE updates to a reminder, optionally only if it is unsent."""
         update_expr = "SET " + ", ".join([f"#{k} = :{k}" for k in updates.keys()])
-        expr_attr_names = {f"#{k}": k for k in updates.keys()}
+        if remove_attrs:
+            update_expr += " REMOVE " + ", ".join([f"#{k}" for k in remove_attrs])
+
+        expr_attr_names = {f"#{k}": k for k in list(updates.keys()) + remove_attrs}
         expr_attr_values = {f":{k}": v for k, v in self.python_to_dynamodb(updates).items()}
 
+        update_kwargs: Dict[str, Any] = {}
+        if only_unsent:
+            update_kwargs["ConditionExpression"] = "#sent = :unsent"
+            expr_attr_names["#sent"] = "sent"
+            expr_attr_values[":unsent"] = False
+
         try:
             response = self.reminders_table.update_item(
                 Key={"reminder_id": reminder_id},
                 UpdateExpression=update_expr,
                 ExpressionAttributeNames=expr_attr_names,
                 ExpressionAttributeValues=expr_attr_values,
-                ReturnValues="ALL_NEW"
+                ReturnValues="ALL_NEW",
+                **update_kwargs
             )
 
             return self.dynamodb_to_python(response["Attributes"])
 
         except ClientError as e:
-            logger.error(f"Error updating reminder {reminder_id}: {str(e)}")
+            if e.response["Error"]["Code"] != "ConditionalCheckFailedException":
+                logger.error(f"Error updating reminder {reminder_id}: {str(e)}")
             raise
 
+    def mark_reminders_sent(self, reminders: List[Dict[str, Any]], sent_at: int) -> int:
+        """
+        Mark many delivered reminders as sent with parallel UpdateItem calls.
+
+        Each write is conditional on the reminder still existing with the
+        reminder_time it was read with, so a reminder deleted or re-timed
+        since it was read (e.g. from iter_pending_reminders) is left alone.
+
+        Args:
+            reminders: Reminder items as read before delivery
+            sent_at: Unix timestamp to record as sent_at
+
+        Returns:
+            int: Number of reminders marked as sent
+        """
+        def mark_sent(reminder: Dict[str, Any]) -> bool:
+            reminder_id = reminder["reminder_id"]
+            try:
+                self.reminders_table.update_item(
+                    Key={"reminder_id": reminder_id},
+                    UpdateExpression="SET #sent = :sent, #sent_at = :sent_at REMOVE #shard, #pending_time",
+                    ConditionExpression="attribute_exists(#id) AND #reminder_time = :reminder_time",
+                    ExpressionAttributeNames={
+                        "#id": "reminder_id",
+                        "#sent": "sent",
+                        "#sent_at": "sent_at",
+                        "#shard": "pending_shard",
+                        "#pending_time": "pending_reminder_time",
+                        "#reminder_time": "reminder_time"
+                    },
+                    ExpressionAttributeValues=self.python_to_dynamodb({
+                        ":sent": True,
+                        ":sent_at": sent_at,
+                        ":reminder_time": reminder["reminder_time"]
+                    })
+                )
+                return True
+
+            except ClientError as e:
+                if e.response["Error"]["Code"] == "ConditionalCheckFailedException":
+                    logger.info(f"Reminder {reminder_id} was deleted or re-timed since it was read, not marking it sent")
+                else:
+                    logger.error(f"Error marking reminder {reminder_id} as sent: {str(e)}")
+                return False
+
+        if not reminders:
+            return 0
+
+        with ThreadPoolExecutor(max_workers=min(MARK_SENT_BATCH_SIZE, len(reminders))) as executor:
+            written = sum(executor.map(mark_sent, reminders))
+
+        logger.info(f"Marked {written} reminders as sent")
+        return written
+
     def delete_reminder(self, reminder_id: str) -> bool:
         """Delete a reminder."""
         try:
@@ -549,6 +890,68 @@ class DynamoDBClient:
             logger.error(f"Error getting conversation history for letter {letter_id}: {str(e)}")
             return []
 
+    # ===== LOCK OPERATIONS =====
+
+    def acquire_lock(self, lock_id: str, owner: str, ttl_seconds: int) -> bool:
+        """
+        Acquire or renew a lease lock.
+
+        Succeeds if the lock is free, expired, or already held by owner, and
+        extends the lease to now + ttl_seconds.
+
+        Args:
+            lock_id: Lock name
+            owner: Unique identifier of the caller (e.g. host and pid)
+            ttl_seconds: Lease duration
+
+        Returns:
+            bool: True if the caller holds the lock
+        """
+        now = get_current_timestamp()
+        try:
+            self.locks_table.put_item(
+                Item={
+                    "lock_id": lock_id,
+                    "owner": owner,
+                    "expires_at": now + ttl_seconds
+                },
+                ConditionExpression=(
+                    Attr("lock_id").not_exists()
+                    | Attr("expires_at").lt(now)
+                    | Attr("owner").eq(owner)
+                )
+            )
+            return True
+
+        except ClientError as e:
+            if e.response["Error"]["Code"] == "ConditionalCheckFailedException":
+                return False
+            logger.error(f"Error acquiring lock {lock_id}: {str(e)}")
+            return False
+
+    def release_lock(self, lock_id: str, owner: str) -> bool:
+        """
+        Release a lease lock held by owner.
+
+        Args:
+            lock_id: Lock name
+            owner: Identifier used to acquire the lock
+
+        Returns:
+            bool: True if the lock was released
+        """
+        try:
+            self.locks_table.delete_item(
+                Key={"lock_id": lock_id},
+                ConditionExpression=Attr("owner").eq(owner)
+            )
+            return True
+
+        except ClientError as e:
+            if e.response["Error"]["Code"] != "ConditionalCheckFailedException":
+                logger.error(f"Error releasing lock {lock_id}: {str(e)}")
+            return False
+
 
 # Global DynamoDB client instance
 dynamodb_client = DynamoDBClient()
@@ -8,20 +8,39 @@ This module provides a clean interface for invoking the existing Lambda function
 - LetterOnOCRHandler: Processes images with Textract OCR
 - LetterOnLLMHandler: Analyzes text with AWS Bedrock LLM
 
-DO NOT re-implement OCR/LLM logic here - always call the Lambda functions.
+DO NOT re-implement OCR/LLM logic here - always call the Lambda functions, or
+the Textract/Bedrock clients when AI_DIRECT_INVOCATION is enabled.
 """
 
+import hashlib
 import json
 import logging
+import threading
+from concurrent.futures import Future
 from typing import Dict, Any, Optional
 import boto3
 from botocore.exceptions import ClientError
 
 from app.settings import settings
+from app.utils.aws import get_boto_config, register_retry_logging
+from app.services.textract_client import textract_client
+from app.services.bedrock_client import bedrock_client
 
 logger = logging.getLogger(__name__)
 
 
+class _LazyJson:
+    """Defer JSON encoding of a log argument until the record is emitted."""
+
+    __slots__ = ("obj",)
+
+    def __init__(self, obj: Any):
+        self.obj = obj
+
+    def __str__(self) -> str:
+        return json.dumps(self.obj)
+
+
 class LambdaClient:
     """
     Client for invoking AWS Lambda functions.
@@ -32,9 +51,23 @@ class LambdaClient:
     def __init__(self):
         """Initialize boto3 Lambda client with configured credentials."""
         aws_config = settings.get_aws_credentials()
-        self.client = boto3.client('lambda', **aws_config)
+        self.client = boto3.client(
+            'lambda',
+            config=get_boto_config(read_timeout=settings.aws_ai_read_timeout),
+            **aws_config
+        )
+        register_retry_logging(self.client)
+        # Single-flight map: identical sync invocations in progress share one result
+        self._inflight: Dict[str, "Future[Optional[Dict[str, Any]]]"] = {}
+        self._inflight_lock = threading.Lock()
         logger.info(f"Lambda client initialized for region: {settings.aws_region}")
 
+    @staticmethod
+    def _inflight_key(function_name: str, encoded_payload: str) -> str:
+        """Build the single-flight key for a function and its encoded payload."""
+        digest = hashlib.blake2b(encoded_payload.encode("utf-8"), digest_size=16).hexdigest()
+        return f"{function_name}:{digest}"
+
     def invoke_lambda(
         self,
         function_name: str,
@@ -44,6 +77,10 @@ class LambdaClient:
         """
         Invoke a Lambda function with the given payload.
 
+        Concurrent synchronous calls with an identical function and payload are
+        collapsed into a single invocation; later callers wait for and share the
+        first caller's result (or exception).
+
         Args:
             function_name: Name of the Lambda function to invoke
             payload: Dictionary payload to send to the Lambda
@@ -56,15 +93,59 @@ class LambdaClient:
             Exception: If Lambda invocation fails
         """
         invocation_type = 'RequestResponse' if sync else 'Event'
+        encoded_payload = json.dumps(payload, sort_keys=True)
+
+        # Fire-and-forget invocations are never deduplicated
+        if not sync:
+            return self._invoke(function_name, encoded_payload, invocation_type)
+
+        key = self._inflight_key(function_name, encoded_payload)
+        future: "Future[Optional[Dict[str, Any]]]" = Future()
+        with self._inflight_lock:
+            inflight = self._inflight.setdefault(key, future)
+
+        if inflight is not future:
+            logger.info(f"Joining in-flight Lambda invocation: {function_name}")
+            return inflight.result()
+
+        try:
+            result = self._invoke(function_name, encoded_payload, invocation_type)
+            future.set_result(result)
+            return result
+        except Exception as e:
+            future.set_exception(e)
+            raise
+        finally:
+            with self._inflight_lock:
+                self._inflight.pop(key, None)
+
+    def _invoke(
+        self,
+        function_name: str,
+        encoded_payload: str,
+        invocation_type: str
+    ) -> Optional[Dict[str, Any]]:
+        """
+        Perform a single Lambda invocation.
+
+        Args:
+            function_name: Name of the Lambda function to invoke
+            encoded_payload: JSON-encoded payload
+            invocation_type: 'RequestResponse' or 'Event'
+
+        Returns:
+            Dict containing the Lambda response, or None if async invocation
+        """
+        sync = invocation_type == 'RequestResponse'
 
         try:
             logger.info(f"Invoking Lambda: {function_name} (type: {invocation_type})")
-            logger.debug(f"Payload: {json.dumps(payload)}")
+            logger.debug("Payload: %s", encoded_payload)
 
             response = self.client.invoke(
                 FunctionName=function_name,
                 InvocationType=invocation_type,
-                Payload=json.dumps(payload)
+                Payload=encoded_payload
             )
 
             # For async invocations, just return success
@@ -92,7 +173,7 @@ class LambdaClient:
                 raise Exception(error_msg)
 
             logger.info(f"Lambda invocation successful: {function_name}")
-            logger.debug(f"Response: {json.dumps(result)}")
+            logger.debug("Response: %s", _LazyJson(result))
 
             return result
 
@@ -133,11 +214,21 @@ class LambdaClient:
                 "letters/123/image2.jpg"
             ])
         """
+        if settings.ai_direct_invocation:
+            ocr_results = textract_client.detect_text_batch(s3_keys, settings.s3_bucket_name)
+            # Same envelope as the OCR Lambda response
+            return {
+                "statusCode": 200,
+                "body": json.dumps({
+                    "ocr_results": ocr_results,
+                    "total_processed": len(ocr_results)
+                })
+            }
+
         payload = {
             "bucket": settings.s3_bucket_name,
             "s3_keys": s3_keys
         }
-        print("=====@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@",payload)
         logger.info(f"Invoking OCR Lambda for {len(s3_keys)} images")
         result = self.invoke_lambda(
             function_name=settings.lambda_ocr_function_name,
@@ -191,6 +282,14 @@ class LambdaClient:
                 ]
             )
         """
+        if settings.ai_direct_invocation:
+            # The rendered prompt already embeds the text and conversation history
+            return bedrock_client.invoke_claude(
+                prompt=prompt_template,
+                temperature=temperature,
+                max_tokens=max_tokens
+            )
+
         payload = {
             "text": text,
             "prompt_template": prompt_template,
@@ -202,7 +301,6 @@ class LambdaClient:
             payload["conversation_history"] = conversation_history
 
         logger.info(f"Invoking LLM Lambda (temperature: {temperature})")
-        print("**********************************",payload)
         result = self.invoke_lambda(
             function_name=settings.lambda_llm_function_name,
             payload=payload,
@@ -2,96 +2,263 @@
 LetterOn Server - Reminder Scheduler
 Purpose: Background task to check and process reminders
 Testing: Disabled in test environment
-AWS Deployment: Use separate Lambda with EventBridge for production
+AWS Deployment: Use event-driven Lambdas with EventBridge for production
 
 This module provides:
-- Background scheduler using APScheduler
-- Checks reminders every minute
+- Background scheduler using APScheduler (local development fallback)
+- Checks reminders every minute, on one instance at a time (DynamoDB lease lock)
+- Backs the interval off while polls come back empty
 - Marks reminders as sent after processing
-
-For production:
-- Deploy reminder_worker Lambda function
-- Create EventBridge rule: rate(1 minute)
-- Lambda should call this check_and_process_reminders function
+- Event-driven handlers that deliver each reminder exactly when it is due
+
+For production (REMINDER_EVENT_DRIVEN=true):
+- Reminders table stream (NEW_IMAGE) -> EventBridge Pipe -> event bus
+- Rule matching eventName INSERT/MODIFY -> schedule_reminder_handler Lambda
+- schedule_reminder_handler creates a one-shot EventBridge Scheduler
+  schedule at reminder_time targeting the lambda_handler Lambda
+- lambda_handler receives {"reminder_id": ...} and processes one reminder
 """
 
+import json
 import logging
+import os
+import random
+import socket
+from datetime import datetime, timezone
+from typing import Any, Dict, List, Optional
+
+import boto3
 from apscheduler.schedulers.background import BackgroundScheduler
 from apscheduler.triggers.interval import IntervalTrigger
+from boto3.dynamodb.types import TypeDeserializer
+from botocore.exceptions import ClientError
 
 from app.settings import settings
-from app.services.dynamo import dynamodb_client
-from app.utils.helpers import get_current_timestamp
+from app.services.dynamo import dynamodb_client, MARK_SENT_BATCH_SIZE
+from app.utils.aws import get_boto_config
+from app.utils.helpers import get_current_timestamp, generate_short_id
 
 logger = logging.getLogger(__name__)
 
 # Global scheduler instance
 scheduler = None
 
+# Lease lock electing the single polling instance across all API replicas
+REMINDER_LOCK_ID = "reminder-scheduler"
+_lock_owner = f"{socket.gethostname()}:{os.getpid()}:{generate_short_id()}"
+
+# Adaptive polling: consecutive empty polls and the current (unjittered) interval
+REMINDER_JOB_ID = 'reminder_checker'
+_empty_streak = 0
+_current_interval = settings.reminder_check_interval_seconds
+
+# EventBridge Scheduler client, created on first use by the schedule Lambda
+_scheduler_client = None
+
+_deserializer = TypeDeserializer()
+
+
+def _get_scheduler_client():
+    """Get the shared EventBridge Scheduler client."""
+    global _scheduler_client
+
+    if _scheduler_client is None:
+        _scheduler_client = boto3.client(
+            'scheduler',
+            config=get_boto_config(),
+            **settings.get_aws_credentials()
+        )
+    return _scheduler_client
+
+
+def _deliver_reminder(reminder: Dict[str, Any]) -> None:
+    """
+    Send the notification for a single reminder.
+
+    Args:
+        reminder: Reminder item
+    """
+    reminder_id = reminder["reminder_id"]
+    user_id = reminder["user_id"]
+    letter_id = reminder["letter_id"]
+    message = reminder.get("message", "You have a reminder for a letter")
+
+    # TODO: Send actual notification here
+    # Examples:
+    # - Send email via SES
+    # - Send push notification via SNS
+    # - Trigger webhook
+    logger.info(
+        f"Processing reminder {reminder_id} for user {user_id}, letter {letter_id}: {message}"
+    )
 
-def check_and_process_reminders():
+
+def _process_reminder(reminder: Dict[str, Any]) -> None:
+    """
+    Deliver a single reminder and mark it as sent.
+
+    Args:
+        reminder: Reminder item
+    """
+    reminder_id = reminder["reminder_id"]
+    _deliver_reminder(reminder)
+
+    # Mark reminder as sent
+    dynamodb_client.update_reminder(
+        reminder_id=reminder_id,
+        updates={"sent": True, "sent_at": get_current_timestamp()}
+    )
+
+    logger.info(f"Reminder {reminder_id} marked as sent")
+
+
+def process_reminder(reminder_id: str) -> bool:
+    """
+    Process one reminder by ID (invoked by its one-shot schedule).
+
+    Args:
+        reminder_id: Reminder ID
+
+    Returns:
+        bool: True if the reminder was delivered, False if it was skipped
+    """
+    reminder = dynamodb_client.get_reminder(reminder_id)
+
+    if not reminder:
+        logger.info(f"Reminder {reminder_id} no longer exists, skipping")
+        return False
+
+    if reminder.get("sent"):
+        logger.info(f"Reminder {reminder_id} already sent, skipping")
+        return False
+
+    # A rescheduled reminder leaves its earlier schedule behind; ignore it
+    if reminder["reminder_time"] > get_current_timestamp():
+        logger.info(f"Reminder {reminder_id} not due yet, skipping")
+        return False
+
+    _process_reminder(reminder)
+    return True
+
+
+def check_and_process_reminders() -> Optional[int]:
     """
     Check for pending reminders and process them.
 
     This function:
-    1. Queries DynamoDB for reminders that are due
+    1. Queries DynamoDB for reminders that are due (at most reminder_batch_size)
     2. Processes each reminder (log for now, can add email/push notifications)
-    3. Marks reminders as sent
+    3. Marks delivered reminders as sent in batches of 25 (conditional writes)
 
     Note: For production, this should be a separate Lambda function
     that sends actual notifications via SNS, SES, or push notifications.
+
+    Returns:
+        int: Number of due reminders found, or None if the check failed
     """
     try:
         current_time = get_current_timestamp()
         logger.info(f"Checking for reminders at {current_time}")
 
-        # Get all pending reminders
-        pending_reminders = dynamodb_client.get_pending_reminders(current_time)
-
-        if not pending_reminders:
-            logger.debug("No pending reminders found")
-            return
-
-        logger.info(f"Found {len(pending_reminders)} pending reminders")
-
-        # Process each reminder
-        for reminder in pending_reminders:
+        found = 0
+        delivered = []
+
+        # Stream due reminders page by page, buffering only one write batch;
+        # at most reminder_batch_size per poll, the rest wait for the next one
+        for reminder in dynamodb_client.iter_pending_reminders(
+            current_time,
+            page_size=settings.reminder_batch_size,
+            limit=settings.reminder_batch_size
+        ):
+            found += 1
             try:
-                reminder_id = reminder["reminder_id"]
-                user_id = reminder["user_id"]
-                letter_id = reminder["letter_id"]
-                message = reminder.get("message", "You have a reminder for a letter")
-
-                # TODO: Send actual notification here
-                # Examples:
-                # - Send email via SES
-                # - Send push notification via SNS
-                # - Trigger webhook
-                logger.info(
-                    f"Processing reminder {reminder_id} for user {user_id}, letter {letter_id}: {message}"
-                )
-
-                # Mark reminder as sent
-                dynamodb_client.update_reminder(
-                    reminder_id=reminder_id,
-                    updates={"sent": True, "sent_at": get_current_timestamp()}
-                )
-
-                logger.info(f"Reminder {reminder_id} marked as sent")
+                _deliver_reminder(reminder)
+                delivered.append(reminder)
 
             except Exception as e:
                 logger.error(f"Error processing reminder {reminder.get('reminder_id')}: {str(e)}")
                 continue
 
+            # Flush full batches so a crash re-sends at most one batch
+            if len(delivered) == MARK_SENT_BATCH_SIZE:
+                dynamodb_client.mark_reminders_sent(delivered, get_current_timestamp())
+                delivered = []
+
+        # Mark the remaining delivered reminders as sent
+        if delivered:
+            dynamodb_client.mark_reminders_sent(delivered, get_current_timestamp())
+
+        if found:
+            logger.info(f"Processed {found} pending reminders")
+        else:
+            logger.debug("No pending reminders found")
+
+        return found
+
     except Exception as e:
         logger.error(f"Error checking reminders: {str(e)}", exc_info=True)
+        return None
+
+
+def _adjust_poll_interval(found: int) -> None:
+    """
+    Stretch the polling interval while idle, snap back when reminders appear.
+
+    After k consecutive empty polls the interval is base * (1 + k), capped at
+    reminder_max_check_interval_seconds. A random jitter is applied whenever
+    the job is rescheduled so replicas do not poll in lockstep.
+
+    Args:
+        found: Number of due reminders found by the last poll
+    """
+    global _empty_streak, _current_interval
+
+    base = settings.reminder_check_interval_seconds
+    if found:
+        _empty_streak = 0
+        interval = base
+    else:
+        _empty_streak += 1
+        interval = min(base * (1 + _empty_streak), settings.reminder_max_check_interval_seconds)
+
+    if interval == _current_interval:
+        return
+
+    _current_interval = interval
+    if scheduler is not None:
+        jitter = settings.reminder_check_jitter_seconds
+        scheduler.reschedule_job(
+            REMINDER_JOB_ID,
+            trigger=IntervalTrigger(seconds=max(1, interval + random.uniform(-jitter, jitter)))
+        )
+        logger.debug(f"Reminder poll interval set to {interval}s")
+
+
+def _run_scheduled_check():
+    """
+    Scheduler job: poll reminders only while holding the leader lease.
+
+    Every replica runs the job, but only the instance that acquires (or
+    renews) the lock queries DynamoDB; the others skip until the lease of a
+    dead leader expires.
+    """
+    # The lease must outlive a backed-off interval or leadership would flap
+    lease_seconds = max(settings.reminder_lock_ttl_seconds, _current_interval * 2)
+    if not dynamodb_client.acquire_lock(REMINDER_LOCK_ID, _lock_owner, lease_seconds):
+        logger.debug("Reminder poller lease held by another instance, skipping")
+        return
+
+    found = check_and_process_reminders()
+    if found is not None:
+        _adjust_poll_interval(found)
 
 
 def start_reminder_scheduler():
     """
     Start the background reminder scheduler.
 
-    Runs check_and_process_reminders every N seconds (configured in settings).
+    Runs check_and_process_reminders every N seconds (configured in settings)
+    on whichever instance holds the reminder poller lease.
     """
     global scheduler
 
@@ -103,9 +270,9 @@ def start_reminder_scheduler():
 
     # Add job to check reminders
     scheduler.add_job(
-        func=check_and_process_reminders,
+        func=_run_scheduled_check,
         trigger=IntervalTrigger(seconds=settings.reminder_check_interval_seconds),
-        id='reminder_checker',
+        id=REMINDER_JOB_ID,
         name='Check and process pending reminders',
         replace_existing=True
     )
@@ -123,28 +290,126 @@ def stop_reminder_scheduler():
     if scheduler is not None:
         scheduler.shutdown()
         scheduler = None
+        # Let another instance take over without waiting for the lease to expire
+        dynamodb_client.release_lock(REMINDER_LOCK_ID, _lock_owner)
         logger.info("Reminder scheduler stopped")
 
 
-# For AWS Lambda deployment (optional)
+def schedule_reminder(reminder: Dict[str, Any]) -> Optional[str]:
+    """
+    Create (or move) the one-shot schedule that delivers a reminder.
+
+    Args:
+        reminder: Reminder item with reminder_id and reminder_time
+
+    Returns:
+        str: Schedule name, or None if the reminder was processed immediately
+    """
+    reminder_id = reminder["reminder_id"]
+    reminder_time = int(reminder["reminder_time"])
+
+    # Schedules in the past never fire, so deliver overdue reminders now
+    if reminder_time <= get_current_timestamp():
+        process_reminder(reminder_id)
+        return None
+
+    name = f"reminder-{reminder_id}"
+    at = datetime.fromtimestamp(reminder_time, tz=timezone.utc).strftime("%Y-%m-%dT%H:%M:%S")
+    schedule = {
+        "Name": name,
+        "GroupName": settings.reminder_schedule_group,
+        "ScheduleExpression": f"at({at})",
+        "ScheduleExpressionTimezone": "UTC",
+        "FlexibleTimeWindow": {"Mode": "OFF"},
+        "ActionAfterCompletion": "DELETE",
+        "Target": {
+            "Arn": settings.reminder_processor_lambda_arn,
+            "RoleArn": settings.reminder_scheduler_role_arn,
+            "Input": json.dumps({"reminder_id": reminder_id})
+        }
+    }
+
+    client = _get_scheduler_client()
+    try:
+        client.create_schedule(**schedule)
+    except ClientError as e:
+        if e.response['Error']['Code'] != 'ConflictException':
+            raise
+        # MODIFY of an already scheduled reminder (e.g. new reminder_time)
+        client.update_schedule(**schedule)
+
+    logger.info(f"Reminder {reminder_id} scheduled at {at} UTC")
+    return name
+
+
+def schedule_reminder_handler(event, context):
+    """
+    Lambda handler turning Reminders stream records into one-shot schedules.
+
+    Triggered by an EventBridge rule on the bus fed by the Reminders table
+    stream Pipe, matching eventName INSERT and MODIFY. Each event's detail is
+    a DynamoDB stream record (a list of records is accepted as well).
+
+    IAM Permissions needed:
+    - Scheduler: CreateSchedule, UpdateSchedule
+    - IAM: PassRole (on REMINDER_SCHEDULER_ROLE_ARN)
+    - DynamoDB: GetItem, UpdateItem (overdue reminders are processed directly)
+    """
+    records: List[Dict[str, Any]] = event if isinstance(event, list) else [event]
+    scheduled = 0
+
+    for record in records:
+        record = record.get("detail", record)
+        if record.get("eventName") not in ("INSERT", "MODIFY"):
+            continue
+
+        image = record.get("dynamodb", {}).get("NewImage")
+        if not image:
+            continue
+
+        reminder = {k: _deserializer.deserialize(v) for k, v in image.items()}
+        if reminder.get("sent"):
+            continue
+
+        try:
+            schedule_reminder(reminder)
+            scheduled += 1
+        except Exception as e:
+            logger.error(
+                f"Error scheduling reminder {reminder.get('reminder_id')}: {str(e)}",
+                exc_info=True
+            )
+            raise
+
+    return {
+        "statusCode": 200,
+        "body": f"Scheduled {scheduled} reminders"
+    }
+
+
+# For AWS Lambda deployment
 def lambda_handler(event, context):
     """
     Lambda handler for reminder worker.
 
-    Deploy this as a separate Lambda function and trigger it with EventBridge.
+    Event-driven mode: invoked by a one-shot EventBridge Scheduler schedule
+    with {"reminder_id": "..."} and processes just that reminder.
 
-    EventBridge Rule:
-    - Schedule expression: rate(1 minute)
-    - Target: This Lambda function
+    Without a reminder_id it sweeps all due reminders, e.g. from an
+    EventBridge rule with schedule expression rate(1 minute).
 
     IAM Permissions needed:
-    - DynamoDB: Query, UpdateItem (on LetterOn-Reminders table)
+    - DynamoDB: GetItem, Query, UpdateItem (on LetterOn-Reminders table)
     - CloudWatch Logs: CreateLogGroup, CreateLogStream, PutLogEvents
     - (Optional) SES/SNS: SendEmail, Publish for notifications
     """
     try:
         logger.info("Reminder worker Lambda invoked")
-        check_and_process_reminders()
+        reminder_id = event.get("reminder_id") if isinstance(event, dict) else None
+        if reminder_id:
+            process_reminder(reminder_id)
+        else:
+            check_and_process_reminders()
 
         return {
             "statusCode": 200,
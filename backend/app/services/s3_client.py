@@ -11,17 +11,43 @@ This module provides:
 - S3 key generation with proper prefixes
 """
 
+import io
 import logging
-from typing import BinaryIO, Optional
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+from typing import Any, BinaryIO, Dict, List, Optional, Set, Union
+from urllib.parse import quote
 import boto3
+from boto3.exceptions import S3UploadFailedError
+from boto3.s3.transfer import TransferConfig
+from botocore.auth import S3SigV4QueryAuth
+from botocore.awsrequest import AWSRequest
 from botocore.exceptions import ClientError
-from datetime import datetime
 
 from app.settings import settings
+from app.utils.aws import get_boto_config, register_retry_logging
+from app.utils.cache import TTLCache
 from app.utils.helpers import generate_uuid, sanitize_filename
 
 logger = logging.getLogger(__name__)
 
+# S3 DeleteObjects accepts at most 1000 keys per request
+S3_DELETE_MAX_KEYS = 1000
+S3_DELETE_MAX_WORKERS = 16
+
+# Files above the threshold are uploaded as parallel multipart parts
+S3_MULTIPART_THRESHOLD = 8 * 1024 * 1024
+S3_MULTIPART_CHUNKSIZE = 8 * 1024 * 1024
+S3_UPLOAD_MAX_CONCURRENCY = 8
+
+# Presigned URLs are reused for at most half their lifetime (and 30 minutes);
+# with temporary credentials the lifetime ends when the session token expires.
+# Existence checks are cached briefly
+S3_URL_CACHE_TTL = 1800
+S3_EXISTS_CACHE_TTL = 60
+S3_CACHE_MAX_ENTRIES = 10_000
+
 
 class S3Client:
     """
@@ -33,17 +59,39 @@ class S3Client:
     def __init__(self):
         """Initialize boto3 S3 client with configured credentials."""
         aws_config = settings.get_aws_credentials()
-        self.client = boto3.client('s3', **aws_config)
+        session = boto3.session.Session(**aws_config)
+        self.client = session.client('s3', config=get_boto_config())
+        register_retry_logging(self.client)
         self.bucket_name = settings.s3_bucket_name
+        # Presigned URLs are signed locally; refreshable credentials are
+        # frozen per signature so rotation is picked up
+        self._credentials = session.get_credentials()
+        self._object_url_base = (
+            f"https://{self.bucket_name}.s3.{settings.aws_region}.amazonaws.com/"
+        )
+        # Expirations URLs have been cached under (see _invalidate)
+        self._presign_expirations: Set[int] = set()
+        self._transfer_config = TransferConfig(
+            multipart_threshold=S3_MULTIPART_THRESHOLD,
+            multipart_chunksize=S3_MULTIPART_CHUNKSIZE,
+            max_concurrency=S3_UPLOAD_MAX_CONCURRENCY,
+            use_threads=True
+        )
+        self._url_cache: TTLCache[str] = TTLCache(maxsize=S3_CACHE_MAX_ENTRIES, ttl=S3_URL_CACHE_TTL)
+        self._exists_cache: TTLCache[bool] = TTLCache(
+            maxsize=S3_CACHE_MAX_ENTRIES, ttl=S3_EXISTS_CACHE_TTL
+        )
         logger.info(f"S3 client initialized for bucket: {self.bucket_name}")
 
-    def generate_s3_key(self, letter_id: str, filename: str) -> str:
+    def generate_s3_key(self, letter_id: str, filename: str, timestamp: Optional[str] = None) -> str:
         """
         Generate S3 object key for a letter image.
 
         Args:
             letter_id: Unique letter identifier
             filename: Original filename
+            timestamp: Optional preformatted UTC timestamp (YYYYmmdd_HHMMSS),
+                shared by images uploaded together
 
         Returns:
             str: S3 key in format: letters/{letter_id}/{timestamp}_{filename}
@@ -52,14 +100,15 @@ class S3Client:
             key = s3_client.generate_s3_key("abc123", "scan.jpg")
             # Returns: "letters/abc123/20240115_123045_scan.jpg"
         """
-        timestamp = datetime.utcnow().strftime("%Y%m%d_%H%M%S")
+        if timestamp is None:
+            timestamp = time.strftime("%Y%m%d_%H%M%S", time.gmtime())
         safe_filename = sanitize_filename(filename)
         s3_key = f"{settings.s3_image_prefix}{letter_id}/{timestamp}_{safe_filename}"
         return s3_key
 
     def upload_file(
         self,
-        file_content: BinaryIO,
+        file_content: Union[BinaryIO, bytes],
         s3_key: str,
         content_type: str = "image/jpeg",
         metadata: Optional[dict] = None
@@ -67,8 +116,11 @@ class S3Client:
         """
         Upload a file to S3.
 
+        Streams the content with the S3 transfer manager, which switches to
+        a parallel multipart upload for files above S3_MULTIPART_THRESHOLD.
+
         Args:
-            file_content: File content as binary stream
+            file_content: File content as binary stream or bytes
             s3_key: S3 object key (path)
             content_type: MIME type of the file
             metadata: Optional metadata to attach to S3 object
@@ -89,12 +141,17 @@ class S3Client:
             if metadata:
                 extra_args['Metadata'] = metadata
 
-            self.client.put_object(
+            if isinstance(file_content, (bytes, bytearray)):
+                file_content = io.BytesIO(file_content)
+
+            self.client.upload_fileobj(
+                Fileobj=file_content,
                 Bucket=self.bucket_name,
                 Key=s3_key,
-                Body=file_content,
-                **extra_args
+                ExtraArgs=extra_args,
+                Config=self._transfer_config
             )
+            self._exists_cache.set(s3_key, True)
 
             logger.info(f"File uploaded successfully: {s3_key}")
             return s3_key
@@ -105,13 +162,18 @@ class S3Client:
             logger.error(f"AWS ClientError uploading to S3: {error_code} - {error_msg}")
             raise Exception(f"Failed to upload file to S3: {error_msg}")
 
+        except S3UploadFailedError as e:
+            # The transfer manager wraps ClientErrors from (multipart) uploads
+            logger.error(f"AWS error uploading to S3: {str(e)}")
+            raise Exception(f"Failed to upload file to S3: {str(e)}")
+
         except Exception as e:
             logger.error(f"Error uploading to S3: {str(e)}", exc_info=True)
             raise
 
     def upload_letter_image(
         self,
-        file_content: BinaryIO,
+        file_content: Union[BinaryIO, bytes],
         letter_id: str,
         filename: str,
         content_type: str = "image/jpeg"
@@ -156,6 +218,59 @@ class S3Client:
             "bucket": self.bucket_name
         }
 
+    def upload_letter_images_bulk(
+        self,
+        files: List[Dict[str, Any]],
+        letter_id: str
+    ) -> List[dict]:
+        """
+        Upload several letter images concurrently.
+
+        All images share one timestamp; duplicate filenames get an index so
+        their keys stay distinct.
+
+        Args:
+            files: List of {"content", "filename", "content_type"} dicts
+            letter_id: Letter ID for organizing images
+
+        Returns:
+            List of upload details (same shape as upload_letter_image), in
+            input order
+
+        Raises:
+            Exception: If any upload fails
+        """
+        timestamp = time.strftime("%Y%m%d_%H%M%S", time.gmtime())
+        s3_keys = []
+        for index, file in enumerate(files):
+            s3_key = self.generate_s3_key(letter_id, file["filename"], timestamp)
+            if s3_key in s3_keys:
+                s3_key = self.generate_s3_key(letter_id, f"{index}_{file['filename']}", timestamp)
+            s3_keys.append(s3_key)
+
+        def upload(index: int) -> dict:
+            file = files[index]
+            self.upload_file(
+                file_content=file["content"],
+                s3_key=s3_keys[index],
+                content_type=file.get("content_type", "image/jpeg"),
+                metadata={
+                    'letter_id': letter_id,
+                    'original_filename': file["filename"]
+                }
+            )
+            return {
+                "s3_key": s3_keys[index],
+                "url": self.generate_presigned_url(s3_keys[index], expiration=3600),
+                "bucket": self.bucket_name
+            }
+
+        if len(files) <= 1:
+            return [upload(index) for index in range(len(files))]
+
+        with ThreadPoolExecutor(max_workers=len(files)) as executor:
+            return list(executor.map(upload, range(len(files))))
+
     def generate_presigned_url(self, s3_key: str, expiration: int = 3600) -> str:
         """
         Generate a presigned URL for secure access to an S3 object.
@@ -170,7 +285,41 @@ class S3Client:
         Example:
             url = s3_client.generate_presigned_url("letters/123/image.jpg")
             # Returns: "https://bucket.s3.amazonaws.com/...?X-Amz-Signature=..."
+
+        Signs a GET request with SigV4 directly instead of going through the
+        boto3 client's request pipeline. Signed URLs are cached and reused
+        while at least half of their lifetime remains.
         """
+        cache_key = (s3_key, expiration)
+        url = self._url_cache.get(cache_key)
+        if url is not None:
+            return url
+
+        if self._credentials is not None:
+            # Like botocore's RequestSigner: a consistent key/secret/token
+            # snapshot per signature (refreshed first if it is about to expire)
+            presigner = S3SigV4QueryAuth(
+                self._credentials.get_frozen_credentials(), 's3', settings.aws_region,
+                expires=expiration
+            )
+            self._presign_expirations.add(expiration)
+
+            request = AWSRequest(
+                method='GET',
+                url=self._object_url_base + quote(s3_key, safe='/~')
+            )
+            presigner.add_auth(request)
+            signed_url: str = request.url
+
+            # A URL stops working once the token it was signed with expires
+            lifetime = float(expiration)
+            credentials_remaining = self._credentials_seconds_remaining()
+            if credentials_remaining is not None:
+                lifetime = min(lifetime, credentials_remaining)
+            if lifetime > 0:
+                self._url_cache.set(cache_key, signed_url, ttl=min(S3_URL_CACHE_TTL, lifetime / 2))
+            return signed_url
+
         try:
             url = self.client.generate_presigned_url(
                 'get_object',
@@ -187,6 +336,26 @@ class S3Client:
             # Return public URL as fallback (requires bucket to be public)
             return f"https://{self.bucket_name}.s3.{settings.aws_region}.amazonaws.com/{s3_key}"
 
+    def _credentials_seconds_remaining(self) -> Optional[float]:
+        """
+        Seconds until the current temporary credentials expire.
+
+        Returns:
+            None for static credentials (no expiry)
+        """
+        # RefreshableCredentials (role/session credentials on Lambda, ECS, EC2)
+        # expose their expiry only as a private attribute
+        expiry_time: Optional[datetime] = getattr(self._credentials, "_expiry_time", None)
+        if expiry_time is None:
+            return None
+        return (expiry_time - datetime.now(timezone.utc)).total_seconds()
+
+    def _invalidate(self, s3_key: str) -> None:
+        """Drop cached URLs and existence results for a deleted object."""
+        self._exists_cache.pop(s3_key)
+        for expiration in list(self._presign_expirations):
+            self._url_cache.pop((s3_key, expiration))
+
     def delete_file(self, s3_key: str) -> bool:
         """
         Delete a file from S3.
@@ -204,6 +373,7 @@ class S3Client:
                 Bucket=self.bucket_name,
                 Key=s3_key
             )
+            self._invalidate(s3_key)
 
             logger.info(f"File deleted successfully: {s3_key}")
             return True
@@ -212,10 +382,37 @@ class S3Client:
             logger.error(f"Error deleting from S3: {str(e)}")
             return False
 
+    def _delete_objects_chunk(self, objects: List[Dict[str, str]]) -> int:
+        """
+        Delete up to 1000 objects in a single DeleteObjects request.
+
+        Args:
+            objects: List of {'Key': ...} dicts
+
+        Returns:
+            int: Number of objects deleted
+        """
+        response = self.client.delete_objects(
+            Bucket=self.bucket_name,
+            Delete={'Objects': objects, 'Quiet': True}
+        )
+        for obj in objects:
+            self._invalidate(obj['Key'])
+
+        # Quiet mode only reports failures
+        errors = response.get('Errors', [])
+        for error in errors:
+            logger.error(f"Error deleting {error.get('Key')}: {error.get('Message')}")
+
+        return len(objects) - len(errors)
+
     def delete_letter_images(self, letter_id: str) -> int:
         """
         Delete all images associated with a letter.
 
+        Lists every page under the letter prefix and deletes the keys in
+        batches of 1000, issuing the batches concurrently.
+
         Args:
             letter_id: Letter ID
 
@@ -226,25 +423,30 @@ class S3Client:
             prefix = f"{settings.s3_image_prefix}{letter_id}/"
             logger.info(f"Deleting all images for letter: {letter_id}")
 
-            # List objects with prefix
-            response = self.client.list_objects_v2(
-                Bucket=self.bucket_name,
-                Prefix=prefix
-            )
-
-            if 'Contents' not in response:
+            # List objects with prefix (all pages)
+            paginator = self.client.get_paginator('list_objects_v2')
+            chunks = []
+            chunk = []
+            for page in paginator.paginate(Bucket=self.bucket_name, Prefix=prefix):
+                for obj in page.get('Contents', []):
+                    chunk.append({'Key': obj['Key']})
+                    if len(chunk) == S3_DELETE_MAX_KEYS:
+                        chunks.append(chunk)
+                        chunk = []
+            if chunk:
+                chunks.append(chunk)
+
+            if not chunks:
                 logger.info("No images found to delete")
                 return 0
 
             # Delete all objects
-            objects_to_delete = [{'Key': obj['Key']} for obj in response['Contents']]
-
-            self.client.delete_objects(
-                Bucket=self.bucket_name,
-                Delete={'Objects': objects_to_delete}
-            )
+            if len(chunks) == 1:
+                deleted_count = self._delete_objects_chunk(chunks[0])
+            else:
+                with ThreadPoolExecutor(max_workers=min(S3_DELETE_MAX_WORKERS, len(chunks))) as executor:
+                    deleted_count = sum(executor.map(self._delete_objects_chunk, chunks))
 
-            deleted_count = len(objects_to_delete)
             logger.info(f"Deleted {deleted_count} images for letter {letter_id}")
             return deleted_count
 
@@ -261,12 +463,21 @@ class S3Client:
 
         Returns:
             bool: True if file exists
+
+        Results are cached for S3_EXISTS_CACHE_TTL seconds.
         """
+        exists = self._exists_cache.get(s3_key)
+        if exists is not None:
+            return exists
+
         try:
             self.client.head_object(Bucket=self.bucket_name, Key=s3_key)
-            return True
+            exists = True
         except ClientError:
-            return False
+            exists = False
+
+        self._exists_cache.set(s3_key, exists)
+        return exists
 
 
 # Global S3 client instance
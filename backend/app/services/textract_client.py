@@ -0,0 +1,116 @@
+"""
+LetterOn Server - AWS Textract Client
+Purpose: Direct Textract OCR calls from the API service (no Lambda hop)
+Testing: Mock boto3 textract client in tests
+AWS Deployment: Ensure textract:DetectDocumentText and s3:GetObject permissions in IAM role
+
+This module provides:
+- Text extraction from letter images stored in S3
+- Results in the same shape as the LetterOnOCRHandler Lambda
+
+Used by lambda_client when AI_DIRECT_INVOCATION is enabled.
+"""
+
+import logging
+from typing import Dict, Any, List
+import boto3
+from botocore.exceptions import ClientError
+
+from app.settings import settings
+from app.utils.aws import get_boto_config, register_retry_logging
+
+logger = logging.getLogger(__name__)
+
+
+class TextractClient:
+    """
+    Client for AWS Textract OCR operations.
+
+    Mirrors the processing done by the OCR Lambda so callers can switch
+    between the two paths without changing response handling.
+    """
+
+    def __init__(self):
+        """Initialize boto3 Textract client with configured credentials."""
+        aws_config = settings.get_aws_credentials()
+        self.client = boto3.client(
+            'textract',
+            config=get_boto_config(read_timeout=settings.aws_ai_read_timeout),
+            **aws_config
+        )
+        register_retry_logging(self.client)
+        logger.info(f"Textract client initialized for region: {settings.aws_region}")
+
+    def detect_text(self, bucket: str, s3_key: str) -> Dict[str, Any]:
+        """
+        Extract text from a single image in S3.
+
+        Args:
+            bucket: S3 bucket name
+            s3_key: S3 object key
+
+        Returns:
+            Dict with OCR results:
+            {
+                "s3_key": "letters/123/image.jpg",
+                "text": "extracted text",
+                "confidence": 95.5,
+                "line_count": 12
+            }
+        """
+        response = self.client.detect_document_text(
+            Document={
+                'S3Object': {
+                    'Bucket': bucket,
+                    'Name': s3_key
+                }
+            }
+        )
+
+        lines = []
+        total_confidence = 0
+        for block in response.get('Blocks', []):
+            if block['BlockType'] == 'LINE':
+                lines.append(block.get('Text', ''))
+                total_confidence += block.get('Confidence', 0)
+
+        avg_confidence = total_confidence / len(lines) if lines else 0
+
+        return {
+            's3_key': s3_key,
+            'text': '\n'.join(lines),
+            'confidence': round(avg_confidence, 2),
+            'line_count': len(lines)
+        }
+
+    def detect_text_batch(self, s3_keys: List[str], bucket: str) -> List[Dict[str, Any]]:
+        """
+        Extract text from multiple images, recording per-image errors.
+
+        Args:
+            s3_keys: List of S3 object keys
+            bucket: S3 bucket name
+
+        Returns:
+            List of OCR result dicts, one per key in input order
+        """
+        logger.info(f"Running Textract on {len(s3_keys)} images")
+
+        ocr_results = []
+        for s3_key in s3_keys:
+            try:
+                ocr_results.append(self.detect_text(bucket, s3_key))
+            except ClientError as e:
+                logger.error(f"Textract error for {s3_key}: {str(e)}")
+                ocr_results.append({
+                    's3_key': s3_key,
+                    'error': str(e),
+                    'text': '',
+                    'confidence': 0.0
+                })
+
+        return ocr_results
+
+
+# Global Textract client instance
+textract_client = TextractClient()
@@ -11,6 +11,7 @@ This module defines all configuration settings for the application including:
 - CORS configuration
 """
 
+from functools import cached_property
 from typing import List
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
@@ -39,6 +40,14 @@ class Settings(BaseSettings):
     aws_access_key_id: str = ""  # Optional, uses default boto3 credentials if empty
     aws_secret_access_key: str = ""  # Optional, uses default boto3 credentials if empty
 
+    # AWS SDK Client Tuning
+    aws_max_attempts: int = 5  # Adaptive retry mode attempts (including the first)
+    aws_connect_timeout: int = 1  # Seconds
+    aws_read_timeout: int = 3  # Seconds, for fast services (DynamoDB, S3)
+    aws_ai_read_timeout: int = 120  # Seconds, for Lambda/Textract/Bedrock calls
+    aws_max_pool_connections: int = 64
+    aws_tcp_keepalive: bool = True  # Keep pooled connections alive between requests
+
     # S3 Configuration
     s3_bucket_name: str = "letteron-images"
     s3_image_prefix: str = "letters/"  # Prefix for letter images in S3
@@ -47,6 +56,10 @@ class Settings(BaseSettings):
     lambda_ocr_function_name: str = "LetterOnOCRHandler"
     lambda_llm_function_name: str = "LetterOnLLMHandler"
 
+    # Direct AI Invocation (skip the Lambda hop, call Textract/Bedrock from the API)
+    ai_direct_invocation: bool = False  # Requires textract/bedrock permissions on the API role
+    bedrock_model_id: str = "anthropic.claude-3-5-sonnet-20241022-v2:0"
+
     # DynamoDB Configuration
     dynamodb_endpoint: str = ""  # For local development (e.g., http://localhost:8002)
 
@@ -55,6 +68,8 @@ class Settings(BaseSettings):
     dynamodb_letters_table: str = "LetterOn-Letters"
     dynamodb_reminders_table: str = "LetterOn-Reminders"
     dynamodb_conversations_table: str = "LetterOn-Conversations"
+    dynamodb_locks_table: str = "LetterOn-Locks"
+    dynamodb_llm_cache_table: str = "LetterOn-LLM-Cache"  # Read/written by the LLM Lambda
 
     # CORS Settings
     cors_origins: str = "http://localhost:3000,http://localhost:3001,http://localhost:5173"
@@ -66,6 +81,18 @@ class Settings(BaseSettings):
 
     # Reminder Scheduler Settings
     reminder_check_interval_seconds: int = 60  # Check reminders every 60 seconds
+    reminder_max_check_interval_seconds: int = 300  # Idle backoff cap
+    reminder_check_jitter_seconds: int = 5  # +/- jitter when the interval changes
+    reminder_batch_size: int = 100  # Max due reminders processed per poll
+    # Set to false in web tasks when polling runs elsewhere (e.g. EventBridge rate rule)
+    scheduler_enabled: bool = True
+    reminder_lock_ttl_seconds: int = 90  # Poller leader lease, renewed on every check
+    # Event-driven delivery: Reminders stream -> EventBridge -> one-shot schedules.
+    # When enabled the API process does not run the polling scheduler.
+    reminder_event_driven: bool = False
+    reminder_processor_lambda_arn: str = ""  # Lambda invoked by each one-shot schedule
+    reminder_scheduler_role_arn: str = ""  # Role EventBridge Scheduler assumes to invoke it
+    reminder_schedule_group: str = "default"
 
     # Rate Limiting (optional - for future implementation)
     rate_limit_enabled: bool = False
@@ -78,21 +105,21 @@ class Settings(BaseSettings):
         extra="ignore"
     )
 
-    @property
+    # Derived values are computed once: settings do not change at runtime
+
+    @cached_property
     def cors_origins_list(self) -> List[str]:
         """Convert CORS origins string to list."""
         return [origin.strip() for origin in self.cors_origins.split(",") if origin.strip()]
 
-    @property
+    @cached_property
     def max_upload_size_bytes(self) -> int:
         """Convert max upload size from MB to bytes."""
         return self.max_upload_size_mb * 1024 * 1024
 
-    def get_aws_credentials(self) -> dict:
-        """
-        Get AWS credentials configuration.
-        Returns empty dict if using default credentials.
-        """
+    @cached_property
+    def aws_credentials(self) -> dict:
+        """AWS credentials configuration (see get_aws_credentials)."""
         if self.aws_access_key_id and self.aws_secret_access_key:
             return {
                 "aws_access_key_id": self.aws_access_key_id,
@@ -101,6 +128,14 @@ class Settings(BaseSettings):
             }
         return {"region_name": self.aws_region}
 
+    def get_aws_credentials(self) -> dict:
+        """
+        Get AWS credentials configuration.
+        Returns only the region if using default credentials.
+        Each call returns a fresh copy, so callers may add client options.
+        """
+        return dict(self.aws_credentials)
+
 
 # Global settings instance
 settings = Settings()
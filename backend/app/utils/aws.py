@@ -0,0 +1,64 @@
+"""
+LetterOn Server - AWS SDK Helpers
+Purpose: Shared botocore configuration for all boto3 clients
+Testing: Import and pass to boto3.client/resource
+AWS Deployment: Tune timeouts and retries with AWS_* environment variables
+
+This module provides:
+- A botocore Config with adaptive retries, bounded timeouts and a sized
+  keep-alive connection pool
+- Retry logging hooks for observability of throttling
+"""
+
+import logging
+from typing import Any, Optional
+from botocore.config import Config
+
+from app.settings import settings
+
+logger = logging.getLogger(__name__)
+
+
+def get_boto_config(read_timeout: Optional[int] = None) -> Config:
+    """
+    Build the botocore Config shared by the application's AWS clients.
+
+    Args:
+        read_timeout: Optional read timeout override in seconds. Use a longer
+            value for slow services (Lambda, Textract, Bedrock).
+
+    Returns:
+        Config: botocore client configuration
+    """
+    return Config(
+        retries={
+            "max_attempts": settings.aws_max_attempts,
+            "mode": "adaptive"
+        },
+        connect_timeout=settings.aws_connect_timeout,
+        read_timeout=read_timeout or settings.aws_read_timeout,
+        max_pool_connections=settings.aws_max_pool_connections,
+        # Keep idle pooled connections open so calls reuse them instead of
+        # paying a new TCP + TLS handshake
+        tcp_keepalive=settings.aws_tcp_keepalive
+    )
+
+
+def _log_retry_attempt(request: Any, operation_name: str, **kwargs) -> None:
+    """Log every retried attempt of an AWS request."""
+    attempt = request.context.get("retries", {}).get("attempt", 1)
+    if attempt > 1:
+        logger.warning(
+            "AWS request retried",
+            extra={"operation": operation_name, "attempt": attempt}
+        )
+
+
+def register_retry_logging(client: Any) -> None:
+    """
+    Attach retry logging to a boto3 client.
+
+    Args:
+        client: boto3 low-level client (use resource.meta.client for resources)
+    """
+    client.meta.events.register("request-created", _log_retry_attempt)
@@ -11,12 +11,31 @@ This module provides:
 - Validation helpers
 """
 
+import secrets
+import time
 import uuid
+import string
 from datetime import datetime, timezone
 from typing import Optional
 import re
 
 
+class _FilenameTranslation(dict):
+    """str.translate table: safe characters map to themselves, anything else to '_'."""
+
+    def __missing__(self, codepoint: int) -> int:
+        return ord('_')
+
+
+_FILENAME_TABLE = _FilenameTranslation(
+    (ord(c), ord(c)) for c in string.ascii_letters + string.digits + '._-'
+)
+_UNDERSCORES_RE = re.compile(r'_{2,}')
+_EMAIL_RE = re.compile(r'^[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}$')
+
+_FILE_SIZE_UNITS = ('B', 'KB', 'MB', 'GB', 'TB', 'PB')
+
+
 def generate_uuid() -> str:
     """
     Generate a unique UUID string.
@@ -24,7 +43,7 @@ def generate_uuid() -> str:
     Returns:
         str: UUID4 string without hyphens
     """
-    return str(uuid.uuid4())
+    return uuid.uuid4().hex
 
 
 def generate_short_id(prefix: str = "") -> str:
@@ -37,8 +56,8 @@ def generate_short_id(prefix: str = "") -> str:
     Returns:
         str: Short unique ID (e.g., "letter_abc123")
     """
-    short_uuid = str(uuid.uuid4())[:8]
-    return f"{prefix}{short_uuid}" if prefix else short_uuid
+    short_id = secrets.token_hex(4)
+    return f"{prefix}{short_id}" if prefix else short_id
 
 
 def get_current_timestamp() -> int:
@@ -48,7 +67,7 @@ def get_current_timestamp() -> int:
     Returns:
         int: Current timestamp
     """
-    return int(datetime.now(timezone.utc).timestamp())
+    return int(time.time())
 
 
 def get_current_iso_timestamp() -> str:
@@ -87,8 +106,7 @@ def is_valid_email(email: str) -> bool:
     Returns:
         bool: True if valid email format
     """
-    pattern = r'^[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}$'
-    return bool(re.match(pattern, email))
+    return _EMAIL_RE.match(email) is not None
 
 
 def sanitize_filename(filename: str) -> str:
@@ -101,10 +119,11 @@ def sanitize_filename(filename: str) -> str:
     Returns:
         str: Sanitized filename safe for S3
     """
-    # Remove special characters, keep alphanumeric, dots, hyphens, underscores
-    sanitized = re.sub(r'[^a-zA-Z0-9._-]', '_', filename)
+    # Replace special characters, keep alphanumeric, dots, hyphens, underscores
+    sanitized = filename.translate(_FILENAME_TABLE)
     # Remove multiple consecutive underscores
-    sanitized = re.sub(r'_+', '_', sanitized)
+    if '__' in sanitized:
+        sanitized = _UNDERSCORES_RE.sub('_', sanitized)
     return sanitized
 
 
@@ -122,7 +141,7 @@ def truncate_string(text: str, max_length: int = 100, suffix: str = "...") -> st
     """
     if len(text) <= max_length:
         return text
-    return text[:max_length - len(suffix)] + suffix
+    return f"{text[:max_length - len(suffix)]}{suffix}"
 
 
 def get_file_extension(filename: str) -> str:
@@ -148,11 +167,11 @@ def format_file_size(size_bytes: int) -> str:
     Returns:
         str: Formatted file size (e.g., "1.5 MB")
     """
-    for unit in ['B', 'KB', 'MB', 'GB', 'TB']:
-        if size_bytes < 1024.0:
-            return f"{size_bytes:.1f} {unit}"
-        size_bytes /= 1024.0
-    return f"{size_bytes:.1f} PB"
+    if size_bytes < 1024:
+        return f"{size_bytes:.1f} B"
+    # Each unit is 2**10 times the previous one, so the bit length picks it
+    exponent = min((int(size_bytes).bit_length() - 1) // 10, len(_FILE_SIZE_UNITS) - 1)
+    return f"{size_bytes / (1 << (10 * exponent)):.1f} {_FILE_SIZE_UNITS[exponent]}"
 
 
 def safe_get(dictionary: dict, *keys, default=None):
@@ -169,10 +188,9 @@ def safe_get(dictionary: dict, *keys, default=None):
     """
     result = dictionary
     for key in keys:
-        if isinstance(result, dict):
-            result = result.get(key)
-        else:
+        if not isinstance(result, dict):
             return default
+        result = result.get(key)
         if result is None:
             return default
     return result
@@ -10,64 +10,86 @@ This module sets up structured logging that:
 - Works well with CloudWatch Logs Insights
 """
 
+import json
 import logging
 import sys
-from pythonjsonlogger import jsonlogger
 
 from app.settings import settings
 
 
-def setup_logging():
+# Third-party loggers that are too chatty below WARNING
+NOISY_LOGGERS = ("boto3", "botocore", "urllib3", "s3transfer")
+
+
+# Attributes every LogRecord has; anything else was passed via `extra=`
+_RESERVED_RECORD_ATTRS = frozenset(
+    vars(logging.LogRecord("", 0, "", 0, "", None, None))
+) | {"message", "asctime"}
+
+_encode_json = json.JSONEncoder(default=str).encode
+
+
+class CustomJsonFormatter(logging.Formatter):
     """
-    Configure application-wide structured logging.
+    JSON formatter with standard fields plus any `extra=` attributes.
 
-    Creates a JSON formatter that outputs to stdout for CloudWatch.
-    Log level is controlled by the LOG_LEVEL environment variable.
+    Builds the payload dict directly and encodes it with the C-accelerated
+    stdlib encoder, one json line per record.
     """
 
-    # Create JSON formatter
-    class CustomJsonFormatter(jsonlogger.JsonFormatter):
-        """Custom JSON formatter with additional fields."""
+    def format(self, record: logging.LogRecord) -> str:
+        payload = {
+            'timestamp': self.formatTime(record, self.datefmt),
+            'level': record.levelname,
+            'name': record.name,
+            'message': record.getMessage(),
+        }
+
+        # Add fields passed via extra=
+        for key, value in record.__dict__.items():
+            if key not in _RESERVED_RECORD_ATTRS:
+                payload[key] = value
 
-        def add_fields(self, log_record, record, message_dict):
-            super(CustomJsonFormatter, self).add_fields(log_record, record, message_dict)
+        payload['logger'] = record.name
+        payload['environment'] = settings.environment
 
-            # Add standard fields
-            log_record['timestamp'] = self.formatTime(record, self.datefmt)
-            log_record['level'] = record.levelname
-            log_record['logger'] = record.name
-            log_record['environment'] = settings.environment
+        # Add exception info if present
+        if record.exc_info:
+            payload['exception'] = self.formatException(record.exc_info)
 
-            # Add exception info if present
-            if record.exc_info:
-                log_record['exception'] = self.formatException(record.exc_info)
+        return _encode_json(payload)
+
+
+def setup_logging():
+    """
+    Configure application-wide structured logging.
+
+    Creates a JSON formatter that outputs to stdout for CloudWatch.
+    Log level is controlled by the LOG_LEVEL environment variable.
+    """
+    level = getattr(logging, settings.log_level.upper(), logging.INFO)
 
     # Configure root logger
     root_logger = logging.getLogger()
-    root_logger.setLevel(getattr(logging, settings.log_level.upper()))
+    root_logger.setLevel(level)
 
     # Remove existing handlers
     root_logger.handlers = []
 
     # Create console handler
     console_handler = logging.StreamHandler(sys.stdout)
-    console_handler.setLevel(getattr(logging, settings.log_level.upper()))
+    console_handler.setLevel(level)
 
     # Set formatter
-    formatter = CustomJsonFormatter(
-        '%(timestamp)s %(level)s %(name)s %(message)s',
-        datefmt='%Y-%m-%d %H:%M:%S'
-    )
+    formatter = CustomJsonFormatter(datefmt='%Y-%m-%d %H:%M:%S')
     console_handler.setFormatter(formatter)
 
     # Add handler to root logger
     root_logger.addHandler(console_handler)
 
     # Suppress noisy loggers
-    logging.getLogger("boto3").setLevel(logging.WARNING)
-    logging.getLogger("botocore").setLevel(logging.WARNING)
-    logging.getLogger("urllib3").setLevel(logging.WARNING)
-    logging.getLogger("s3transfer").setLevel(logging.WARNING)
+    for name in NOISY_LOGGERS:
+        logging.getLogger(name).setLevel(logging.WARNING)
 
     return root_logger
 
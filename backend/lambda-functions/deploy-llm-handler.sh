@@ -62,6 +62,9 @@ RUNTIME="python3.11"
 HANDLER="lambda_function.lambda_handler"
 REGION="${AWS_REGION:-eu-central-1}"  # Use region from .env or default to eu-central-1
 ROLE_NAME="LetterOnLLMHandlerRole"
+# Memory also sets CPU share: 1769 MB = one full vCPU, which speeds up boto3
+# marshalling and JSON work. Use 3008 (two vCPUs) for OCR with OCR_DOWNSCALE_IMAGES.
+MEMORY_SIZE="${MEMORY_SIZE:-1769}"
 
 # Set default region if not in .env
 export AWS_DEFAULT_REGION="$REGION"
@@ -186,8 +189,9 @@ echo "Step 3: Packaging Lambda function..."
 rm -rf package
 mkdir -p package
 
-# Install dependencies (boto3 is already included in Lambda runtime)
-# pip install --target ./package -r requirements.txt
+# Install dependencies: the runtime's bundled boto3 may predate the Converse
+# fields (cachePoint, performanceConfig) the handler sends
+pip install --quiet --target ./package -r requirements.txt
 
 # Copy Lambda function
 cp lambda_function.py package/
@@ -220,7 +224,7 @@ if aws lambda get-function --function-name $FUNCTION_NAME --region $REGION 2>/de
         --handler $HANDLER \
         --role $ROLE_ARN \
         --timeout 300 \
-        --memory-size 1024 \
+        --memory-size $MEMORY_SIZE \
         --region $REGION > /dev/null
 
     echo "✓ Function updated"
@@ -233,7 +237,7 @@ else
         --handler $HANDLER \
         --zip-file fileb://function.zip \
         --timeout 300 \
-        --memory-size 1024 \
+        --memory-size $MEMORY_SIZE \
         --region $REGION > /dev/null
 
     echo "✓ Function created"
@@ -275,6 +279,49 @@ if [ -f /tmp/response-llm.json ]; then
     cat /tmp/response-llm.json | python3 -m json.tool 2>/dev/null || cat /tmp/response-llm.json
 fi
 
+# Step 7: Schedule warm-up pings (keeps execution environments initialized)
+echo ""
+echo "Step 7: Scheduling warm-up pings..."
+WARMER_CONCURRENCY="${WARMER_CONCURRENCY:-3}"
+RULE_NAME="${FUNCTION_NAME}-warmer"
+
+if [ "$WARMER_CONCURRENCY" -gt 0 ]; then
+    FUNCTION_ARN=$(aws lambda get-function --function-name $FUNCTION_NAME --region $REGION --query Configuration.FunctionArn --output text)
+
+    RULE_ARN=$(aws events put-rule \
+        --name $RULE_NAME \
+        --schedule-expression "rate(5 minutes)" \
+        --region $REGION \
+        --query RuleArn --output text)
+
+    aws lambda add-permission \
+        --function-name $FUNCTION_NAME \
+        --statement-id "${RULE_NAME}-invoke" \
+        --action lambda:InvokeFunction \
+        --principal events.amazonaws.com \
+        --source-arn $RULE_ARN \
+        --region $REGION > /dev/null 2>&1 || echo "Invoke permission already granted"
+
+    cat > /tmp/warmer-targets-llm.json <<EOF
+[
+  {
+    "Id": "1",
+    "Arn": "$FUNCTION_ARN",
+    "Input": "{\\"warmup\\": true, \\"concurrency\\": $WARMER_CONCURRENCY}"
+  }
+]
+EOF
+
+    aws events put-targets \
+        --rule $RULE_NAME \
+        --targets file:///tmp/warmer-targets-llm.json \
+        --region $REGION > /dev/null
+
+    echo "✓ $RULE_NAME pings $WARMER_CONCURRENCY environment(s) every 5 minutes"
+else
+    echo "Skipped (WARMER_CONCURRENCY=0)"
+fi
+
 # Cleanup
 echo ""
 echo "Cleaning up..."
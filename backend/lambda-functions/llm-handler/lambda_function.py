@@ -6,16 +6,228 @@ Input: OCR text only
 Output: Structured JSON with categorization and analysis
 """
 
+import hashlib
 import json
 import boto3
 import os
-from typing import Dict, Any
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Any, List, Optional
+from botocore.config import Config
+from botocore.exceptions import ClientError
+
+# Shared client configuration: pooled keep-alive connections, bounded timeouts, fast retries
+CLIENT_CONFIG = Config(
+    max_pool_connections=50,
+    tcp_keepalive=True,
+    connect_timeout=3,
+    read_timeout=60,  # Generation can run long; fail before the Lambda timeout
+    retries={'max_attempts': 3, 'mode': 'adaptive'}
+)
+
+# Initialize AWS clients once per container (module scope)
+bedrock_runtime = boto3.client(
+    'bedrock-runtime',
+    region_name=os.environ.get('AWS_REGION', 'us-east-1'),
+    config=CLIENT_CONFIG
+)
+dynamodb = boto3.client(
+    'dynamodb',
+    region_name=os.environ.get('AWS_REGION', 'us-east-1'),
+    config=CLIENT_CONFIG
+)
+
+# Result cache: identical letter text (recurring bills, notices) reuses the
+# stored analysis instead of calling Bedrock again. Empty table name disables it.
+LLM_CACHE_TABLE = os.environ.get('LLM_CACHE_TABLE', 'LetterOn-LLM-Cache')
+LLM_CACHE_TTL_SECONDS = int(os.environ.get('LLM_CACHE_TTL_SECONDS', str(30 * 24 * 3600)))
+_cache_enabled = bool(LLM_CACHE_TABLE)
+
+# Model configuration (set CLAUDE_MODEL_ID to a cross-region inference profile,
+# e.g. us.anthropic.claude-3-5-haiku-20241022-v1:0, for latency-optimized inference)
+CLAUDE_MODEL_ID = os.environ.get('CLAUDE_MODEL_ID', "anthropic.claude-3-5-sonnet-20241022-v2:0")
+
+# Latency-optimized inference (only available for some models and regions)
+BEDROCK_LATENCY_OPTIMIZED = os.environ.get('BEDROCK_LATENCY_OPTIMIZED', '0').lower() in ('1', 'true', 'yes')
+
+# Concurrent Bedrock calls when a batch of letters is analyzed in one invocation
+BATCH_MAX_WORKERS = int(os.environ.get('BATCH_MAX_WORKERS', '8'))
+
+# Output/input bounds for letter analysis: the tool call needs a few hundred
+# tokens, and long OCR texts keep their head and tail (where salient details sit)
+ANALYSIS_MAX_TOKENS = int(os.environ.get('ANALYSIS_MAX_TOKENS', '600'))
+MAX_LETTER_CHARS = 8000
+TRUNCATED_HEAD_CHARS = 4000
+TRUNCATED_TAIL_CHARS = 2000
+TRUNCATION_MARKER = "\n...[truncated]...\n"
+
+# Scheduled warm-up pings ({"warmup": true}): fan-out cap and per-ping hold time
+WARMER_MAX_CONCURRENCY = 10
+WARMER_HOLD_SECONDS = 0.1
+
+# Compact JSON for response bodies: smaller payloads, less serialization work
+JSON_SEPARATORS = (',', ':')
+
+WARM_UP_CONNECTIONS = os.environ.get('WARM_UP_CONNECTIONS', '1').lower() in ('1', 'true', 'yes')
+
+
+def warm_up_connections() -> None:
+    """
+    Open the Bedrock runtime connection during container init.
+
+    Sends an empty request that is rejected without invoking a model, so the
+    TLS handshake and endpoint resolution happen before the first real call.
+    """
+    try:
+        bedrock_runtime.invoke_model(modelId=CLAUDE_MODEL_ID, body=b'{}')
+    except ClientError:
+        pass
+    except Exception as e:
+        print(f"Connection warm-up skipped: {str(e)}")
+
+
+if WARM_UP_CONNECTIONS:
+    warm_up_connections()
 
-# Initialize AWS Bedrock client
-bedrock_runtime = boto3.client('bedrock-runtime', region_name=os.environ.get('AWS_REGION', 'us-east-1'))
 
-# Model configuration
-CLAUDE_MODEL_ID = "anthropic.claude-3-5-sonnet-20241022-v2:0"
+# Static analysis instructions, sent as a cached system prompt so only the
+# letter text is processed fresh on each invocation
+ANALYSIS_INSTRUCTIONS = """You are an AI assistant helping to analyze incoming mail and letters.
+
+Analyze the letter text provided by the user and provide a structured response.
+
+Please extract and provide:
+
+1. **Subject**: Create a concise subject line for this letter (e.g., "Payment Notice - Invoice #12345")
+
+2. **Sender**: Identify the sender's name or organization
+
+3. **Category**: Classify into one of these categories:
+   - financial-billing: Bills, invoices, payment requests
+   - official-government: Government, legal, tax documents
+   - personal: Personal correspondence, cards, invitations
+   - marketing: Advertisements, promotional material
+   - financial-banking: Bank statements, investment reports
+   - health-medical: Medical records, prescriptions, health insurance
+   - miscellaneous: Everything else
+
+4. **Action Status**: Determine urgency:
+   - require-action: Requires immediate action (bills, legal deadlines)
+   - action-done: Action already completed or acknowledged
+   - no-action-needed: Informational only
+
+5. **Has Reminder**: Should this have a reminder? (true/false)
+
+6. **Action Due Date**: If there's a deadline, extract it (format: YYYY-MM-DD, or null if none)
+
+7. **AI Suggestion**: Provide a brief, actionable suggestion for the recipient (1-2 sentences)
+
+8. **Summary**: Brief 2-3 sentence summary of the letter
+
+9. **Key Points**: Extract 3-5 most important points
+
+10. **Amount**: If this is a bill or financial document, extract the total amount owed (number only, or null)
+
+11. **Confidence**: Your confidence in this analysis (high/medium/low)
+
+Record your analysis by calling the emit_analysis tool."""
+
+# Built once: the system blocks (instructions + cache point) and the user message prefix are static
+ANALYSIS_SYSTEM = [
+    {"text": ANALYSIS_INSTRUCTIONS},
+    {"cachePoint": {"type": "default"}}
+]
+LETTER_PROMPT_PREFIX = "Letter Text:\n"
+
+# Structured output: Claude is forced to call this tool, so its input is the analysis dict
+ANALYSIS_TOOL = {
+    "name": "emit_analysis",
+    "description": "Record the structured analysis of a letter.",
+    "input_schema": {
+        "type": "object",
+        "properties": {
+            "subject": {"type": "string"},
+            "sender": {"type": "string"},
+            "category": {
+                "type": "string",
+                "enum": [
+                    "financial-billing", "official-government", "personal", "marketing",
+                    "financial-banking", "health-medical", "miscellaneous"
+                ]
+            },
+            "action_status": {
+                "type": "string",
+                "enum": ["require-action", "action-done", "no-action-needed"]
+            },
+            "has_reminder": {"type": "boolean"},
+            "action_due_date": {"type": ["string", "null"], "description": "YYYY-MM-DD"},
+            "ai_suggestion": {"type": "string"},
+            "summary": {"type": "string"},
+            "key_points": {"type": "array", "items": {"type": "string"}},
+            "amount": {"type": ["number", "null"]},
+            "confidence": {"type": "string", "enum": ["high", "medium", "low"]}
+        },
+        "required": [
+            "subject", "sender", "category", "action_status", "has_reminder", "action_due_date",
+            "ai_suggestion", "summary", "key_points", "amount", "confidence"
+        ]
+    }
+}
+
+# Fingerprint of everything besides the model and letter that shapes an analysis;
+# part of the cache key so prompt, schema or budget changes skip old results
+ANALYSIS_CACHE_VERSION = hashlib.sha256(json.dumps([
+    ANALYSIS_SYSTEM, LETTER_PROMPT_PREFIX, ANALYSIS_TOOL, ANALYSIS_MAX_TOKENS,
+    MAX_LETTER_CHARS, TRUNCATED_HEAD_CHARS, TRUNCATED_TAIL_CHARS, TRUNCATION_MARKER
+], sort_keys=True).encode('utf-8')).hexdigest()[:16]
+
+
+def to_json(data: Any) -> str:
+    """Serialize to compact JSON (no whitespace, UTF-8 kept as-is)."""
+    return json.dumps(data, separators=JSON_SEPARATORS, ensure_ascii=False)
+
+
+def handle_warmup(event: Dict[str, Any], context: Any) -> Dict[str, Any]:
+    """
+    Answer a scheduled warm-up ping without doing any work.
+
+    With "concurrency" > 1 the ping fans out that many overlapping
+    invocations of this function, so several execution environments
+    stay initialized (module-level clients, imports) rather than one.
+
+    Args:
+        event: {"warmup": true, "concurrency": 3}
+        context: Lambda context (function name used for the fan-out)
+
+    Returns:
+        Lambda response with the number of environments pinged
+    """
+    concurrency = max(1, min(int(event.get('concurrency', 1)), WARMER_MAX_CONCURRENCY))
+
+    if concurrency > 1 and context is not None:
+        lambda_client = boto3.client('lambda', config=CLIENT_CONFIG)
+        payload = to_json({'warmup': True, 'concurrency': 1}).encode('utf-8')
+
+        def ping(_: int) -> None:
+            try:
+                lambda_client.invoke(
+                    FunctionName=context.function_name,
+                    InvocationType='RequestResponse',
+                    Payload=payload
+                )
+            except Exception as e:
+                print(f"Warm-up ping failed: {str(e)}")
+
+        with ThreadPoolExecutor(max_workers=concurrency - 1) as executor:
+            list(executor.map(ping, range(concurrency - 1)))
+    else:
+        # Hold the environment briefly so overlapping pings land on different ones
+        time.sleep(WARMER_HOLD_SECONDS)
+
+    return {
+        'statusCode': 200,
+        'body': to_json({'warm': True, 'concurrency': concurrency})
+    }
 
 
 def lambda_handler(event: Dict[str, Any], context: Any) -> Dict[str, Any]:
@@ -26,8 +238,12 @@ def lambda_handler(event: Dict[str, Any], context: Any) -> Dict[str, Any]:
     {
         "text": "The OCR extracted text from the letter..."
     }
+    or, to analyze several letters concurrently:
+    {
+        "texts": ["First letter text...", "Second letter text..."]
+    }
 
-    Returns:
+    Returns (for "texts", {"results": [...]} in input order):
     {
         "subject": "string",
         "sender": "string",
@@ -43,22 +259,39 @@ def lambda_handler(event: Dict[str, Any], context: Any) -> Dict[str, Any]:
     }
     """
 
+    # Scheduled warm-up ping: return before any real work
+    if event.get('warmup'):
+        return handle_warmup(event, context)
+
     try:
         # Parse input
-        print(f"Received event: {json.dumps(event)}")
-        
         if isinstance(event.get('body'), str):
             body = json.loads(event['body'])
         else:
             body = event
 
+        # Log the shape only; serializing the whole letter text is wasted work
+        print(
+            f"Received event keys={sorted(event)} text_len={len(body.get('text') or '')} "
+            f"texts={len(body.get('texts') or [])}"
+        )
+
+        # Batch of letters: analyze concurrently over the shared client
+        texts = body.get('texts')
+        if texts:
+            print(f"Processing batch of {len(texts)} letters")
+            return {
+                'statusCode': 200,
+                'body': to_json({'results': analyze_letters_batch(texts)})
+            }
+
         # Extract text from body
         text = body.get('text', '')
 
         if not text or not text.strip():
             return {
                 'statusCode': 400,
-                'body': json.dumps({
+                'body': to_json({
                     'error': 'Missing text field in request body'
                 })
             }
@@ -70,7 +303,7 @@ def lambda_handler(event: Dict[str, Any], context: Any) -> Dict[str, Any]:
 
         return {
             'statusCode': 200,
-            'body': json.dumps(result)
+            'body': to_json(result)
         }
 
     except Exception as e:
@@ -79,107 +312,65 @@ def lambda_handler(event: Dict[str, Any], context: Any) -> Dict[str, Any]:
         traceback.print_exc()
         return {
             'statusCode': 500,
-            'body': json.dumps({
+            'body': to_json({
                 'error': f'Internal server error: {str(e)}'
             })
         }
 
 
-def analyze_letter(text: str) -> Dict[str, Any]:
+def truncate_letter_text(text: str) -> str:
     """
-    Analyze letter text and extract structured information.
+    Cap letter text fed to the model.
 
     Args:
         text: The OCR extracted text from the letter
 
     Returns:
-        Dictionary with structured analysis results
+        The text unchanged if short enough, else its head and tail joined by a marker
     """
+    if len(text) <= MAX_LETTER_CHARS:
+        return text
+    return text[:TRUNCATED_HEAD_CHARS] + TRUNCATION_MARKER + text[-TRUNCATED_TAIL_CHARS:]
 
-    prompt = f"""You are an AI assistant helping to analyze incoming mail and letters.
-
-Analyze the following letter text and provide a structured response:
-
-Letter Text:
-{text}
-
-Please extract and provide:
-
-1. **Subject**: Create a concise subject line for this letter (e.g., "Payment Notice - Invoice #12345")
-
-2. **Sender**: Identify the sender's name or organization
-
-3. **Category**: Classify into one of these categories:
-   - financial-billing: Bills, invoices, payment requests
-   - official-government: Government, legal, tax documents
-   - personal: Personal correspondence, cards, invitations
-   - marketing: Advertisements, promotional material
-   - financial-banking: Bank statements, investment reports
-   - health-medical: Medical records, prescriptions, health insurance
-   - miscellaneous: Everything else
-
-4. **Action Status**: Determine urgency:
-   - require-action: Requires immediate action (bills, legal deadlines)
-   - action-done: Action already completed or acknowledged
-   - no-action-needed: Informational only
-
-5. **Has Reminder**: Should this have a reminder? (true/false)
-
-6. **Action Due Date**: If there's a deadline, extract it (format: YYYY-MM-DD, or null if none)
-
-7. **AI Suggestion**: Provide a brief, actionable suggestion for the recipient (1-2 sentences)
 
-8. **Summary**: Brief 2-3 sentence summary of the letter
-
-9. **Key Points**: Extract 3-5 most important points
+def analyze_letter(text: str) -> Dict[str, Any]:
+    """
+    Analyze letter text and extract structured information.
 
-10. **Amount**: If this is a bill or financial document, extract the total amount owed (number only, or null)
+    Args:
+        text: The OCR extracted text from the letter
 
-11. **Confidence**: Your confidence in this analysis (high/medium/low)
+    Returns:
+        Dictionary with structured analysis results
+    """
+    cache_key = analysis_cache_key(text)
+    cached = get_cached_analysis(cache_key)
+    if cached is not None:
+        print("Returning cached analysis")
+        return cached
 
-IMPORTANT: Respond with ONLY valid JSON, no additional text before or after. Use this exact structure:
-
-{{
-  "subject": "string",
-  "sender": "string",
-  "category": "financial-billing",
-  "action_status": "require-action",
-  "has_reminder": true,
-  "action_due_date": "2024-12-31",
-  "ai_suggestion": "string",
-  "summary": "string",
-  "key_points": ["point1", "point2", "point3"],
-  "amount": 125.50,
-  "confidence": "high"
-}}"""
-
-    response = invoke_claude(prompt)
-
-    # Parse JSON response
     try:
-        # Extract JSON from response (in case there's extra text)
-        json_start = response.find('{')
-        json_end = response.rfind('}') + 1
-        
-        if json_start == -1 or json_end == 0:
-            raise ValueError("No JSON found in response")
-        
-        json_str = response[json_start:json_end]
-        result = json.loads(json_str)
-        
+        result = invoke_claude_tool(
+            LETTER_PROMPT_PREFIX + truncate_letter_text(text),
+            ANALYSIS_TOOL,
+            max_tokens=ANALYSIS_MAX_TOKENS,
+            system=ANALYSIS_SYSTEM
+        )
+
         # Validate required fields
         required_fields = ['subject', 'sender', 'category', 'action_status', 'has_reminder', 'ai_suggestion']
         for field in required_fields:
             if field not in result:
                 result[field] = get_default_value(field)
         
-        print(f"Successfully parsed LLM response: {json.dumps(result)}")
+        print(f"Successfully parsed LLM response with {len(result)} fields")
+        put_cached_analysis(cache_key, result)
         return result
-        
-    except (json.JSONDecodeError, ValueError) as e:
-        print(f"JSON parsing error: {str(e)}")
-        print(f"Raw response: {response}")
-        
+
+
+    except ValueError as e:
+        print(f"Structured output error: {str(e)}")
+
         # Fallback with default values
         return {
             'subject': 'Untitled Letter',
@@ -192,11 +383,104 @@ IMPORTANT: Respond with ONLY valid JSON, no additional text before or after. Use
             'summary': text[:200] if len(text) > 200 else text,
             'key_points': [],
             'amount': None,
-            'confidence': 'low',
-            'raw_response': response[:500]  # Include part of raw response for debugging
+            'confidence': 'low'
         }
 
 
+def analysis_cache_key(text: str) -> str:
+    """Hash the model ID, analysis version and letter text into a result cache key."""
+    return hashlib.sha256(
+        f"{CLAUDE_MODEL_ID}\n{ANALYSIS_CACHE_VERSION}\n{text}".encode('utf-8')
+    ).hexdigest()
+
+
+def get_cached_analysis(cache_key: str) -> Optional[Dict[str, Any]]:
+    """
+    Look up a stored analysis.
+
+    Args:
+        cache_key: Key from analysis_cache_key
+
+    Returns:
+        The cached analysis, or None on a miss or cache error
+    """
+    global _cache_enabled
+    if not _cache_enabled:
+        return None
+
+    try:
+        response = dynamodb.get_item(
+            TableName=LLM_CACHE_TABLE,
+            Key={'text_sha256': {'S': cache_key}}
+        )
+    except ClientError as e:
+        if e.response['Error']['Code'] == 'ResourceNotFoundException':
+            print(f"LLM cache table {LLM_CACHE_TABLE} not found; caching disabled")
+            _cache_enabled = False
+        else:
+            print(f"LLM cache read error: {str(e)}")
+        return None
+
+    item = response.get('Item')
+    # TTL deletion is lazy, so expired items can still be returned
+    if not item or int(item['expires_at']['N']) <= int(time.time()):
+        return None
+    return json.loads(item['result']['S'])
+
+
+def put_cached_analysis(cache_key: str, result: Dict[str, Any]) -> None:
+    """
+    Store an analysis; errors are logged and ignored.
+
+    Args:
+        cache_key: Key from analysis_cache_key
+        result: Analysis to store
+    """
+    if not _cache_enabled:
+        return
+
+    try:
+        dynamodb.put_item(
+            TableName=LLM_CACHE_TABLE,
+            Item={
+                'text_sha256': {'S': cache_key},
+                'result': {'S': to_json(result)},
+                'expires_at': {'N': str(int(time.time()) + LLM_CACHE_TTL_SECONDS)}
+            }
+        )
+    except ClientError as e:
+        print(f"LLM cache write error: {str(e)}")
+
+
+def analyze_letters_batch(texts: List[str]) -> List[Dict[str, Any]]:
+    """
+    Analyze several letters concurrently.
+
+    Bedrock calls are network-bound, so running them on threads over the
+    shared (thread-safe) client makes the batch take about as long as its
+    slowest letter instead of the sum of all of them.
+
+    Args:
+        texts: OCR extracted texts, one per letter
+
+    Returns:
+        Analysis results in the same order as texts; a letter that fails
+        yields an {"error": ...} entry instead of failing the batch
+    """
+    def analyze_one(text: str) -> Dict[str, Any]:
+        if not text or not text.strip():
+            return {'error': 'Empty letter text'}
+        try:
+            return analyze_letter(text)
+        except Exception as e:
+            print(f"Batch item error: {str(e)}")
+            return {'error': str(e)}
+
+    max_workers = max(1, min(len(texts), BATCH_MAX_WORKERS))
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        return list(executor.map(analyze_one, texts))
+
+
 def get_default_value(field: str) -> Any:
     """Get default value for a field"""
     defaults = {
@@ -215,54 +499,140 @@ def get_default_value(field: str) -> Any:
     return defaults.get(field, None)
 
 
-def invoke_claude(prompt: str, max_tokens: int = 2000) -> str:
+def build_request(prompt: str, max_tokens: int, system: Optional[List[Dict[str, Any]]] = None) -> Dict[str, Any]:
     """
-    Invoke Claude via AWS Bedrock.
+    Build single-turn Converse API arguments.
 
     Args:
         prompt: The prompt to send to Claude
         max_tokens: Maximum tokens in response
+        system: Optional system content blocks (may include a cachePoint)
 
     Returns:
-        Claude's response as a string
+        Keyword arguments for bedrock_runtime.converse
     """
-
-    # Prepare request body for Claude
-    request_body = {
-        "anthropic_version": "bedrock-2023-05-31",
-        "max_tokens": max_tokens,
-        "temperature": 0.3,  # Lower temperature for more consistent structured output
-        "messages": [
+    request = {
+        'modelId': CLAUDE_MODEL_ID,
+        'messages': [
             {
-                "role": "user",
-                "content": prompt
+                'role': 'user',
+                'content': [{'text': prompt}]
             }
-        ]
+        ],
+        'inferenceConfig': {
+            'maxTokens': max_tokens,
+            'temperature': 0.3  # Lower temperature for more consistent structured output
+        }
     }
+    if system:
+        request['system'] = system
+    if BEDROCK_LATENCY_OPTIMIZED:
+        request['performanceConfig'] = {'latency': 'optimized'}
+    return request
+
 
+def invoke_bedrock(request: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Send a request to Claude via the Bedrock Converse API.
+
+    Args:
+        request: Keyword arguments for bedrock_runtime.converse
+
+    Returns:
+        Converse response (already parsed by botocore)
+    """
     try:
         print(f"Invoking Bedrock with model: {CLAUDE_MODEL_ID}")
-        
-        # Invoke Bedrock
-        response = bedrock_runtime.invoke_model(
-            modelId=CLAUDE_MODEL_ID,
-            contentType="application/json",
-            accept="application/json",
-            body=json.dumps(request_body)
-        )
 
-        # Parse response
-        response_body = json.loads(response['body'].read())
+        response = bedrock_runtime.converse(**request)
 
-        # Extract text from Claude's response
-        content_blocks = response_body.get('content', [])
-        if content_blocks:
-            response_text = content_blocks[0].get('text', '')
-            print(f"Received {len(response_text)} characters from Claude")
-            return response_text
+        usage = response.get('usage', {})
+        if usage.get('cacheReadInputTokens') or usage.get('cacheWriteInputTokens'):
+            print(
+                f"Prompt cache: read {usage.get('cacheReadInputTokens', 0)} tokens, "
+                f"wrote {usage.get('cacheWriteInputTokens', 0)} tokens"
+            )
 
-        raise Exception("No content in Bedrock response")
+        return response
 
     except Exception as e:
         print(f"Error invoking Bedrock: {str(e)}")
-        raise
\ No newline at end of file
+        raise
+
+
+def invoke_claude(prompt: str, max_tokens: int = 600, system: Optional[List[Dict[str, Any]]] = None) -> str:
+    """
+    Invoke Claude via AWS Bedrock.
+
+    Args:
+        prompt: The prompt to send to Claude
+        max_tokens: Maximum tokens in response
+        system: Optional system content blocks (may include a cachePoint)
+
+    Returns:
+        Claude's response as a string
+    """
+    response = invoke_bedrock(build_request(prompt, max_tokens, system))
+
+    # Extract text from Claude's response
+    for block in response['output']['message']['content']:
+        if 'text' in block:
+            response_text = block['text']
+            print(f"Received {len(response_text)} characters from Claude")
+            return response_text
+
+    raise Exception("No content in Bedrock response")
+
+
+def invoke_claude_tool(
+    prompt: str,
+    tool: Dict[str, Any],
+    max_tokens: int = 600,
+    system: Optional[List[Dict[str, Any]]] = None
+) -> Dict[str, Any]:
+    """
+    Invoke Claude via AWS Bedrock, forcing a call to the given tool.
+
+    The tool input is already a parsed object, so no JSON has to be
+    extracted from free text.
+
+    Args:
+        prompt: The prompt to send to Claude
+        tool: Tool definition (name, description, input_schema)
+        max_tokens: Maximum tokens in response
+        system: Optional system content blocks (may include a cachePoint)
+
+    Returns:
+        The tool input produced by Claude
+
+    Raises:
+        ValueError: If the response contains no complete call to the tool
+    """
+    request = build_request(prompt, max_tokens, system)
+    request['toolConfig'] = {
+        'tools': [
+            {
+                'toolSpec': {
+                    'name': tool['name'],
+                    'description': tool['description'],
+                    'inputSchema': {'json': tool['input_schema']}
+                }
+            }
+        ],
+        'toolChoice': {'tool': {'name': tool['name']}}
+    }
+
+    response = invoke_bedrock(request)
+
+    # A call cut off by max_tokens carries partial input; treat it as missing
+    if response.get('stopReason') == 'max_tokens':
+        raise ValueError(f"{tool['name']} tool call truncated at {max_tokens} tokens")
+
+    for block in response['output']['message']['content']:
+        tool_use = block.get('toolUse')
+        if tool_use and tool_use.get('name') == tool['name']:
+            print(f"Received {tool['name']} tool call from Claude")
+            return tool_use.get('input', {})
+
+    raise ValueError(f"No {tool['name']} tool call in Bedrock response "
+                     f"(stopReason: {response.get('stopReason')})")
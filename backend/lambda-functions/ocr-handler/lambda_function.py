@@ -14,14 +14,119 @@ This Lambda function:
 import json
 import boto3
 import os
-from typing import Dict, List, Any
-
-# Initialize AWS clients
-textract = boto3.client('textract')
-s3 = boto3.client('s3')
+import time
+from concurrent.futures import ThreadPoolExecutor
+from io import BytesIO
+from typing import Dict, List, Any, Tuple
+from botocore.config import Config
+from botocore.exceptions import ClientError
+
+try:
+    from PIL import Image  # Optional: only needed for OCR_DOWNSCALE_IMAGES
+except ImportError:
+    Image = None
+
+# Shared client configuration: pooled keep-alive connections, bounded timeouts, fast retries
+CLIENT_CONFIG = Config(
+    max_pool_connections=50,
+    tcp_keepalive=True,
+    connect_timeout=3,
+    read_timeout=30,
+    retries={'max_attempts': 3, 'mode': 'adaptive'}
+)
+
+# Initialize AWS clients once per container (module scope)
+textract = boto3.client('textract', config=CLIENT_CONFIG)
+s3 = boto3.client('s3', config=CLIENT_CONFIG)
 
 # Configuration from environment variables
 S3_BUCKET_NAME = os.environ.get('S3_BUCKET_NAME', 'letteron-images')
+# Concurrent Textract calls per invocation (keep below the account TPS limit)
+OCR_MAX_WORKERS = int(os.environ.get('OCR_MAX_WORKERS', '10'))
+# Downscale large photos before Textract: accuracy plateaus well below phone
+# camera resolution, and smaller images are processed faster (requires Pillow)
+OCR_DOWNSCALE_IMAGES = os.environ.get('OCR_DOWNSCALE_IMAGES', '0').lower() in ('1', 'true', 'yes')
+OCR_MAX_IMAGE_EDGE = int(os.environ.get('OCR_MAX_IMAGE_EDGE', '2000'))
+
+# Asynchronous (multi-page) detection: Textract reports completion on this SNS topic
+TEXTRACT_SNS_TOPIC_ARN = os.environ.get('TEXTRACT_SNS_TOPIC_ARN', '')
+TEXTRACT_SNS_ROLE_ARN = os.environ.get('TEXTRACT_SNS_ROLE_ARN', '')
+OCR_RESULTS_PREFIX = os.environ.get('OCR_RESULTS_PREFIX', 'ocr-results/')
+
+# Scheduled warm-up pings ({"warmup": true}): fan-out cap and per-ping hold time
+WARMER_MAX_CONCURRENCY = 10
+WARMER_HOLD_SECONDS = 0.1
+
+# Compact JSON for response bodies: smaller payloads, less serialization work
+JSON_SEPARATORS = (',', ':')
+WARM_UP_CONNECTIONS = os.environ.get('WARM_UP_CONNECTIONS', '1').lower() in ('1', 'true', 'yes')
+
+
+def warm_up_connections() -> None:
+    """
+    Open the Textract connection during container init.
+
+    Sends a request that fails fast (unknown job ID) so the TLS handshake
+    and endpoint resolution happen before the first real invocation.
+    """
+    try:
+        textract.get_document_text_detection(JobId='0' * 64)
+    except ClientError:
+        pass
+    except Exception as e:
+        print(f"Connection warm-up skipped: {str(e)}")
+
+
+if WARM_UP_CONNECTIONS:
+    warm_up_connections()
+
+
+def to_json(data: Any) -> str:
+    """Serialize to compact JSON (no whitespace, UTF-8 kept as-is)."""
+    return json.dumps(data, separators=JSON_SEPARATORS, ensure_ascii=False)
+
+
+def handle_warmup(event: Dict[str, Any], context: Any) -> Dict[str, Any]:
+    """
+    Answer a scheduled warm-up ping without doing any work.
+
+    With "concurrency" > 1 the ping fans out that many overlapping
+    invocations of this function, so several execution environments
+    stay initialized (module-level clients, imports) rather than one.
+
+    Args:
+        event: {"warmup": true, "concurrency": 3}
+        context: Lambda context (function name used for the fan-out)
+
+    Returns:
+        Lambda response with the number of environments pinged
+    """
+    concurrency = max(1, min(int(event.get('concurrency', 1)), WARMER_MAX_CONCURRENCY))
+
+    if concurrency > 1 and context is not None:
+        lambda_client = boto3.client('lambda', config=CLIENT_CONFIG)
+        payload = to_json({'warmup': True, 'concurrency': 1}).encode('utf-8')
+
+        def ping(_: int) -> None:
+            try:
+                lambda_client.invoke(
+                    FunctionName=context.function_name,
+                    InvocationType='RequestResponse',
+                    Payload=payload
+                )
+            except Exception as e:
+                print(f"Warm-up ping failed: {str(e)}")
+
+        with ThreadPoolExecutor(max_workers=concurrency - 1) as executor:
+            list(executor.map(ping, range(concurrency - 1)))
+    else:
+        # Hold the environment briefly so overlapping pings land on different ones
+        time.sleep(WARMER_HOLD_SECONDS)
+
+    return {
+        'statusCode': 200,
+        'body': to_json({'warm': True, 'concurrency': concurrency})
+    }
 
 
 def lambda_handler(event: Dict[str, Any], context: Any) -> Dict[str, Any]:
@@ -31,9 +136,15 @@ def lambda_handler(event: Dict[str, Any], context: Any) -> Dict[str, Any]:
     Expected event format:
     {
         "s3_keys": ["letters/image1.jpg", "letters/image2.jpg"],
-        "bucket": "letteron-images"  # Optional, defaults to env var
+        "bucket": "letteron-images",  # Optional, defaults to env var
+        "include_blocks": false,  # Optional, return raw Textract blocks
+        "async_mode": false  # Optional, start async jobs for multi-page documents
     }
 
+    With async_mode the handler returns 202 and one job per key; when Textract
+    publishes completion to TEXTRACT_SNS_TOPIC_ARN (subscribed to this
+    function), the results are written to s3://bucket/OCR_RESULTS_PREFIX<job_id>.json
+
     Returns:
     {
         "statusCode": 200,
@@ -43,14 +154,22 @@ def lambda_handler(event: Dict[str, Any], context: Any) -> Dict[str, Any]:
                     "s3_key": "letters/image1.jpg",
                     "text": "Extracted text...",
                     "confidence": 95.5,
-                    "blocks": [...]  # Raw Textract blocks
+                    "blocks": [...]  # Raw Textract blocks (only with include_blocks)
                 }
             ]
         }
     }
     """
 
+    # Scheduled warm-up ping: return before any real work
+    if event.get('warmup'):
+        return handle_warmup(event, context)
+
     try:
+        # Textract completion notifications arrive through SNS
+        if is_textract_notification(event):
+            return handle_textract_notification(event)
+
         # Parse input
         if isinstance(event.get('body'), str):
             body = json.loads(event['body'])
@@ -59,35 +178,32 @@ def lambda_handler(event: Dict[str, Any], context: Any) -> Dict[str, Any]:
 
         s3_keys = body.get('s3_keys', [])
         bucket = body.get('bucket', S3_BUCKET_NAME)
+        include_blocks = bool(body.get('include_blocks', False))
 
         if not s3_keys:
             return {
                 'statusCode': 400,
-                'body': json.dumps({
+                'body': to_json({
                     'error': 'Missing required field: s3_keys'
                 })
             }
 
+        if body.get('async_mode'):
+            return start_async_jobs(bucket, s3_keys)
+
         print(f"Processing {len(s3_keys)} images from bucket: {bucket}")
 
-        # Process each image
-        ocr_results = []
-        for s3_key in s3_keys:
-            try:
-                result = process_image(bucket, s3_key)
-                ocr_results.append(result)
-            except Exception as e:
-                print(f"Error processing {s3_key}: {str(e)}")
-                ocr_results.append({
-                    's3_key': s3_key,
-                    'error': str(e),
-                    'text': '',
-                    'confidence': 0.0
-                })
+        # Process images concurrently; results keep the input order
+        max_workers = max(1, min(len(s3_keys), OCR_MAX_WORKERS))
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            ocr_results = list(executor.map(
+                lambda s3_key: process_image_safe(bucket, s3_key, include_blocks),
+                s3_keys
+            ))
 
         return {
             'statusCode': 200,
-            'body': json.dumps({
+            'body': to_json({
                 'ocr_results': ocr_results,
                 'total_processed': len(ocr_results)
             })
@@ -97,19 +213,45 @@ def lambda_handler(event: Dict[str, Any], context: Any) -> Dict[str, Any]:
         print(f"Lambda error: {str(e)}")
         return {
             'statusCode': 500,
-            'body': json.dumps({
+            'body': to_json({
                 'error': f'Internal server error: {str(e)}'
             })
         }
 
 
-def process_image(bucket: str, s3_key: str) -> Dict[str, Any]:
+def process_image_safe(bucket: str, s3_key: str, include_blocks: bool = False) -> Dict[str, Any]:
+    """
+    Process a single image, returning an error record instead of raising.
+
+    Args:
+        bucket: S3 bucket name
+        s3_key: S3 object key
+        include_blocks: Include raw Textract blocks in the result
+
+    Returns:
+        Dictionary with OCR results or the error for this image
+    """
+    try:
+        return process_image(bucket, s3_key, include_blocks)
+    except Exception as e:
+        print(f"Error processing {s3_key}: {str(e)}")
+        return {
+            's3_key': s3_key,
+            'error': str(e),
+            'text': '',
+            'confidence': 0.0
+        }
+
+
+def process_image(bucket: str, s3_key: str, include_blocks: bool = False) -> Dict[str, Any]:
     """
     Process a single image using AWS Textract.
 
     Args:
         bucket: S3 bucket name
         s3_key: S3 object key
+        include_blocks: Include raw Textract blocks in the result. They are
+            often hundreds of KB per page, so they are left out by default.
 
     Returns:
         Dictionary with OCR results
@@ -117,19 +259,71 @@ def process_image(bucket: str, s3_key: str) -> Dict[str, Any]:
     print(f"Processing image: s3://{bucket}/{s3_key}")
 
     # Call Textract
-    response = textract.detect_document_text(
-        Document={
-            'S3Object': {
-                'Bucket': bucket,
-                'Name': s3_key
-            }
-        }
-    )
+    response = textract.detect_document_text(Document=build_document(bucket, s3_key))
 
     # Extract text and confidence
     blocks = response.get('Blocks', [])
+    result = summarize_blocks(s3_key, blocks)
+    if include_blocks:
+        result['blocks'] = blocks  # Raw blocks for advanced processing
+    return result
+
+
+def build_document(bucket: str, s3_key: str) -> Dict[str, Any]:
+    """
+    Build the Textract Document argument for an image.
+
+    By default Textract reads the object from S3 itself. With
+    OCR_DOWNSCALE_IMAGES, images whose longest edge exceeds OCR_MAX_IMAGE_EDGE
+    are downloaded, resized and sent as bytes; anything else (small images,
+    PDFs, unreadable files) still goes by S3 reference.
+
+    Args:
+        bucket: S3 bucket name
+        s3_key: S3 object key
+
+    Returns:
+        Document dict for detect_document_text
+    """
+    s3_document = {'S3Object': {'Bucket': bucket, 'Name': s3_key}}
+    if not OCR_DOWNSCALE_IMAGES:
+        return s3_document
+    if Image is None:
+        print("OCR_DOWNSCALE_IMAGES is set but Pillow is not installed; sending original image")
+        return s3_document
+
+    try:
+        data = s3.get_object(Bucket=bucket, Key=s3_key)['Body'].read()
+        image = Image.open(BytesIO(data))
+        if max(image.size) <= OCR_MAX_IMAGE_EDGE:
+            return s3_document
+
+        original_size = image.size
+        image_format = 'PNG' if image.format == 'PNG' else 'JPEG'
+        if image_format == 'JPEG' and image.mode != 'RGB':
+            image = image.convert('RGB')
+        image.thumbnail((OCR_MAX_IMAGE_EDGE, OCR_MAX_IMAGE_EDGE), Image.LANCZOS)
+
+        buffer = BytesIO()
+        image.save(buffer, format=image_format, quality=90)
+        print(f"Downscaled {s3_key} from {original_size} to {image.size}")
+        return {'Bytes': buffer.getvalue()}
+    except Exception as e:
+        print(f"Downscale skipped for {s3_key}: {str(e)}")
+        return s3_document
+
+
+def summarize_blocks(s3_key: str, blocks: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """
+    Combine Textract LINE blocks into text and an average confidence.
+
+    Args:
+        s3_key: S3 object key the blocks came from
+        blocks: Textract blocks (any page count)
 
-    # Combine all LINE blocks to get full text
+    Returns:
+        Dictionary with OCR results (without raw blocks)
+    """
     extracted_text = []
     total_confidence = 0
     line_count = 0
@@ -149,11 +343,135 @@ def process_image(bucket: str, s3_key: str) -> Dict[str, Any]:
         's3_key': s3_key,
         'text': full_text,
         'confidence': round(avg_confidence, 2),
-        'line_count': line_count,
-        'blocks': blocks  # Include raw blocks for advanced processing
+        'line_count': line_count
     }
 
 
+def start_async_jobs(bucket: str, s3_keys: List[str]) -> Dict[str, Any]:
+    """
+    Start asynchronous text detection for each document.
+
+    Textract processes the pages itself and notifies SNS when done, so this
+    invocation returns immediately instead of idling on the result.
+
+    Args:
+        bucket: S3 bucket name
+        s3_keys: S3 object keys (multi-page PDF/TIFF supported)
+
+    Returns:
+        Lambda response with a job (or error) per key
+    """
+    if not TEXTRACT_SNS_TOPIC_ARN or not TEXTRACT_SNS_ROLE_ARN:
+        return {
+            'statusCode': 400,
+            'body': to_json({
+                'error': 'async_mode requires TEXTRACT_SNS_TOPIC_ARN and TEXTRACT_SNS_ROLE_ARN'
+            })
+        }
+
+    jobs = []
+    for s3_key in s3_keys:
+        try:
+            response = textract.start_document_text_detection(
+                DocumentLocation={'S3Object': {'Bucket': bucket, 'Name': s3_key}},
+                NotificationChannel={
+                    'SNSTopicArn': TEXTRACT_SNS_TOPIC_ARN,
+                    'RoleArn': TEXTRACT_SNS_ROLE_ARN
+                }
+            )
+            job_id = response['JobId']
+            print(f"Started text detection job {job_id} for s3://{bucket}/{s3_key}")
+            jobs.append({
+                's3_key': s3_key,
+                'job_id': job_id,
+                'result_key': f"{OCR_RESULTS_PREFIX}{job_id}.json"
+            })
+        except Exception as e:
+            print(f"Error starting job for {s3_key}: {str(e)}")
+            jobs.append({'s3_key': s3_key, 'error': str(e)})
+
+    return {
+        'statusCode': 202,
+        'body': to_json({'jobs': jobs})
+    }
+
+
+def is_textract_notification(event: Dict[str, Any]) -> bool:
+    """Check whether the event is an SNS delivery (Textract job completion)."""
+    records = event.get('Records')
+    return bool(records) and records[0].get('EventSource') == 'aws:sns'
+
+
+def handle_textract_notification(event: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Collect finished asynchronous jobs and store their results in S3.
+
+    Args:
+        event: SNS event carrying Textract completion messages
+
+    Returns:
+        Lambda response listing the stored result keys
+    """
+    stored = []
+    for record in event['Records']:
+        message = json.loads(record['Sns']['Message'])
+        job_id = message['JobId']
+        location = message.get('DocumentLocation', {})
+        bucket = location.get('S3Bucket', S3_BUCKET_NAME)
+        s3_key = location.get('S3ObjectName', '')
+
+        if message.get('Status') == 'SUCCEEDED':
+            try:
+                result = summarize_blocks(s3_key, get_text_detection_blocks(job_id))
+            except Exception as e:
+                print(f"Error collecting job {job_id}: {str(e)}")
+                result = {'s3_key': s3_key, 'error': str(e), 'text': '', 'confidence': 0.0}
+        else:
+            print(f"Text detection job {job_id} ended with status {message.get('Status')}")
+            result = {
+                's3_key': s3_key,
+                'error': f"Textract job {message.get('Status')}",
+                'text': '',
+                'confidence': 0.0
+            }
+
+        result['job_id'] = job_id
+        result_key = f"{OCR_RESULTS_PREFIX}{job_id}.json"
+        s3.put_object(
+            Bucket=bucket,
+            Key=result_key,
+            Body=to_json(result).encode('utf-8'),
+            ContentType='application/json'
+        )
+        stored.append(result_key)
+
+    return {
+        'statusCode': 200,
+        'body': to_json({'stored': stored})
+    }
+
+
+def get_text_detection_blocks(job_id: str) -> List[Dict[str, Any]]:
+    """
+    Read all result pages of an asynchronous text detection job.
+
+    Args:
+        job_id: Textract job ID
+
+    Returns:
+        All blocks across result pages
+    """
+    blocks = []
+    params = {'JobId': job_id}
+    while True:
+        response = textract.get_document_text_detection(**params)
+        blocks.extend(response.get('Blocks', []))
+        next_token = response.get('NextToken')
+        if not next_token:
+            return blocks
+        params['NextToken'] = next_token
+
+
 def get_document_analysis(bucket: str, s3_key: str) -> Dict[str, Any]:
     """
     Advanced document analysis using Textract (for structured documents).
@@ -178,11 +496,14 @@ def get_document_analysis(bucket: str, s3_key: str) -> Dict[str, Any]:
         FeatureTypes=['TABLES', 'FORMS']
     )
 
+    # Index blocks once for both extractors
+    block_map, key_blocks, table_blocks = index_blocks(response.get('Blocks', []))
+
     # Extract key-value pairs
-    key_values = extract_key_values(response)
+    key_values = extract_key_values(key_blocks, block_map)
 
     # Extract tables
-    tables = extract_tables(response)
+    tables = extract_tables(table_blocks, block_map)
 
     return {
         's3_key': s3_key,
@@ -192,82 +513,99 @@ def get_document_analysis(bucket: str, s3_key: str) -> Dict[str, Any]:
     }
 
 
-def extract_key_values(response: Dict[str, Any]) -> List[Dict[str, str]]:
-    """Extract key-value pairs from Textract response."""
-    key_values = []
-    blocks = response.get('Blocks', [])
+def index_blocks(blocks: List[Dict[str, Any]]) -> Tuple[Dict[str, Dict], List[Dict], List[Dict]]:
+    """
+    Index Textract blocks in a single pass.
 
-    # Create a map of block IDs to blocks
-    block_map = {block['Id']: block for block in blocks}
+    Args:
+        blocks: Textract blocks
+
+    Returns:
+        Tuple of (block ID -> block map, KEY blocks, TABLE blocks)
+    """
+    block_map = {}
+    key_blocks = []
+    table_blocks = []
 
     for block in blocks:
-        if block['BlockType'] == 'KEY_VALUE_SET' and 'KEY' in block.get('EntityTypes', []):
-            key_text = get_text_from_relationship(block, block_map, 'CHILD')
-            value_text = ''
-
-            # Find the VALUE block
-            if 'Relationships' in block:
-                for relationship in block['Relationships']:
-                    if relationship['Type'] == 'VALUE':
-                        for value_id in relationship['Ids']:
-                            value_block = block_map.get(value_id)
-                            if value_block:
-                                value_text = get_text_from_relationship(value_block, block_map, 'CHILD')
-
-            if key_text:
-                key_values.append({
-                    'key': key_text,
-                    'value': value_text
-                })
+        block_map[block['Id']] = block
+        block_type = block['BlockType']
+        if block_type == 'KEY_VALUE_SET':
+            if 'KEY' in block.get('EntityTypes', ()):
+                key_blocks.append(block)
+        elif block_type == 'TABLE':
+            table_blocks.append(block)
+
+    return block_map, key_blocks, table_blocks
+
+
+def extract_key_values(key_blocks: List[Dict], block_map: Dict[str, Dict]) -> List[Dict[str, str]]:
+    """Extract key-value pairs from KEY_VALUE_SET (KEY) blocks."""
+    key_values = []
+
+    for block in key_blocks:
+        key_text = get_text_from_relationship(block, block_map, 'CHILD')
+        value_text = ''
+
+        # Find the VALUE block
+        if 'Relationships' in block:
+            for relationship in block['Relationships']:
+                if relationship['Type'] == 'VALUE':
+                    for value_id in relationship['Ids']:
+                        value_block = block_map.get(value_id)
+                        if value_block:
+                            value_text = get_text_from_relationship(value_block, block_map, 'CHILD')
+
+        if key_text:
+            key_values.append({
+                'key': key_text,
+                'value': value_text
+            })
 
     return key_values
 
 
-def extract_tables(response: Dict[str, Any]) -> List[List[List[str]]]:
-    """Extract tables from Textract response."""
+def extract_tables(table_blocks: List[Dict], block_map: Dict[str, Dict]) -> List[List[List[str]]]:
+    """Extract tables from TABLE blocks."""
     tables = []
-    blocks = response.get('Blocks', [])
 
-    block_map = {block['Id']: block for block in blocks}
+    for block in table_blocks:
+        table = []
+        if 'Relationships' in block:
+            for relationship in block['Relationships']:
+                if relationship['Type'] == 'CHILD':
+                    for cell_id in relationship['Ids']:
+                        cell_block = block_map.get(cell_id)
+                        if cell_block and cell_block['BlockType'] == 'CELL':
+                            row_index = cell_block.get('RowIndex', 0) - 1
+                            col_index = cell_block.get('ColumnIndex', 0) - 1
 
-    for block in blocks:
-        if block['BlockType'] == 'TABLE':
-            table = []
-            if 'Relationships' in block:
-                for relationship in block['Relationships']:
-                    if relationship['Type'] == 'CHILD':
-                        for cell_id in relationship['Ids']:
-                            cell_block = block_map.get(cell_id)
-                            if cell_block and cell_block['BlockType'] == 'CELL':
-                                row_index = cell_block.get('RowIndex', 0) - 1
-                                col_index = cell_block.get('ColumnIndex', 0) - 1
-
-                                # Ensure table has enough rows
-                                while len(table) <= row_index:
-                                    table.append([])
-
-                                # Ensure row has enough columns
-                                while len(table[row_index]) <= col_index:
-                                    table[row_index].append('')
-
-                                # Get cell text
-                                cell_text = get_text_from_relationship(cell_block, block_map, 'CHILD')
-                                table[row_index][col_index] = cell_text
-
-            if table:
-                tables.append(table)
+                            # Ensure table has enough rows
+                            while len(table) <= row_index:
+                                table.append([])
+
+                            # Ensure row has enough columns
+                            while len(table[row_index]) <= col_index:
+                                table[row_index].append('')
+
+                            # Get cell text
+                            cell_text = get_text_from_relationship(cell_block, block_map, 'CHILD')
+                            table[row_index][col_index] = cell_text
+
+        if table:
+            tables.append(table)
 
     return tables
 
 
 def get_text_from_relationship(block: Dict, block_map: Dict, relationship_type: str) -> str:
     """Helper function to extract text from block relationships."""
-    text = ''
-    if 'Relationships' in block:
-        for relationship in block['Relationships']:
-            if relationship['Type'] == relationship_type:
-                for child_id in relationship['Ids']:
-                    word_block = block_map.get(child_id)
-                    if word_block and word_block['BlockType'] == 'WORD':
-                        text += word_block.get('Text', '') + ' '
-    return text.strip()
+    get_block = block_map.get
+    words = []
+    for relationship in block.get('Relationships', ()):
+        if relationship['Type'] == relationship_type:
+            for child_id in relationship['Ids']:
+                word_block = get_block(child_id)
+                if word_block and word_block['BlockType'] == 'WORD':
+                    words.append(word_block.get('Text', ''))
+    return ' '.join(words).strip()
@@ -7,45 +7,52 @@ AWS Deployment: Run once during initial setup
 This script creates:
 - LetterOn-Users table with email GSI
 - LetterOn-Letters table with user_id GSI
-- LetterOn-Reminders table with user_id GSI
+- LetterOn-Reminders table with user_id GSI, sparse pending-index GSI and a stream
 - LetterOn-Conversations table with letter_id GSI
+- LetterOn-Locks table (lease locks, expires_at TTL)
+- LetterOn-LLM-Cache table (LLM analyses by text hash, expires_at TTL)
+
+Re-running it upgrades an existing Reminders table in place: the
+pending-index GSI and the stream are added if missing, and unsent reminders
+written before the index existed get pending_shard/pending_reminder_time
+backfilled (otherwise the poller, which only reads the index, never sees them).
 """
 
 import boto3
 import sys
+import threading
 import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Optional
 from botocore.exceptions import ClientError
 
 # Load settings
 try:
     from app.settings import settings
+    from app.services.dynamo import DynamoDBClient, PENDING_REMINDERS_INDEX
 except ImportError:
     print("Error: Cannot import settings. Make sure you're in the project root directory.")
     sys.exit(1)
 
 
-def create_tables():
-    """Create all DynamoDB tables for LetterOn."""
+# Serializes output from the worker threads
+_print_lock = threading.Lock()
 
-    # Initialize DynamoDB client
-    aws_config = settings.get_aws_credentials()
+# Parallel UpdateItem calls while backfilling pending-index keys
+BACKFILL_WORKERS = 16
 
-    # Add endpoint URL for local development
-    if settings.dynamodb_endpoint:
-        aws_config['endpoint_url'] = settings.dynamodb_endpoint
-        print(f"Using DynamoDB endpoint: {settings.dynamodb_endpoint}")
-
-    dynamodb = boto3.client('dynamodb', **aws_config)
 
-    print("Creating DynamoDB tables...")
-    print(f"Region: {settings.aws_region}")
+def report(message: str) -> None:
+    """Print a line without interleaving with other threads."""
+    with _print_lock:
+        print(message)
 
-    tables_created = []
 
-    # ===== CREATE USERS TABLE =====
-    try:
-        print(f"\n1. Creating table: {settings.dynamodb_users_table}")
-        dynamodb.create_table(
+def table_definitions() -> List[dict]:
+    """Return the create_table arguments for every LetterOn table."""
+    return [
+        # ===== USERS TABLE =====
+        dict(
             TableName=settings.dynamodb_users_table,
             KeySchema=[
                 {'AttributeName': 'user_id', 'KeyType': 'HASH'}
@@ -68,19 +75,9 @@ def create_tables():
                 {'Key': 'Project', 'Value': 'LetterOn'},
                 {'Key': 'Environment', 'Value': settings.environment}
             ]
-        )
-        print(f"✓ {settings.dynamodb_users_table} created successfully")
-        tables_created.append(settings.dynamodb_users_table)
-    except ClientError as e:
-        if e.response['Error']['Code'] == 'ResourceInUseException':
-            print(f"⚠ {settings.dynamodb_users_table} already exists")
-        else:
-            print(f"✗ Error creating {settings.dynamodb_users_table}: {e}")
-
-    # ===== CREATE LETTERS TABLE =====
-    try:
-        print(f"\n2. Creating table: {settings.dynamodb_letters_table}")
-        dynamodb.create_table(
+        ),
+        # ===== LETTERS TABLE =====
+        dict(
             TableName=settings.dynamodb_letters_table,
             KeySchema=[
                 {'AttributeName': 'letter_id', 'KeyType': 'HASH'}
@@ -105,26 +102,18 @@ def create_tables():
                 {'Key': 'Project', 'Value': 'LetterOn'},
                 {'Key': 'Environment', 'Value': settings.environment}
             ]
-        )
-        print(f"✓ {settings.dynamodb_letters_table} created successfully")
-        tables_created.append(settings.dynamodb_letters_table)
-    except ClientError as e:
-        if e.response['Error']['Code'] == 'ResourceInUseException':
-            print(f"⚠ {settings.dynamodb_letters_table} already exists")
-        else:
-            print(f"✗ Error creating {settings.dynamodb_letters_table}: {e}")
-
-    # ===== CREATE REMINDERS TABLE =====
-    try:
-        print(f"\n3. Creating table: {settings.dynamodb_reminders_table}")
-        dynamodb.create_table(
+        ),
+        # ===== REMINDERS TABLE =====
+        dict(
             TableName=settings.dynamodb_reminders_table,
             KeySchema=[
                 {'AttributeName': 'reminder_id', 'KeyType': 'HASH'}
             ],
             AttributeDefinitions=[
                 {'AttributeName': 'reminder_id', 'AttributeType': 'S'},
-                {'AttributeName': 'user_id', 'AttributeType': 'S'}
+                {'AttributeName': 'user_id', 'AttributeType': 'S'},
+                {'AttributeName': 'pending_shard', 'AttributeType': 'N'},
+                {'AttributeName': 'pending_reminder_time', 'AttributeType': 'N'}
             ],
             GlobalSecondaryIndexes=[
                 {
@@ -133,26 +122,30 @@ def create_tables():
                         {'AttributeName': 'user_id', 'KeyType': 'HASH'}
                     ],
                     'Projection': {'ProjectionType': 'ALL'}
+                },
+                {
+                    # Sparse: only unsent reminders have these attributes
+                    'IndexName': 'pending-index',
+                    'KeySchema': [
+                        {'AttributeName': 'pending_shard', 'KeyType': 'HASH'},
+                        {'AttributeName': 'pending_reminder_time', 'KeyType': 'RANGE'}
+                    ],
+                    'Projection': {'ProjectionType': 'ALL'}
                 }
             ],
+            # Feeds the EventBridge Pipe that schedules event-driven reminders
+            StreamSpecification={
+                'StreamEnabled': True,
+                'StreamViewType': 'NEW_IMAGE'
+            },
             BillingMode='PAY_PER_REQUEST',
             Tags=[
                 {'Key': 'Project', 'Value': 'LetterOn'},
                 {'Key': 'Environment', 'Value': settings.environment}
             ]
-        )
-        print(f"✓ {settings.dynamodb_reminders_table} created successfully")
-        tables_created.append(settings.dynamodb_reminders_table)
-    except ClientError as e:
-        if e.response['Error']['Code'] == 'ResourceInUseException':
-            print(f"⚠ {settings.dynamodb_reminders_table} already exists")
-        else:
-            print(f"✗ Error creating {settings.dynamodb_reminders_table}: {e}")
-
-    # ===== CREATE CONVERSATIONS TABLE =====
-    try:
-        print(f"\n4. Creating table: {settings.dynamodb_conversations_table}")
-        dynamodb.create_table(
+        ),
+        # ===== CONVERSATIONS TABLE =====
+        dict(
             TableName=settings.dynamodb_conversations_table,
             KeySchema=[
                 {'AttributeName': 'conversation_id', 'KeyType': 'HASH'}
@@ -177,29 +170,214 @@ def create_tables():
                 {'Key': 'Project', 'Value': 'LetterOn'},
                 {'Key': 'Environment', 'Value': settings.environment}
             ]
+        ),
+        # ===== LOCKS TABLE =====
+        dict(
+            TableName=settings.dynamodb_locks_table,
+            KeySchema=[
+                {'AttributeName': 'lock_id', 'KeyType': 'HASH'}
+            ],
+            AttributeDefinitions=[
+                {'AttributeName': 'lock_id', 'AttributeType': 'S'}
+            ],
+            BillingMode='PAY_PER_REQUEST',
+            Tags=[
+                {'Key': 'Project', 'Value': 'LetterOn'},
+                {'Key': 'Environment', 'Value': settings.environment}
+            ]
+        ),
+        # ===== LLM CACHE TABLE =====
+        dict(
+            TableName=settings.dynamodb_llm_cache_table,
+            KeySchema=[
+                {'AttributeName': 'text_sha256', 'KeyType': 'HASH'}
+            ],
+            AttributeDefinitions=[
+                {'AttributeName': 'text_sha256', 'AttributeType': 'S'}
+            ],
+            BillingMode='PAY_PER_REQUEST',
+            Tags=[
+                {'Key': 'Project', 'Value': 'LetterOn'},
+                {'Key': 'Environment', 'Value': settings.environment}
+            ]
         )
-        print(f"✓ {settings.dynamodb_conversations_table} created successfully")
-        tables_created.append(settings.dynamodb_conversations_table)
+    ]
+
+
+def create_table(dynamodb, definition: dict) -> Optional[str]:
+    """
+    Create one table.
+
+    Returns:
+        The table name if it was created, None if it exists or failed
+    """
+    table_name = definition['TableName']
+    try:
+        dynamodb.create_table(**definition)
+        report(f"✓ {table_name} created successfully")
+        return table_name
     except ClientError as e:
         if e.response['Error']['Code'] == 'ResourceInUseException':
-            print(f"⚠ {settings.dynamodb_conversations_table} already exists")
+            report(f"⚠ {table_name} already exists")
         else:
-            print(f"✗ Error creating {settings.dynamodb_conversations_table}: {e}")
+            report(f"✗ Error creating {table_name}: {e}")
+        return None
+
+
+def wait_for_table(dynamodb, table_name: str) -> None:
+    """Block until a table is active."""
+    try:
+        dynamodb.get_waiter('table_exists').wait(
+            TableName=table_name,
+            WaiterConfig={'Delay': 2, 'MaxAttempts': 30}
+        )
+        report(f"✓ {table_name} is now active")
+    except Exception as e:
+        report(f"⚠ Error waiting for {table_name}: {e}")
+
+
+def wait_until_active(dynamodb, table_name: str) -> None:
+    """Block until a table and all of its indexes are active."""
+    while True:
+        table = dynamodb.describe_table(TableName=table_name)['Table']
+        statuses = [table['TableStatus']] + [
+            index['IndexStatus'] for index in table.get('GlobalSecondaryIndexes', [])
+        ]
+        if all(status == 'ACTIVE' for status in statuses):
+            return
+        time.sleep(5)
+
+
+def upgrade_reminders_table(dynamodb, definition: dict) -> None:
+    """
+    Add the pending-index GSI and the stream to a Reminders table created
+    before they existed. Each UpdateTable waits for the previous one.
+    """
+    table_name = definition['TableName']
+    table = dynamodb.describe_table(TableName=table_name)['Table']
+
+    existing_indexes = {index['IndexName'] for index in table.get('GlobalSecondaryIndexes', [])}
+    if PENDING_REMINDERS_INDEX not in existing_indexes:
+        index = next(
+            index for index in definition['GlobalSecondaryIndexes']
+            if index['IndexName'] == PENDING_REMINDERS_INDEX
+        )
+        dynamodb.update_table(
+            TableName=table_name,
+            AttributeDefinitions=definition['AttributeDefinitions'],
+            GlobalSecondaryIndexUpdates=[{'Create': index}]
+        )
+        report(f"⏳ Adding {PENDING_REMINDERS_INDEX} to {table_name} (backfills in the background)...")
+        wait_until_active(dynamodb, table_name)
+        report(f"✓ {PENDING_REMINDERS_INDEX} is now active on {table_name}")
+
+    if not table.get('StreamSpecification', {}).get('StreamEnabled'):
+        dynamodb.update_table(
+            TableName=table_name,
+            StreamSpecification=definition['StreamSpecification']
+        )
+        wait_until_active(dynamodb, table_name)
+        report(f"✓ Stream enabled on {table_name}")
+
+
+def backfill_pending_reminders(dynamodb, table_name: str) -> int:
+    """
+    Write pending-index keys on unsent reminders that do not have them.
+
+    The update is conditional on the reminder still being unsent, so a
+    reminder delivered while this runs is not put back into the index.
+
+    Returns:
+        Number of reminders backfilled
+    """
+    # Same test as the poller's FilterExpression (sent=False)
+    unsent = '#sent = :unsent'
+
+    def backfill(item: dict) -> bool:
+        reminder_id = item['reminder_id']['S']
+        try:
+            dynamodb.update_item(
+                TableName=table_name,
+                Key={'reminder_id': {'S': reminder_id}},
+                UpdateExpression='SET #shard = :shard, #pending_time = #reminder_time',
+                ConditionExpression=f'attribute_exists(#reminder_time) AND {unsent}',
+                ExpressionAttributeNames={
+                    '#shard': 'pending_shard',
+                    '#pending_time': 'pending_reminder_time',
+                    '#reminder_time': 'reminder_time',
+                    '#sent': 'sent'
+                },
+                ExpressionAttributeValues={
+                    ':shard': {'N': str(DynamoDBClient.pending_shard(reminder_id))},
+                    ':unsent': {'BOOL': False}
+                }
+            )
+            return True
+        except ClientError as e:
+            if e.response['Error']['Code'] == 'ConditionalCheckFailedException':
+                return False
+            raise
+
+    backfilled = 0
+    pages = dynamodb.get_paginator('scan').paginate(
+        TableName=table_name,
+        ProjectionExpression='reminder_id',
+        FilterExpression=f'attribute_not_exists(#shard) AND {unsent}',
+        ExpressionAttributeNames={'#shard': 'pending_shard', '#sent': 'sent'},
+        ExpressionAttributeValues={':unsent': {'BOOL': False}}
+    )
+    with ThreadPoolExecutor(max_workers=BACKFILL_WORKERS) as executor:
+        for page in pages:
+            backfilled += sum(executor.map(backfill, page.get('Items', [])))
+
+    report(f"✓ Backfilled pending-index keys on {backfilled} reminders in {table_name}")
+    return backfilled
+
+
+def create_tables():
+    """Create all DynamoDB tables for LetterOn."""
+
+    # Initialize DynamoDB client
+    aws_config = settings.get_aws_credentials()
+
+    # Add endpoint URL for local development
+    if settings.dynamodb_endpoint:
+        aws_config['endpoint_url'] = settings.dynamodb_endpoint
+        print(f"Using DynamoDB endpoint: {settings.dynamodb_endpoint}")
+
+    dynamodb = boto3.client('dynamodb', **aws_config)
+
+    print("Creating DynamoDB tables...")
+    print(f"Region: {settings.aws_region}")
+
+    # DynamoDB creates tables in parallel, so issue all requests (and waits)
+    # at once; total time is that of the slowest table. Clients are thread-safe.
+    definitions = table_definitions()
+    with ThreadPoolExecutor(max_workers=len(definitions)) as executor:
+        results = list(executor.map(lambda d: create_table(dynamodb, d), definitions))
+    tables_created = [table_name for table_name in results if table_name]
 
     # Wait for tables to become active
     if tables_created:
         print("\n⏳ Waiting for tables to become active...")
-        waiter = dynamodb.get_waiter('table_exists')
+        with ThreadPoolExecutor(max_workers=len(tables_created)) as executor:
+            list(executor.map(lambda t: wait_for_table(dynamodb, t), tables_created))
 
-        for table_name in tables_created:
-            try:
-                waiter.wait(
+        # Expired lock and cache items are removed by DynamoDB TTL
+        for table_name in (settings.dynamodb_locks_table, settings.dynamodb_llm_cache_table):
+            if table_name in tables_created:
+                dynamodb.update_time_to_live(
                     TableName=table_name,
-                    WaiterConfig={'Delay': 2, 'MaxAttempts': 30}
+                    TimeToLiveSpecification={'Enabled': True, 'AttributeName': 'expires_at'}
                 )
-                print(f"✓ {table_name} is now active")
-            except Exception as e:
-                print(f"⚠ Error waiting for {table_name}: {e}")
+
+    # Bring a Reminders table that predates the pending-index up to date
+    reminders_definition = next(
+        d for d in definitions if d['TableName'] == settings.dynamodb_reminders_table
+    )
+    if settings.dynamodb_reminders_table not in tables_created:
+        upgrade_reminders_table(dynamodb, reminders_definition)
+        backfill_pending_reminders(dynamodb, settings.dynamodb_reminders_table)
 
     print("\n" + "="*60)
     print("✅ DynamoDB table setup complete!")
@@ -211,6 +389,8 @@ def create_tables():
     print(f"  • {settings.dynamodb_letters_table} (Letters)")
     print(f"  • {settings.dynamodb_reminders_table} (Reminders)")
     print(f"  • {settings.dynamodb_conversations_table} (Conversations)")
+    print(f"  • {settings.dynamodb_locks_table} (Locks)")
+    print(f"  • {settings.dynamodb_llm_cache_table} (LLM Cache)")
 
     print("\nNext steps:")
     print("  1. Verify tables in AWS Console: https://console.aws.amazon.com/dynamodb")
@@ -1,21 +1,33 @@
 #!/usr/bin/env python3
 """Quick script to test login and debug 401 errors"""
 
-import requests
+import argparse
 import json
-import sys
+import time
 
-# Get credentials from command line
-if len(sys.argv) < 3:
-    print("Usage: python test_login.py <email> <password>")
-    sys.exit(1)
+import requests
+from requests.adapters import HTTPAdapter
 
-email = sys.argv[1]
-password = sys.argv[2]
+# Get credentials from command line
+parser = argparse.ArgumentParser(description="Test login against the local API")
+parser.add_argument("email")
+parser.add_argument("password")
+parser.add_argument("--repeat", type=int, default=1,
+                    help="Log in N times over one keep-alive session (timings shown)")
+args = parser.parse_args()
+if args.repeat < 1:
+    parser.error("--repeat must be at least 1")
+
+email = args.email
+password = args.password
 
 print(f"Testing login for: {email}")
 print("=" * 50)
 
+# One pooled session: repeated requests reuse the same TCP connection
+session = requests.Session()
+session.mount("http://", HTTPAdapter(pool_connections=10, pool_maxsize=10))
+
 # Test login
 url = "http://localhost:8000/auth/login"
 payload = {
@@ -23,7 +35,12 @@ payload = {
     "password": password
 }
 
-response = requests.post(url, json=payload)
+for attempt in range(1, args.repeat + 1):
+    start = time.perf_counter()
+    response = session.post(url, json=payload, timeout=5)
+    elapsed_ms = (time.perf_counter() - start) * 1000
+    if args.repeat > 1:
+        print(f"Request {attempt}: {response.status_code} in {elapsed_ms:.1f} ms")
 
 print(f"Status Code: {response.status_code}")
 print(f"Response: {json.dumps(response.json(), indent=2)}")
@@ -0,0 +1,55 @@
+"""
+LetterOn Server - Shared Test Fixtures
+Purpose: Fixtures applied across the test suite
+Testing: Loaded automatically by pytest
+AWS Deployment: Not deployed (tests only)
+
+This module provides:
+- Fake AWS credentials, set once per session (never reach real AWS)
+- Minimum-cost bcrypt hashing for tests (production cost is deliberately slow)
+"""
+
+import pytest
+from passlib.context import CryptContext
+
+from app.services import auth
+
+# bcrypt minimum cost: 2^4 rounds instead of the production 2^12
+TEST_BCRYPT_ROUNDS = 4
+
+# Resolved by boto3's environment provider before it walks the rest of the
+# credential chain (config files, container/instance metadata)
+AWS_TEST_ENV = {
+    "AWS_ACCESS_KEY_ID": "testing",
+    "AWS_SECRET_ACCESS_KEY": "testing",
+    "AWS_SECURITY_TOKEN": "testing",
+    "AWS_SESSION_TOKEN": "testing",
+    "AWS_DEFAULT_REGION": "us-east-1",
+}
+
+
+@pytest.fixture(scope="session", autouse=True)
+def aws_test_credentials():
+    """Point boto3 at fake credentials for the whole test session."""
+    with pytest.MonkeyPatch.context() as mp:
+        for name, value in AWS_TEST_ENV.items():
+            mp.setenv(name, value)
+        yield
+
+
+@pytest.fixture(autouse=True)
+def fast_password_hashing(request, monkeypatch):
+    """
+    Hash passwords at the minimum bcrypt cost.
+
+    Tests marked `production_bcrypt` keep the real context so the production
+    cost stays covered.
+    """
+    if request.node.get_closest_marker("production_bcrypt"):
+        return
+
+    monkeypatch.setattr(
+        auth,
+        "pwd_context",
+        CryptContext(schemes=["bcrypt"], deprecated="auto", bcrypt__rounds=TEST_BCRYPT_ROUNDS)
+    )
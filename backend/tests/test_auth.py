@@ -7,13 +7,65 @@ AWS Deployment: Not deployed (tests only)
 
 import pytest
 from fastapi.testclient import TestClient
+from pydantic import ValidationError
 from unittest.mock import patch, MagicMock
 
 from app.main import app
+from app.models import UserRegisterRequest
 from app.services.auth import hash_password, verify_password, create_access_token, verify_token
 
 
-client = TestClient(app)
+@pytest.fixture(scope="module")
+def client():
+    """
+    Shared test client.
+
+    Not entered as a context manager, so the app lifespan (scheduler
+    startup/shutdown) never runs during these tests.
+    """
+    return TestClient(app)
+
+# One hash per plaintext: tests only need a valid hash, not a fresh salt
+_HASH_CACHE = {}
+
+
+def cached_hash(password: str) -> str:
+    """Return a (reused) hash of the password."""
+    if password not in _HASH_CACHE:
+        _HASH_CACHE[password] = hash_password(password)
+    return _HASH_CACHE[password]
+
+
+# Access tokens keyed by (user_id, email); claims never vary between tests
+_TOKEN_CACHE = {}
+
+
+def cached_token(user_id: str, email: str) -> str:
+    """Return a (reused) access token for the user."""
+    key = (user_id, email)
+    if key not in _TOKEN_CACHE:
+        _TOKEN_CACHE[key] = create_access_token({"user_id": user_id, "email": email})
+    return _TOKEN_CACHE[key]
+
+
+def fake_hash(password: str) -> str:
+    """Hash format understood by the fake_password_hashing fixture."""
+    return f"$fake${password}"
+
+
+@pytest.fixture
+def fake_password_hashing(monkeypatch):
+    """
+    Replace bcrypt in the auth routes with a plaintext comparison.
+
+    Endpoint tests only need hashing to round-trip; bcrypt itself is
+    covered by the password hashing tests.
+    """
+    monkeypatch.setattr('app.api.auth.hash_password', fake_hash)
+    monkeypatch.setattr(
+        'app.api.auth.verify_password',
+        lambda password, password_hash: password_hash == fake_hash(password)
+    )
 
 
 # ===== PASSWORD HASHING TESTS =====
@@ -28,10 +80,20 @@ def test_hash_password():
     assert hashed.startswith("$2b$")  # bcrypt hash prefix
 
 
+@pytest.mark.production_bcrypt
+def test_hash_password_production_cost():
+    """Test production hashes use the default bcrypt cost (tests run at a lower one)."""
+    password = "testpassword123"
+    hashed = hash_password(password)
+
+    assert hashed.startswith("$2b$12$")
+    assert verify_password(password, hashed) is True
+
+
 def test_verify_password_correct():
     """Test password verification with correct password."""
     password = "testpassword123"
-    hashed = hash_password(password)
+    hashed = cached_hash(password)
 
     assert verify_password(password, hashed) is True
 
@@ -39,7 +101,7 @@ def test_verify_password_correct():
 def test_verify_password_incorrect():
     """Test password verification with incorrect password."""
     password = "testpassword123"
-    hashed = hash_password(password)
+    hashed = cached_hash(password)
 
     assert verify_password("wrongpassword", hashed) is False
 
@@ -78,7 +140,7 @@ def test_verify_token_invalid():
 # ===== REGISTRATION ENDPOINT TESTS =====
 
 @patch('app.api.auth.dynamodb_client')
-def test_register_success(mock_db):
+def test_register_success(mock_db, fake_password_hashing, client):
     """Test successful user registration."""
     # Mock database responses
     mock_db.get_user_by_email.return_value = None  # User doesn't exist
@@ -108,7 +170,7 @@ def test_register_success(mock_db):
 
 
 @patch('app.api.auth.dynamodb_client')
-def test_register_duplicate_email(mock_db):
+def test_register_duplicate_email(mock_db, client):
     """Test registration with existing email."""
     # Mock database to return existing user
     mock_db.get_user_by_email.return_value = {
@@ -129,42 +191,33 @@ def test_register_duplicate_email(mock_db):
     assert "already exists" in response.json()["detail"]
 
 
-def test_register_invalid_email():
-    """Test registration with invalid email."""
-    response = client.post(
-        "/auth/register",
-        json={
-            "name": "Test User",
-            "email": "invalid-email",
-            "password": "password123"
-        }
-    )
-
-    assert response.status_code == 422  # Validation error
-
+@pytest.mark.parametrize("field,overrides", [
+    ("email", {"email": "invalid-email"}),
+    ("password", {"password": "short"}),
+])
+def test_register_request_validation(field, overrides):
+    """Test registration payloads rejected by the request model (422 at /auth/register)."""
+    payload = {
+        "name": "Test User",
+        "email": "test@example.com",
+        "password": "password123",
+        **overrides
+    }
 
-def test_register_short_password():
-    """Test registration with too short password."""
-    response = client.post(
-        "/auth/register",
-        json={
-            "name": "Test User",
-            "email": "test@example.com",
-            "password": "short"
-        }
-    )
+    with pytest.raises(ValidationError) as exc_info:
+        UserRegisterRequest(**payload)
 
-    assert response.status_code == 422  # Validation error
+    assert [error["loc"] for error in exc_info.value.errors()] == [(field,)]
 
 
 # ===== LOGIN ENDPOINT TESTS =====
 
 @patch('app.api.auth.dynamodb_client')
-def test_login_success(mock_db):
+def test_login_success(mock_db, fake_password_hashing, client):
     """Test successful login."""
     # Hash a test password
     test_password = "testpassword123"
-    password_hash = hash_password(test_password)
+    password_hash = fake_hash(test_password)
 
     # Mock database response
     mock_db.get_user_by_email.return_value = {
@@ -191,9 +244,9 @@ def test_login_success(mock_db):
 
 
 @patch('app.api.auth.dynamodb_client')
-def test_login_wrong_password(mock_db):
+def test_login_wrong_password(mock_db, fake_password_hashing, client):
     """Test login with incorrect password."""
-    password_hash = hash_password("correctpassword")
+    password_hash = fake_hash("correctpassword")
 
     mock_db.get_user_by_email.return_value = {
         "user_id": "123",
@@ -214,7 +267,7 @@ def test_login_wrong_password(mock_db):
 
 
 @patch('app.api.auth.dynamodb_client')
-def test_login_user_not_found(mock_db):
+def test_login_user_not_found(mock_db, client):
     """Test login with non-existent user."""
     mock_db.get_user_by_email.return_value = None
 
@@ -233,10 +286,10 @@ def test_login_user_not_found(mock_db):
 # ===== LOGOUT ENDPOINT TESTS =====
 
 @patch('app.dependencies.dynamodb_client')
-def test_logout_success(mock_db):
+def test_logout_success(mock_db, client):
     """Test successful logout."""
     # Create a valid token
-    token = create_access_token({"user_id": "123", "email": "test@example.com"})
+    token = cached_token("123", "test@example.com")
 
     # Mock user exists
     mock_db.get_user_by_id.return_value = {
@@ -253,30 +306,26 @@ def test_logout_success(mock_db):
     assert "Logged out" in response.json()["message"]
 
 
-def test_logout_without_token():
-    """Test logout without authentication token."""
-    response = client.post("/auth/logout")
-
-    assert response.status_code == 403  # Forbidden (no auth header)
-
-
-def test_logout_invalid_token():
-    """Test logout with invalid token."""
-    response = client.post(
-        "/auth/logout",
-        headers={"Authorization": "Bearer invalid.token.here"}
-    )
+@pytest.mark.parametrize("method,route,headers,expected", [
+    ("post", "/auth/logout", {}, 403),  # Forbidden (no auth header)
+    ("post", "/auth/logout", {"Authorization": "Bearer invalid.token.here"}, 401),
+    ("get", "/auth/me", {}, 403),
+    ("get", "/auth/me", {"Authorization": "Bearer invalid.token.here"}, 401),
+])
+def test_protected_route_rejects_bad_auth(client, method, route, headers, expected):
+    """Test protected routes without a token or with an invalid one."""
+    response = getattr(client, method)(route, headers=headers)
 
-    assert response.status_code == 401  # Unauthorized
+    assert response.status_code == expected
 
 
 # ===== GET CURRENT USER TESTS =====
 
 @patch('app.dependencies.dynamodb_client')
-def test_get_current_user_success(mock_db):
+def test_get_current_user_success(mock_db, client):
     """Test getting current user info."""
     # Create a valid token
-    token = create_access_token({"user_id": "123", "email": "test@example.com"})
+    token = cached_token("123", "test@example.com")
 
     # Mock database response
     mock_db.get_user_by_id.return_value = {
@@ -298,17 +347,10 @@ def test_get_current_user_success(mock_db):
     assert data["name"] == "Test User"
 
 
-def test_get_current_user_no_token():
-    """Test getting current user without token."""
-    response = client.get("/auth/me")
-
-    assert response.status_code == 403
-
-
 @patch('app.dependencies.dynamodb_client')
-def test_get_current_user_not_found(mock_db):
+def test_get_current_user_not_found(mock_db, client):
     """Test getting current user when user doesn't exist in database."""
-    token = create_access_token({"user_id": "999", "email": "test@example.com"})
+    token = cached_token("999", "test@example.com")
 
     mock_db.get_user_by_id.return_value = None
 
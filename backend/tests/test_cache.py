@@ -0,0 +1,44 @@
+"""
+LetterOn Server - TTL Cache Tests
+Purpose: Unit tests for the in-memory TTL cache
+Testing: pytest tests/test_cache.py
+AWS Deployment: Not deployed (tests only)
+
+These tests validate:
+- Expiry of cached entries
+- LRU eviction when full
+"""
+
+from app.utils import cache as cache_module
+from app.utils.cache import TTLCache
+
+
+def test_entries_expire(monkeypatch):
+    """Test entries disappear after their TTL."""
+    now = [1000.0]
+    monkeypatch.setattr(cache_module.time, "monotonic", lambda: now[0])
+
+    cache = TTLCache(maxsize=10, ttl=60)
+    cache.set("a", 1)
+    cache.set("b", 2, ttl=5)
+
+    now[0] += 10
+    assert cache.get("a") == 1
+    assert cache.get("b") is None
+
+    now[0] += 60
+    assert cache.get("a", "missing") == "missing"
+    assert len(cache) == 0
+
+
+def test_lru_eviction():
+    """Test the least recently used entry is evicted when full."""
+    cache = TTLCache(maxsize=2, ttl=60)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    cache.get("a")
+    cache.set("c", 3)
+
+    assert cache.get("a") == 1
+    assert cache.get("b") is None
+    assert cache.get("c") == 3
@@ -9,8 +9,11 @@ These tests validate:
 - Letter CRUD operations
 - Reminder CRUD operations
 - Conversation message operations
+- Lease lock operations
 """
 
+import time
+
 import pytest
 from moto import mock_dynamodb
 import boto3
@@ -18,17 +21,34 @@ from decimal import Decimal
 
 from app.services.dynamo import DynamoDBClient
 from app.settings import settings
+from app.utils.helpers import generate_uuid
 
+# Suffix of the key-only (no GSI) table copies
+MINIMAL_TABLE_SUFFIX = "-minimal"
 
-@pytest.fixture
+TABLE_SETTINGS = (
+    "dynamodb_users_table",
+    "dynamodb_letters_table",
+    "dynamodb_reminders_table",
+    "dynamodb_conversations_table",
+    "dynamodb_locks_table",
+)
+
+
+@pytest.fixture(scope="module")
 def dynamodb_tables():
     """
     Create mock DynamoDB tables for testing.
     Uses moto to mock AWS DynamoDB service.
+
+    Tables are created once per module and emptied before each test
+    (see clean_tables); module scope keeps the mock from leaking into
+    other test files.
     """
     with mock_dynamodb():
-        # Create DynamoDB resource
-        dynamodb = boto3.resource('dynamodb', region_name='us-east-1')
+        # One session/resource for the module; every db_client reuses it
+        session = boto3.Session(region_name='us-east-1')
+        dynamodb = session.resource('dynamodb')
 
         # Create Users table
         users_table = dynamodb.create_table(
@@ -98,7 +118,9 @@ def dynamodb_tables():
             ],
             AttributeDefinitions=[
                 {'AttributeName': 'reminder_id', 'AttributeType': 'S'},
-                {'AttributeName': 'user_id', 'AttributeType': 'S'}
+                {'AttributeName': 'user_id', 'AttributeType': 'S'},
+                {'AttributeName': 'pending_shard', 'AttributeType': 'N'},
+                {'AttributeName': 'pending_reminder_time', 'AttributeType': 'N'}
             ],
             GlobalSecondaryIndexes=[
                 {
@@ -111,6 +133,18 @@ def dynamodb_tables():
                         'ReadCapacityUnits': 5,
                         'WriteCapacityUnits': 5
                     }
+                },
+                {
+                    'IndexName': 'pending-index',
+                    'KeySchema': [
+                        {'AttributeName': 'pending_shard', 'KeyType': 'HASH'},
+                        {'AttributeName': 'pending_reminder_time', 'KeyType': 'RANGE'}
+                    ],
+                    'Projection': {'ProjectionType': 'ALL'},
+                    'ProvisionedThroughput': {
+                        'ReadCapacityUnits': 5,
+                        'WriteCapacityUnits': 5
+                    }
                 }
             ],
             ProvisionedThroughput={
@@ -150,13 +184,98 @@ def dynamodb_tables():
             }
         )
 
+        # Create Locks table
+        dynamodb.create_table(
+            TableName=settings.dynamodb_locks_table,
+            KeySchema=[
+                {'AttributeName': 'lock_id', 'KeyType': 'HASH'}
+            ],
+            AttributeDefinitions=[
+                {'AttributeName': 'lock_id', 'AttributeType': 'S'}
+            ],
+            ProvisionedThroughput={
+                'ReadCapacityUnits': 5,
+                'WriteCapacityUnits': 5
+            }
+        )
+
+        # Key-only copies of every table for tests that never query an index,
+        # so their writes skip moto's GSI bookkeeping
+        for table in list(dynamodb.tables.all()):
+            key_names = {key['AttributeName'] for key in table.key_schema}
+            dynamodb.create_table(
+                TableName=table.name + MINIMAL_TABLE_SUFFIX,
+                KeySchema=table.key_schema,
+                AttributeDefinitions=[
+                    attr for attr in table.attribute_definitions
+                    if attr['AttributeName'] in key_names
+                ],
+                ProvisionedThroughput={
+                    'ReadCapacityUnits': 5,
+                    'WriteCapacityUnits': 5
+                }
+            )
+
         yield dynamodb
 
 
+@pytest.fixture(autouse=True)
+def clean_tables(dynamodb_tables):
+    """Delete every item from every mock table before each test."""
+    for table in dynamodb_tables.tables.all():
+        key_names = [key['AttributeName'] for key in table.key_schema]
+        scan_kwargs = {
+            'ProjectionExpression': ', '.join(f'#k{i}' for i in range(len(key_names))),
+            'ExpressionAttributeNames': {f'#k{i}': name for i, name in enumerate(key_names)}
+        }
+        with table.batch_writer() as batch:
+            while True:
+                response = table.scan(**scan_kwargs)
+                for item in response.get('Items', []):
+                    batch.delete_item(Key={name: item[name] for name in key_names})
+                if 'LastEvaluatedKey' not in response:
+                    break
+                scan_kwargs['ExclusiveStartKey'] = response['LastEvaluatedKey']
+
+
 @pytest.fixture
-def db_client(dynamodb_tables):
-    """Create DynamoDB client instance for testing."""
-    return DynamoDBClient()
+def db_client(dynamodb_tables, request, monkeypatch):
+    """
+    Create DynamoDB client instance for testing.
+
+    The client points at the key-only tables unless the test is marked
+    `dynamodb_indexes`, in which case it gets the full schema with GSIs.
+    """
+    if not request.node.get_closest_marker("dynamodb_indexes"):
+        for setting in TABLE_SETTINGS:
+            monkeypatch.setattr(settings, setting, getattr(settings, setting) + MINIMAL_TABLE_SUFFIX)
+
+    return DynamoDBClient(dynamodb=dynamodb_tables)
+
+
+def batch_put_items(table, items):
+    """Seed a table with batch_writer (BatchWriteItem, 25 items per request)."""
+    with table.batch_writer() as batch:
+        for item in items:
+            batch.put_item(Item=item)
+
+
+@pytest.fixture
+def seed_user_letter(db_client):
+    """Create the user and letter most letter/reminder/conversation tests start from."""
+    user = db_client.create_user({
+        "email": "test@example.com",
+        "password_hash": "hash",
+        "name": "Test User"
+    })
+
+    letter = db_client.create_letter({
+        "user_id": user["user_id"],
+        "subject": "Test Letter",
+        "content": "Test content"
+    })
+
+    return user, letter
 
 
 # ===== USER TESTS =====
@@ -195,6 +314,7 @@ def test_get_user_by_id(db_client):
     assert user["email"] == "test@example.com"
 
 
+@pytest.mark.dynamodb_indexes
 def test_get_user_by_email(db_client):
     """Test retrieving a user by email."""
     # Create user
@@ -262,20 +382,9 @@ def test_create_letter(db_client):
     assert letter["user_id"] == user["user_id"]
 
 
-def test_get_letter(db_client):
+def test_get_letter(db_client, seed_user_letter):
     """Test retrieving a letter."""
-    # Create user and letter
-    user = db_client.create_user({
-        "email": "test@example.com",
-        "password_hash": "hash",
-        "name": "Test User"
-    })
-
-    created_letter = db_client.create_letter({
-        "user_id": user["user_id"],
-        "subject": "Test Letter",
-        "content": "Test content"
-    })
+    user, created_letter = seed_user_letter
 
     # Get letter
     letter = db_client.get_letter(created_letter["letter_id"])
@@ -285,6 +394,7 @@ def test_get_letter(db_client):
     assert letter["subject"] == "Test Letter"
 
 
+@pytest.mark.dynamodb_indexes
 def test_get_letters_by_user(db_client):
     """Test retrieving letters for a user."""
     # Create user
@@ -295,12 +405,16 @@ def test_get_letters_by_user(db_client):
     })
 
     # Create multiple letters
-    for i in range(3):
-        db_client.create_letter({
+    batch_put_items(db_client.letters_table, [
+        {
+            "letter_id": generate_uuid(),
             "user_id": user["user_id"],
             "subject": f"Letter {i}",
-            "content": f"Content {i}"
-        })
+            "content": f"Content {i}",
+            "record_created_at": 1705000000 + i
+        }
+        for i in range(3)
+    ])
 
     # Get letters
     result = db_client.get_letters_by_user(user["user_id"], limit=10)
@@ -308,21 +422,45 @@ def test_get_letters_by_user(db_client):
     assert len(result["items"]) == 3
 
 
-def test_update_letter(db_client):
-    """Test updating a letter."""
-    # Create user and letter
+@pytest.mark.dynamodb_indexes
+def test_get_letters_by_user_projection(db_client):
+    """Test retrieving only selected letter attributes."""
+    # Create user and letters
     user = db_client.create_user({
         "email": "test@example.com",
         "password_hash": "hash",
         "name": "Test User"
     })
 
-    letter = db_client.create_letter({
+    db_client.create_letter({
+        "user_id": user["user_id"],
+        "subject": "Letter 1",
+        "content": "Content 1",
+        "ocr_text": "OCR 1"
+    })
+    db_client.create_letter({
         "user_id": user["user_id"],
-        "subject": "Original Subject",
-        "content": "Original content"
+        "subject": "Letter 2",
+        "content": "Content 2",
+        "flagged": True
     })
 
+    # Projection works together with filters
+    result = db_client.get_letters_by_user(
+        user["user_id"],
+        filters={"flagged": False},
+        projection=["letter_id", "subject", "read"]
+    )
+
+    assert len(result["items"]) == 1
+    assert set(result["items"][0].keys()) == {"letter_id", "subject", "read"}
+    assert result["items"][0]["subject"] == "Letter 1"
+
+
+def test_update_letter(db_client, seed_user_letter):
+    """Test updating a letter."""
+    user, letter = seed_user_letter
+
     # Update letter
     updated_letter = db_client.update_letter(
         letter["letter_id"],
@@ -333,8 +471,8 @@ def test_update_letter(db_client):
     assert updated_letter["flagged"] is True
 
 
-def test_delete_letter_soft(db_client):
-    """Test soft deleting a letter."""
+def test_set_letter_field(db_client):
+    """Test conditional single-field letter update."""
     # Create user and letter
     user = db_client.create_user({
         "email": "test@example.com",
@@ -348,6 +486,29 @@ def test_delete_letter_soft(db_client):
         "content": "Test content"
     })
 
+    # Owner can set the field
+    updated_letter = db_client.set_letter_field(
+        letter["letter_id"], "archived", True, user_id=user["user_id"]
+    )
+    assert updated_letter["archived"] is True
+
+    # Stale expected value fails the condition
+    assert db_client.set_letter_field(
+        letter["letter_id"], "archived", False, if_unchanged_from=False
+    ) is None
+
+    # Other users and missing letters fail the condition
+    assert db_client.set_letter_field(
+        letter["letter_id"], "archived", False, user_id="someone-else"
+    ) is None
+    assert db_client.set_letter_field("missing-letter", "archived", True) is None
+    assert db_client.get_letter("missing-letter") is None
+
+
+def test_delete_letter_soft(db_client, seed_user_letter):
+    """Test soft deleting a letter."""
+    user, letter = seed_user_letter
+
     # Soft delete
     success = db_client.delete_letter(letter["letter_id"], soft_delete=True)
 
@@ -360,20 +521,9 @@ def test_delete_letter_soft(db_client):
 
 # ===== REMINDER TESTS =====
 
-def test_create_reminder(db_client):
+def test_create_reminder(db_client, seed_user_letter):
     """Test creating a reminder."""
-    # Create user and letter
-    user = db_client.create_user({
-        "email": "test@example.com",
-        "password_hash": "hash",
-        "name": "Test User"
-    })
-
-    letter = db_client.create_letter({
-        "user_id": user["user_id"],
-        "subject": "Test Letter",
-        "content": "Test content"
-    })
+    user, letter = seed_user_letter
 
     # Create reminder
     reminder_data = {
@@ -390,29 +540,22 @@ def test_create_reminder(db_client):
     assert "reminder_id" in reminder
 
 
-def test_get_reminders_by_user(db_client):
+@pytest.mark.dynamodb_indexes
+def test_get_reminders_by_user(db_client, seed_user_letter):
     """Test retrieving reminders for a user."""
-    # Create user and letter
-    user = db_client.create_user({
-        "email": "test@example.com",
-        "password_hash": "hash",
-        "name": "Test User"
-    })
-
-    letter = db_client.create_letter({
-        "user_id": user["user_id"],
-        "subject": "Test Letter",
-        "content": "Test content"
-    })
+    user, letter = seed_user_letter
 
     # Create reminders
-    for i in range(2):
-        db_client.create_reminder({
+    batch_put_items(db_client.reminders_table, [
+        {
+            "reminder_id": generate_uuid(),
             "user_id": user["user_id"],
             "letter_id": letter["letter_id"],
             "reminder_time": 1705000000 + i,
             "message": f"Reminder {i}"
-        })
+        }
+        for i in range(2)
+    ])
 
     # Get reminders
     reminders = db_client.get_reminders_by_user(user["user_id"])
@@ -420,21 +563,11 @@ def test_get_reminders_by_user(db_client):
     assert len(reminders) == 2
 
 
-def test_update_reminder(db_client):
+def test_update_reminder(db_client, seed_user_letter):
     """Test updating a reminder."""
-    # Create user, letter, and reminder
-    user = db_client.create_user({
-        "email": "test@example.com",
-        "password_hash": "hash",
-        "name": "Test User"
-    })
-
-    letter = db_client.create_letter({
-        "user_id": user["user_id"],
-        "subject": "Test Letter",
-        "content": "Test content"
-    })
+    user, letter = seed_user_letter
 
+    # Create reminder
     reminder = db_client.create_reminder({
         "user_id": user["user_id"],
         "letter_id": letter["letter_id"],
@@ -452,9 +585,48 @@ def test_update_reminder(db_client):
     assert updated_reminder["sent"] is True
 
 
-def test_delete_reminder(db_client):
-    """Test deleting a reminder."""
-    # Create user, letter, and reminder
+@pytest.mark.dynamodb_indexes
+def test_update_reminder_retime_indexes_legacy_reminder(db_client):
+    """Test re-timing a reminder written before the pending-index adds both index keys."""
+    db_client.reminders_table.put_item(Item={
+        "reminder_id": "legacy-reminder",
+        "user_id": "user-1",
+        "letter_id": "letter-1",
+        "reminder_time": 1705000000,
+        "sent": False
+    })
+    assert list(db_client.iter_pending_reminders(1800000000)) == []
+
+    updated = db_client.update_reminder("legacy-reminder", {"reminder_time": 1706000000})
+
+    assert updated["pending_shard"] == db_client.pending_shard("legacy-reminder")
+    assert updated["pending_reminder_time"] == 1706000000
+    pending = list(db_client.iter_pending_reminders(1800000000))
+    assert [r["reminder_id"] for r in pending] == ["legacy-reminder"]
+
+
+def test_update_reminder_retime_sent_reminder_stays_unindexed(db_client, seed_user_letter):
+    """Test re-timing an already sent reminder does not put it back in the index."""
+    user, letter = seed_user_letter
+
+    reminder = db_client.create_reminder({
+        "user_id": user["user_id"],
+        "letter_id": letter["letter_id"],
+        "reminder_time": 1705000000,
+        "sent": True
+    })
+
+    updated = db_client.update_reminder(reminder["reminder_id"], {"reminder_time": 1706000000})
+
+    assert updated["reminder_time"] == 1706000000
+    assert "pending_shard" not in updated
+    assert "pending_reminder_time" not in updated
+
+
+@pytest.mark.dynamodb_indexes
+def test_iter_pending_reminders_skips_sent_and_future(db_client):
+    """Test pending reminders come from the sparse pending index."""
+    # Create user and letter
     user = db_client.create_user({
         "email": "test@example.com",
         "password_hash": "hash",
@@ -467,23 +639,62 @@ def test_delete_reminder(db_client):
         "content": "Test content"
     })
 
-    reminder = db_client.create_reminder({
-        "user_id": user["user_id"],
-        "letter_id": letter["letter_id"],
-        "reminder_time": 1705000000,
-        "message": "Test reminder"
+    # Create due, sent and future reminders
+    reminders = [
+        db_client.create_reminder({
+            "user_id": user["user_id"],
+            "letter_id": letter["letter_id"],
+            "reminder_time": reminder_time,
+            "message": f"Reminder {i}"
+        })
+        for i, reminder_time in enumerate([1705000000, 1705000001, 1705000002, 1800000000])
+    ]
+
+    sent_reminder = db_client.update_reminder(reminders[1]["reminder_id"], {"sent": True})
+    assert "pending_reminder_time" not in sent_reminder
+
+    pending = list(db_client.iter_pending_reminders(1705000100))
+
+    assert sorted(r["reminder_id"] for r in pending) == sorted(
+        [reminders[0]["reminder_id"], reminders[2]["reminder_id"]]
+    )
+
+
+@pytest.mark.dynamodb_indexes
+def test_iter_pending_reminders(db_client):
+    """Test streaming pending reminders across shards and pages."""
+    reminders = [
+        db_client.create_reminder({
+            "user_id": "user-1",
+            "letter_id": "letter-1",
+            "reminder_time": 1705000000 + i
+        })
+        for i in range(25)
+    ]
+    db_client.create_reminder({
+        "user_id": "user-1",
+        "letter_id": "letter-1",
+        "reminder_time": 1800000000
     })
 
-    # Delete reminder
-    success = db_client.delete_reminder(reminder["reminder_id"])
+    streamed = list(db_client.iter_pending_reminders(1705000100, page_size=2))
 
-    assert success is True
+    assert sorted(r["reminder_id"] for r in streamed) == sorted(r["reminder_id"] for r in reminders)
 
+    # Stopping early does not hang the shard workers
+    iterator = db_client.iter_pending_reminders(1705000100, page_size=1)
+    next(iterator)
+    iterator.close()
 
-# ===== CONVERSATION TESTS =====
+    # A total limit bounds the stream across all shards
+    limited = list(db_client.iter_pending_reminders(1705000100, page_size=2, limit=7))
+    assert len(limited) == 7
+    assert len({r["reminder_id"] for r in limited}) == 7
 
-def test_create_conversation_message(db_client):
-    """Test creating a conversation message."""
+
+@pytest.mark.dynamodb_indexes
+def test_mark_reminders_sent(db_client):
+    """Test batch marking reminders as sent (more reminders than parallel writers)."""
     # Create user and letter
     user = db_client.create_user({
         "email": "test@example.com",
@@ -497,6 +708,91 @@ def test_create_conversation_message(db_client):
         "content": "Test content"
     })
 
+    for i in range(30):
+        db_client.create_reminder({
+            "user_id": user["user_id"],
+            "letter_id": letter["letter_id"],
+            "reminder_time": 1705000000 + i,
+            "message": f"Reminder {i}"
+        })
+
+    pending = list(db_client.iter_pending_reminders(1705000100))
+    assert len(pending) == 30
+
+    written = db_client.mark_reminders_sent(pending, 1705000200)
+
+    assert written == 30
+    assert list(db_client.iter_pending_reminders(1705000100)) == []
+
+    reminder = db_client.get_reminder(pending[0]["reminder_id"])
+    assert reminder["sent"] is True
+    assert reminder["sent_at"] == 1705000200
+    assert reminder["message"] == pending[0]["message"]
+    assert "pending_shard" not in reminder
+
+
+@pytest.mark.dynamodb_indexes
+def test_mark_reminders_sent_skips_changed_reminders(db_client, seed_user_letter):
+    """Test reminders deleted or re-timed after being read are not rewritten."""
+    user, letter = seed_user_letter
+    for i in range(3):
+        db_client.create_reminder({
+            "user_id": user["user_id"],
+            "letter_id": letter["letter_id"],
+            "reminder_time": 1705000000 + i,
+            "message": f"Reminder {i}"
+        })
+
+    pending = sorted(
+        db_client.iter_pending_reminders(1705000100), key=lambda r: r["reminder_time"]
+    )
+    deleted, retimed, unchanged = pending
+
+    # The user edits the reminders while they are being delivered
+    db_client.delete_reminder(deleted["reminder_id"])
+    db_client.update_reminder(retimed["reminder_id"], {
+        "reminder_time": 1800000000,
+        "message": "Moved"
+    })
+
+    written = db_client.mark_reminders_sent(pending, 1705000200)
+
+    assert written == 1
+    assert db_client.get_reminder(deleted["reminder_id"]) is None
+
+    reminder = db_client.get_reminder(retimed["reminder_id"])
+    assert reminder["sent"] is False
+    assert reminder["reminder_time"] == 1800000000
+    assert reminder["message"] == "Moved"
+    assert reminder["pending_reminder_time"] == 1800000000
+
+    assert db_client.get_reminder(unchanged["reminder_id"])["sent"] is True
+
+
+def test_delete_reminder(db_client, seed_user_letter):
+    """Test deleting a reminder."""
+    user, letter = seed_user_letter
+
+    # Create reminder
+    reminder = db_client.create_reminder({
+        "user_id": user["user_id"],
+        "letter_id": letter["letter_id"],
+        "reminder_time": 1705000000,
+        "message": "Test reminder"
+    })
+
+    # Delete reminder
+    success = db_client.delete_reminder(reminder["reminder_id"])
+
+    assert success is True
+
+
+# ===== CONVERSATION TESTS =====
+
+def test_create_conversation_message(db_client, seed_user_letter):
+    """Test creating a conversation message."""
+    user, letter = seed_user_letter
+
     # Create message
     message_data = {
         "letter_id": letter["letter_id"],
@@ -512,20 +808,10 @@ def test_create_conversation_message(db_client):
     assert "conversation_id" in message
 
 
-def test_get_conversation_history(db_client):
+@pytest.mark.dynamodb_indexes
+def test_get_conversation_history(db_client, seed_user_letter):
     """Test retrieving conversation history."""
-    # Create user and letter
-    user = db_client.create_user({
-        "email": "test@example.com",
-        "password_hash": "hash",
-        "name": "Test User"
-    })
-
-    letter = db_client.create_letter({
-        "user_id": user["user_id"],
-        "subject": "Test Letter",
-        "content": "Test content"
-    })
+    user, letter = seed_user_letter
 
     # Create messages
     db_client.create_conversation_message({
@@ -584,3 +870,48 @@ def test_dynamodb_to_python_conversion(db_client):
     assert isinstance(converted["list"][0], float)
     assert isinstance(converted["list"][1], int)
     assert isinstance(converted["dict"]["nested"], float)
+
+
+def test_conversion_round_trip_nested(db_client):
+    """Test conversion through lists of dicts and integral Decimals."""
+    data = {
+        "flag": True,
+        "missing": None,
+        "items": [{"price": 2.0, "qty": 3}, {"price": 0.1, "tags": ["a", 1.5]}]
+    }
+
+    stored = db_client.python_to_dynamodb(data)
+
+    assert stored["items"][0]["price"] == Decimal("2.0")
+    assert stored["items"][1]["price"] == Decimal("0.1")
+    assert stored["items"][1]["tags"] == ["a", Decimal("1.5")]
+    assert stored["flag"] is True
+
+    loaded = db_client.dynamodb_to_python(stored)
+
+    assert loaded == {
+        "flag": True,
+        "missing": None,
+        "items": [{"price": 2, "qty": 3}, {"price": 0.1, "tags": ["a", 1.5]}]
+    }
+    assert isinstance(loaded["items"][0]["price"], int)
+
+
+def test_acquire_and_release_lock(db_client, monkeypatch):
+    """Test the lease lock is exclusive until released or expired."""
+    assert db_client.acquire_lock("poller", "a", 90) is True
+    # Held by "a": renewable by "a", not acquirable by "b"
+    assert db_client.acquire_lock("poller", "a", 90) is True
+    assert db_client.acquire_lock("poller", "b", 90) is False
+
+    # Only the owner can release
+    assert db_client.release_lock("poller", "b") is False
+    assert db_client.release_lock("poller", "a") is True
+    assert db_client.acquire_lock("poller", "b", 90) is True
+
+    # Expired leases can be taken over
+    monkeypatch.setattr(
+        "app.services.dynamo.get_current_timestamp",
+        lambda: int(time.time()) + 120
+    )
+    assert db_client.acquire_lock("poller", "a", 90) is True
@@ -0,0 +1,123 @@
+"""
+LetterOn Server - Helper Utility Tests
+Purpose: Unit tests for common helper functions
+Testing: pytest tests/test_helpers.py
+AWS Deployment: Not deployed (tests only)
+
+These tests validate:
+- ID generation
+- Email validation
+- Filename sanitization
+- String truncation
+- Human-readable file sizes
+- Current timestamp
+- Nested dictionary lookup
+"""
+
+import re
+from collections import OrderedDict
+from datetime import datetime, timezone
+
+import pytest
+
+from app.utils.helpers import (
+    format_file_size,
+    generate_short_id,
+    generate_uuid,
+    get_current_timestamp,
+    is_valid_email,
+    safe_get,
+    sanitize_filename,
+    truncate_string,
+)
+
+
+def test_generate_uuid():
+    """Test UUIDs are 32 hex characters without hyphens."""
+    value = generate_uuid()
+    assert re.fullmatch(r'[0-9a-f]{32}', value)
+    assert generate_uuid() != value
+
+
+def test_generate_short_id():
+    """Test short IDs are 8 hex characters with an optional prefix."""
+    assert re.fullmatch(r'[0-9a-f]{8}', generate_short_id())
+    assert re.fullmatch(r'letter_[0-9a-f]{8}', generate_short_id("letter_"))
+
+
+@pytest.mark.parametrize("email, expected", [
+    ("user@example.com", True),
+    ("first.last+tag@sub.example.co", True),
+    ("user@example", False),
+    ("user example@example.com", False),
+    ("", False),
+])
+def test_is_valid_email(email, expected):
+    """Test email format validation."""
+    assert is_valid_email(email) is expected
+
+
+@pytest.mark.parametrize("filename, expected", [
+    ("scan.jpg", "scan.jpg"),
+    ("my letter (1).png", "my_letter_1_.png"),
+    ("a  b__c", "a_b_c"),
+    ("rechnung-ü€.jpeg", "rechnung-_.jpeg"),
+    ("", ""),
+])
+def test_sanitize_filename(filename, expected):
+    """Test unsafe characters become single underscores."""
+    assert sanitize_filename(filename) == expected
+
+
+def test_sanitize_filename_matches_regex_behavior():
+    """Test the translate table matches the previous regex implementation."""
+    filename = "".join(chr(c) for c in range(0, 600)) + "__x__"
+    expected = re.sub(r'_+', '_', re.sub(r'[^a-zA-Z0-9._-]', '_', filename))
+    assert sanitize_filename(filename) == expected
+
+
+@pytest.mark.parametrize("text, max_length, suffix, expected", [
+    ("short", 10, "...", "short"),
+    ("exactly10!", 10, "...", "exactly10!"),
+    ("this is too long", 10, "...", "this is..."),
+    ("this is too long", 10, "~", "this is t~"),
+])
+def test_truncate_string(text, max_length, suffix, expected):
+    """Test strings longer than max_length end with the suffix."""
+    assert truncate_string(text, max_length, suffix) == expected
+
+
+@pytest.mark.parametrize("size_bytes, expected", [
+    (0, "0.0 B"),
+    (1023, "1023.0 B"),
+    (1024, "1.0 KB"),
+    (1536, "1.5 KB"),
+    (1024 ** 2 - 1, "1024.0 KB"),
+    (1024 ** 3, "1.0 GB"),
+    (1024 ** 5, "1.0 PB"),
+    (1024 ** 6, "1024.0 PB"),
+])
+def test_format_file_size(size_bytes, expected):
+    """Test sizes are scaled to the largest unit below 1024."""
+    assert format_file_size(size_bytes) == expected
+
+
+def test_get_current_timestamp():
+    """Test the timestamp is integer epoch seconds in UTC."""
+    before = int(datetime.now(timezone.utc).timestamp())
+    timestamp = get_current_timestamp()
+    after = int(datetime.now(timezone.utc).timestamp())
+
+    assert isinstance(timestamp, int)
+    assert before <= timestamp <= after
+
+
+def test_safe_get():
+    """Test nested lookups fall back to the default on missing or non-dict levels."""
+    data = {"a": {"b": OrderedDict(c=1), "n": None, "s": "text"}}
+
+    assert safe_get(data, "a", "b", "c") == 1
+    assert safe_get(data, "a", "x", default=0) == 0
+    assert safe_get(data, "a", "n", default=0) == 0
+    assert safe_get(data, "a", "s", "c", default=0) == 0
+    assert safe_get(data) is data
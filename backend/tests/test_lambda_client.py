@@ -0,0 +1,85 @@
+"""
+LetterOn Server - Lambda Client Tests
+Purpose: Unit tests for Lambda invocation helpers
+Testing: pytest tests/test_lambda_client.py
+AWS Deployment: Not deployed (tests only)
+
+These tests validate:
+- Single-flight deduplication of concurrent identical invocations
+"""
+
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from app.services.lambda_client import LambdaClient
+
+
+@pytest.fixture
+def client():
+    """Create a Lambda client (no AWS calls are made at construction)."""
+    return LambdaClient()
+
+
+def test_concurrent_identical_invocations_share_result(client, monkeypatch):
+    """Test identical sync invocations in flight trigger one Lambda call."""
+    calls = []
+    callers = 4
+    all_joined = threading.Event()
+
+    class JoinTrackingDict(dict):
+        """In-flight map that signals once every caller has looked up the key."""
+
+        joins = 0
+
+        def setdefault(self, key, default=None):
+            value = super().setdefault(key, default)
+            JoinTrackingDict.joins += 1
+            if JoinTrackingDict.joins == callers:
+                all_joined.set()
+            return value
+
+    def fake_invoke(function_name, encoded_payload, invocation_type):
+        calls.append(encoded_payload)
+        # Stay in flight until every follower has joined this invocation
+        assert all_joined.wait(timeout=5)
+        return {"response": "ok"}
+
+    monkeypatch.setattr(client, "_inflight", JoinTrackingDict())
+    monkeypatch.setattr(client, "_invoke", fake_invoke)
+
+    payloads = [{"a": 1, "b": 2}, {"b": 2, "a": 1}] * (callers // 2)
+    with ThreadPoolExecutor(max_workers=callers) as pool:
+        results = list(pool.map(lambda payload: client.invoke_lambda("fn", payload), payloads))
+
+    assert len(calls) == 1
+    assert all(r == {"response": "ok"} for r in results)
+    assert client._inflight == {}
+
+
+def test_inflight_error_propagates_and_clears(client, monkeypatch):
+    """Test a failed invocation is raised and not kept in the in-flight map."""
+    def failing_invoke(function_name, encoded_payload, invocation_type):
+        raise Exception("boom")
+
+    monkeypatch.setattr(client, "_invoke", failing_invoke)
+
+    with pytest.raises(Exception, match="boom"):
+        client.invoke_lambda("fn", {"a": 1})
+
+    assert client._inflight == {}
+
+
+def test_different_payloads_not_deduplicated(client, monkeypatch):
+    """Test distinct payloads each invoke the Lambda."""
+    calls = []
+    monkeypatch.setattr(
+        client, "_invoke",
+        lambda function_name, encoded_payload, invocation_type: calls.append(encoded_payload) or {}
+    )
+
+    client.invoke_lambda("fn", {"a": 1})
+    client.invoke_lambda("fn", {"a": 2})
+
+    assert len(calls) == 2
@@ -0,0 +1,201 @@
+"""
+LetterOn Server - Reminder Scheduler Tests
+Purpose: Unit tests for event-driven reminder processing
+Testing: pytest tests/test_reminder_scheduler.py
+AWS Deployment: Not deployed (tests only)
+
+These tests validate:
+- Single reminder processing by ID
+- Batched "sent" writes when sweeping due reminders
+- Leader lease gating of the polling job
+- Idle backoff of the polling interval
+- Stream records turned into one-shot schedules
+"""
+
+import json
+
+import pytest
+from boto3.dynamodb.types import TypeSerializer
+
+from app.services import reminder_scheduler
+from app.utils.helpers import get_current_timestamp
+
+
+class FakeDynamoDB:
+    """In-memory stand-in for the reminder methods of dynamodb_client."""
+
+    def __init__(self, reminders):
+        self.reminders = {r["reminder_id"]: dict(r) for r in reminders}
+        self.batches = []
+        self.lock_available = True
+
+    def get_reminder(self, reminder_id):
+        return self.reminders.get(reminder_id)
+
+    def update_reminder(self, reminder_id, updates):
+        self.reminders[reminder_id].update(updates)
+        return self.reminders[reminder_id]
+
+    def acquire_lock(self, lock_id, owner, ttl_seconds):
+        return self.lock_available
+
+    def iter_pending_reminders(self, current_time, page_size=None, limit=None):
+        due = [
+            dict(reminder) for reminder in self.reminders.values()
+            if not reminder["sent"] and reminder["reminder_time"] <= current_time
+        ]
+        yield from due[:limit]
+
+    def mark_reminders_sent(self, reminders, sent_at):
+        self.batches.append(len(reminders))
+        for reminder in reminders:
+            self.reminders[reminder["reminder_id"]].update({"sent": True, "sent_at": sent_at})
+        return len(reminders)
+
+
+class FakeScheduler:
+    """Records EventBridge Scheduler calls."""
+
+    def __init__(self):
+        self.created = []
+
+    def create_schedule(self, **kwargs):
+        self.created.append(kwargs)
+
+
+@pytest.fixture
+def fake_db(monkeypatch):
+    """Patch the DynamoDB client used by the scheduler module."""
+    now = get_current_timestamp()
+    db = FakeDynamoDB([
+        {"reminder_id": "due", "user_id": "u1", "letter_id": "l1",
+         "reminder_time": now - 10, "sent": False},
+        {"reminder_id": "future", "user_id": "u1", "letter_id": "l1",
+         "reminder_time": now + 3600, "sent": False},
+        {"reminder_id": "done", "user_id": "u1", "letter_id": "l1",
+         "reminder_time": now - 10, "sent": True},
+    ])
+    monkeypatch.setattr(reminder_scheduler, "dynamodb_client", db)
+    return db
+
+
+def test_process_reminder(fake_db):
+    """Test only due, unsent, existing reminders are delivered."""
+    assert reminder_scheduler.process_reminder("due") is True
+    assert fake_db.reminders["due"]["sent"] is True
+
+    assert reminder_scheduler.process_reminder("future") is False
+    assert reminder_scheduler.process_reminder("done") is False
+    assert reminder_scheduler.process_reminder("missing") is False
+    assert fake_db.reminders["future"]["sent"] is False
+
+
+def test_check_and_process_reminders_batches_writes(fake_db):
+    """Test streamed due reminders are marked sent in batches of 25."""
+    now = get_current_timestamp()
+    for i in range(30):
+        fake_db.reminders[f"r{i}"] = {
+            "reminder_id": f"r{i}", "user_id": "u1", "letter_id": "l1",
+            "reminder_time": now - 5, "sent": False
+        }
+
+    found = reminder_scheduler.check_and_process_reminders()
+
+    assert found == 31
+    assert fake_db.batches == [25, 6]
+    assert all(r["sent"] for r in fake_db.reminders.values() if r["reminder_id"] != "future")
+
+
+def test_check_and_process_reminders_caps_each_poll(fake_db, monkeypatch):
+    """Test one poll processes at most reminder_batch_size reminders."""
+    monkeypatch.setattr(reminder_scheduler.settings, "reminder_batch_size", 10)
+    now = get_current_timestamp()
+    for i in range(30):
+        fake_db.reminders[f"r{i}"] = {
+            "reminder_id": f"r{i}", "user_id": "u1", "letter_id": "l1",
+            "reminder_time": now - 5, "sent": False
+        }
+
+    assert reminder_scheduler.check_and_process_reminders() == 10
+    assert reminder_scheduler.check_and_process_reminders() == 10
+    assert fake_db.batches == [10, 10]
+
+
+def test_scheduled_check_requires_lease(fake_db):
+    """Test the polling job only processes reminders while holding the lease."""
+    fake_db.lock_available = False
+    reminder_scheduler._run_scheduled_check()
+    assert fake_db.reminders["due"]["sent"] is False
+
+    fake_db.lock_available = True
+    reminder_scheduler._run_scheduled_check()
+    assert fake_db.reminders["due"]["sent"] is True
+
+
+def test_poll_interval_backs_off_when_idle(monkeypatch):
+    """Test empty polls stretch the interval up to the cap and reminders reset it."""
+    class FakeAPScheduler:
+        def __init__(self):
+            self.intervals = []
+
+        def reschedule_job(self, job_id, trigger):
+            self.intervals.append(trigger.interval.total_seconds())
+
+    fake_scheduler = FakeAPScheduler()
+    monkeypatch.setattr(reminder_scheduler, "scheduler", fake_scheduler)
+    monkeypatch.setattr(reminder_scheduler, "_empty_streak", 0)
+    monkeypatch.setattr(reminder_scheduler, "_current_interval", 60)
+    monkeypatch.setattr(reminder_scheduler.settings, "reminder_check_interval_seconds", 60)
+    monkeypatch.setattr(reminder_scheduler.settings, "reminder_max_check_interval_seconds", 300)
+    monkeypatch.setattr(reminder_scheduler.settings, "reminder_check_jitter_seconds", 0)
+
+    for _ in range(6):
+        reminder_scheduler._adjust_poll_interval(0)
+    reminder_scheduler._adjust_poll_interval(3)
+
+    # 120, 180, 240, 300 then capped (no reschedule), then back to base
+    assert fake_scheduler.intervals == [120, 180, 240, 300, 60]
+
+
+def test_lambda_handler_with_reminder_id(fake_db):
+    """Test the worker Lambda processes the reminder named in the event."""
+    result = reminder_scheduler.lambda_handler({"reminder_id": "due"}, None)
+
+    assert result["statusCode"] == 200
+    assert fake_db.reminders["due"]["sent"] is True
+
+
+def test_schedule_reminder_handler(fake_db, monkeypatch):
+    """Test stream records create one-shot schedules for future reminders."""
+    scheduler = FakeScheduler()
+    monkeypatch.setattr(reminder_scheduler, "_get_scheduler_client", lambda: scheduler)
+
+    serializer = TypeSerializer()
+
+    def record(event_name, reminder):
+        return {
+            "detail": {
+                "eventName": event_name,
+                "dynamodb": {
+                    "NewImage": {k: serializer.serialize(v) for k, v in reminder.items()}
+                }
+            }
+        }
+
+    events = [
+        record("INSERT", fake_db.reminders["future"]),
+        record("INSERT", fake_db.reminders["due"]),
+        record("MODIFY", fake_db.reminders["done"]),
+        record("REMOVE", fake_db.reminders["future"]),
+    ]
+
+    result = reminder_scheduler.schedule_reminder_handler(events, None)
+
+    assert result["statusCode"] == 200
+    # Future reminder is scheduled, overdue one is processed immediately
+    assert len(scheduler.created) == 1
+    schedule = scheduler.created[0]
+    assert schedule["Name"] == "reminder-future"
+    assert schedule["ScheduleExpression"].startswith("at(")
+    assert json.loads(schedule["Target"]["Input"]) == {"reminder_id": "future"}
+    assert fake_db.reminders["due"]["sent"] is True
@@ -0,0 +1,170 @@
+"""
+LetterOn Server - S3 Service Tests
+Purpose: Unit tests for S3 operations using moto for mocking
+Testing: pytest tests/test_s3_client.py
+AWS Deployment: Not deployed (tests only)
+
+These tests validate:
+- Uploading files (single, multipart and bulk)
+- Deleting all images of a letter
+- Presigned URL generation (including credential rotation) and result caching
+"""
+
+import io
+import time
+from datetime import datetime, timedelta, timezone
+from urllib.parse import parse_qs, urlsplit
+
+import pytest
+from moto import mock_s3
+import boto3
+from botocore.credentials import RefreshableCredentials
+
+from app.services.s3_client import S3Client
+from app.settings import settings
+
+
+@pytest.fixture
+def s3():
+    """
+    Create a mock S3 bucket and client for testing.
+    Uses moto to mock AWS S3 service.
+    """
+    with mock_s3():
+        boto3.client('s3', region_name='us-east-1').create_bucket(
+            Bucket=settings.s3_bucket_name
+        )
+        yield S3Client()
+
+
+def test_delete_letter_images(s3, monkeypatch):
+    """Test deleting letter images across list pages and delete batches."""
+    monkeypatch.setattr("app.services.s3_client.S3_DELETE_MAX_KEYS", 2)
+
+    for i in range(5):
+        s3.upload_file(b"image", f"{settings.s3_image_prefix}letter-1/{i}.jpg")
+    s3.upload_file(b"image", f"{settings.s3_image_prefix}letter-2/0.jpg")
+
+    deleted = s3.delete_letter_images("letter-1")
+
+    assert deleted == 5
+    assert not s3.file_exists(f"{settings.s3_image_prefix}letter-1/0.jpg")
+    assert s3.file_exists(f"{settings.s3_image_prefix}letter-2/0.jpg")
+    assert s3.delete_letter_images("letter-1") == 0
+
+
+def test_generate_presigned_url(s3):
+    """Test presigned URLs are SigV4 query-signed for the object."""
+    url = s3.generate_presigned_url("letters/abc/my scan.jpg", expiration=600)
+
+    assert url.startswith(
+        f"https://{settings.s3_bucket_name}.s3.{settings.aws_region}.amazonaws.com/letters/abc/my%20scan.jpg?"
+    )
+    assert "X-Amz-Algorithm=AWS4-HMAC-SHA256" in url
+    assert "X-Amz-Expires=600" in url
+    assert "X-Amz-Signature=" in url
+
+
+def test_presigned_url_uses_rotated_credentials(s3):
+    """Test each signature reads the current (refreshed) credentials."""
+    generations = iter(range(1, 10))
+
+    def refresh():
+        generation = next(generations)
+        return {
+            "access_key": f"AKID{generation}",
+            "secret_key": f"secret{generation}",
+            "token": f"token{generation}",
+            # Inside botocore's mandatory refresh window: every use refreshes
+            "expiry_time": (datetime.now(timezone.utc) + timedelta(seconds=60)).isoformat(),
+        }
+
+    s3._credentials = RefreshableCredentials.create_from_metadata(
+        refresh(), refresh_using=refresh, method="test"
+    )
+
+    first = parse_qs(urlsplit(s3.generate_presigned_url("letters/a/1.jpg")).query)
+    second = parse_qs(urlsplit(s3.generate_presigned_url("letters/a/2.jpg")).query)
+
+    # Access key and token of one signature always come from the same refresh
+    first_generation = first["X-Amz-Credential"][0].split("/")[0][len("AKID"):]
+    second_generation = second["X-Amz-Credential"][0].split("/")[0][len("AKID"):]
+    assert first_generation != second_generation
+    assert first["X-Amz-Security-Token"] == [f"token{first_generation}"]
+    assert second["X-Amz-Security-Token"] == [f"token{second_generation}"]
+
+
+def test_presigned_url_cache_capped_by_credential_expiry(s3):
+    """Test URLs signed with temporary credentials are not cached past their token."""
+    def metadata():
+        return {
+            "access_key": "AKID",
+            "secret_key": "secret",
+            "token": "token",
+            # Outside botocore's refresh windows, so no refresh happens
+            "expiry_time": (datetime.now(timezone.utc) + timedelta(seconds=1200)).isoformat(),
+        }
+
+    s3._credentials = RefreshableCredentials.create_from_metadata(
+        metadata(), refresh_using=metadata, method="test"
+    )
+
+    s3.generate_presigned_url("letters/a/1.jpg", expiration=3600)
+
+    # Half the 1200s the token has left, not half the URL's 3600s
+    _, expires_at = s3._url_cache._data[("letters/a/1.jpg", 3600)]
+    assert 590 <= expires_at - time.monotonic() <= 600
+
+
+def test_upload_file_multipart(s3, monkeypatch):
+    """Test bytes and streams upload, including multipart above the threshold."""
+    s3._transfer_config.multipart_threshold = 5 * 1024 * 1024
+    s3._transfer_config.multipart_chunksize = 5 * 1024 * 1024
+    large = b"x" * (11 * 1024 * 1024)
+
+    s3.upload_file(large, "letters/big/scan.jpg", metadata={"letter_id": "big"})
+    s3.upload_file(io.BytesIO(b"small"), "letters/small/scan.jpg")
+
+    head = s3.client.head_object(Bucket=settings.s3_bucket_name, Key="letters/big/scan.jpg")
+    assert head["ContentLength"] == len(large)
+    assert head["ContentType"] == "image/jpeg"
+    assert head["Metadata"] == {"letter_id": "big"}
+    # Multipart uploads get an ETag with a part count suffix
+    assert head["ETag"].strip('"').endswith("-3")
+    assert s3.file_exists("letters/small/scan.jpg")
+
+
+def test_presigned_url_and_exists_are_cached(s3):
+    """Test repeated presign/exists calls are served from cache until deletion."""
+    key = f"{settings.s3_image_prefix}letter-1/scan.jpg"
+    s3.upload_file(b"image", key)
+
+    assert s3.generate_presigned_url(key) == s3.generate_presigned_url(key)
+    assert s3.file_exists(key) is True
+
+    # Deleting through the client invalidates both caches
+    url = s3.generate_presigned_url(key, expiration=7200)
+    s3.delete_file(key)
+    assert s3.file_exists(key) is False
+    assert s3._url_cache.get((key, 7200)) is None
+    assert s3.generate_presigned_url(key, expiration=7200) is not url
+
+
+def test_upload_letter_images_bulk(s3):
+    """Test bulk uploads share a timestamp and keep duplicate filenames apart."""
+    files = [
+        {"content": b"one", "filename": "scan.jpg", "content_type": "image/jpeg"},
+        {"content": b"two", "filename": "scan.jpg", "content_type": "image/jpeg"},
+        {"content": b"three", "filename": "page 3.png", "content_type": "image/png"},
+    ]
+
+    results = s3.upload_letter_images_bulk(files, "letter-1")
+
+    keys = [result["s3_key"] for result in results]
+    assert len(set(keys)) == 3
+    assert keys[2].endswith("_page_3.png")
+    # letters/letter-1/{timestamp}_... with the same timestamp for every file
+    assert len({key.split("/")[-1][:15] for key in keys}) == 1
+
+    body = s3.client.get_object(Bucket=settings.s3_bucket_name, Key=keys[1])["Body"].read()
+    assert body == b"two"
@@ -0,0 +1,34 @@
+"""
+LetterOn Server - Settings Tests
+Purpose: Unit tests for derived settings shared by the AWS clients
+Testing: pytest tests/test_settings.py
+AWS Deployment: Not deployed (tests only)
+
+These tests validate:
+- AWS credential configuration is copied per caller
+- Clients build side by side with a local DynamoDB endpoint
+"""
+
+from app.services.dynamo import DynamoDBClient
+from app.services.s3_client import S3Client
+from app.settings import settings
+
+
+def test_get_aws_credentials_returns_copy():
+    """Test callers cannot change the configuration other clients receive."""
+    aws_config = settings.get_aws_credentials()
+    aws_config["endpoint_url"] = "http://localhost:8002"
+
+    assert "endpoint_url" not in settings.get_aws_credentials()
+
+
+def test_clients_with_dynamodb_endpoint(monkeypatch):
+    """Test the DynamoDB endpoint only reaches the DynamoDB client."""
+    monkeypatch.setattr(settings, "dynamodb_endpoint", "http://localhost:8002")
+
+    dynamo = DynamoDBClient()
+    s3 = S3Client()
+
+    assert dynamo.dynamodb.meta.client.meta.endpoint_url == "http://localhost:8002"
+    assert "localhost" not in s3.client.meta.endpoint_url
+    assert "endpoint_url" not in settings.get_aws_credentials()